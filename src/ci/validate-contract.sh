@@ -63,6 +63,14 @@ else
     FAILED=1
 fi
 
+# Odoo module ships its own copy of the schemas (compiled at import)
+for schema in schemas/*.schema.json; do
+    if ! cmp -s "$schema" "odoo-module/ipai_taskboard_api/$schema"; then
+        echo -e "${RED}✗ odoo-module/ipai_taskboard_api/$schema differs from $schema${NC}"
+        FAILED=1
+    fi
+done
+
 # 5. Mock data conforms to contract
 echo -e "\n${YELLOW}[5/5] Validate mock data against contract...${NC}"
 if npx tsx ci/validate-mock.mjs 2>/dev/null; then
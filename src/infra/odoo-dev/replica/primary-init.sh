@@ -0,0 +1,11 @@
+#!/bin/sh
+# Allow streaming replication connections on the primary (idempotent)
+
+set -e
+
+HBA="$PGDATA/pg_hba.conf"
+
+if ! grep -q "^host replication all all" "$HBA"; then
+    echo "host replication all all scram-sha-256" >> "$HBA"
+    echo "✓ Replication enabled in $HBA"
+fi
@@ -0,0 +1,21 @@
+#!/bin/sh
+# Start a hot-standby replica of $PRIMARY_HOST (base backup on first run)
+
+set -e
+
+mkdir -p "$PGDATA"
+chown postgres:postgres "$PGDATA"
+chmod 0700 "$PGDATA"
+
+if [ ! -s "$PGDATA/PG_VERSION" ]; then
+    echo "Cloning primary $PRIMARY_HOST..."
+    until su-exec postgres env PGPASSWORD="$PGPASSWORD" \
+        pg_basebackup -h "$PRIMARY_HOST" -U "$PGUSER" -D "$PGDATA" -R -X stream; do
+        echo "  primary not ready, retrying..."
+        rm -rf "${PGDATA:?}"/*
+        sleep 2
+    done
+    echo "✓ Base backup done"
+fi
+
+exec su-exec postgres postgres -c hot_standby=on
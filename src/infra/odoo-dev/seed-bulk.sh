@@ -0,0 +1,28 @@
+#!/bin/bash
+# Seed a large benchmark/staging dataset via Odoo shell (bulk mode)
+#
+# Sizing is controlled by environment variables, e.g.:
+#   SEED_BOARDS=100 SEED_TASKS_PER_BOARD=10000 SEED_WORKERS=8 ./infra/odoo-dev/seed-bulk.sh
+
+set -e
+
+ODOO_CONTAINER="odoo-app"
+DB_NAME="odoo"
+
+echo "=========================================="
+echo "Seeding bulk data"
+echo "=========================================="
+
+docker exec -i \
+    -e SEED_MODE=bulk \
+    -e SEED_BOARDS="${SEED_BOARDS:-10}" \
+    -e SEED_STAGES="${SEED_STAGES:-5}" \
+    -e SEED_USERS="${SEED_USERS:-50}" \
+    -e SEED_TASKS_PER_BOARD="${SEED_TASKS_PER_BOARD:-1000}" \
+    -e SEED_COMMENTS_PER_TASK="${SEED_COMMENTS_PER_TASK:-1}" \
+    -e SEED_BATCH_SIZE="${SEED_BATCH_SIZE:-2000}" \
+    -e SEED_WORKERS="${SEED_WORKERS:-1}" \
+    "$ODOO_CONTAINER" odoo shell -d "$DB_NAME" --db_maxconn=$(( ${SEED_WORKERS:-1} + 8 )) < infra/odoo-dev/seed.py
+
+echo ""
+echo "✓ Bulk seed complete"
@@ -2,9 +2,21 @@
 """
 Seed test data in Odoo (IDEMPOTENT)
 Run via: docker exec odoo-app odoo shell -d odoo < seed.py
+
+Bulk mode (staging / benchmark datasets):
+    docker exec -i -e SEED_MODE=bulk -e SEED_TASKS_PER_BOARD=100000 \
+        odoo-app odoo shell -d odoo < seed.py
+
+Bulk mode generates N boards, stages, users, tasks and comments using
+batched multi-record create() calls and bulk ir.model.data inserts,
+optionally spread over SEED_WORKERS parallel cursors. Every generated
+record gets a deterministic XML ID, so re-running only creates what is
+missing.
 """
 
+import os
 import sys
+import time
 
 # ============================================================================
 # Seed Data Configuration
@@ -69,6 +81,27 @@ TASKS = [
     },
 ]
 
+# Bulk mode configuration (environment variables, see module docstring)
+SEED_MODE = os.environ.get('SEED_MODE', 'demo')
+BULK_MODULE = 'ipai_taskboard_bulk'
+BULK_BOARDS = int(os.environ.get('SEED_BOARDS', 10))
+BULK_STAGES = int(os.environ.get('SEED_STAGES', 5))
+BULK_USERS = int(os.environ.get('SEED_USERS', 50))
+BULK_TASKS_PER_BOARD = int(os.environ.get('SEED_TASKS_PER_BOARD', 1000))
+BULK_COMMENTS_PER_TASK = int(os.environ.get('SEED_COMMENTS_PER_TASK', 1))
+BULK_BATCH_SIZE = int(os.environ.get('SEED_BATCH_SIZE', 2000))
+BULK_WORKERS = int(os.environ.get('SEED_WORKERS', 1))
+
+# Skip mail tracking, chatter log messages and auto-subscription on bulk
+# creates: they would multiply the write volume without adding test value.
+BULK_CONTEXT = {
+    'tracking_disable': True,
+    'mail_create_nolog': True,
+    'mail_create_nosubscribe': True,
+    'mail_notrack': True,
+    'no_reset_password': True,
+}
+
 # ============================================================================
 # Seed Script (IDEMPOTENT via XML IDs)
 # ============================================================================
@@ -113,6 +146,212 @@ def get_or_create(model_name, xmlid, values):
     
     return record, True  # True = created
 
+# ============================================================================
+# Bulk Seed Helpers
+# ============================================================================
+
+def chunked(items, size):
+    """Yield successive slices of ``items`` with at most ``size`` elements"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def existing_xmlids(benv, model_name, names):
+    """
+    Return {xmlid name: res_id} for the given names (one query per call)
+
+    Only XML IDs whose target row still exists are returned: a record
+    deleted since the last run is seeded again.
+    """
+    if not names:
+        return {}
+    table = benv[model_name]._table
+    benv.cr.execute(f"""
+        SELECT d.name, d.res_id FROM ir_model_data d
+        JOIN "{table}" r ON r.id = d.res_id
+        WHERE d.module = %s AND d.model = %s AND d.name = ANY(%s)
+    """, (BULK_MODULE, model_name, list(names)))
+    return dict(benv.cr.fetchall())
+
+
+def insert_xmlids(cr, model_name, pairs):
+    """Bulk insert ir.model.data rows for [(name, res_id), ...], repointing stale ones"""
+    if not pairs:
+        return
+    from psycopg2.extras import execute_values
+    execute_values(cr._obj, """
+        INSERT INTO ir_model_data
+            (module, name, model, res_id, noupdate,
+             create_uid, write_uid, create_date, write_date)
+        VALUES %s
+        ON CONFLICT (module, name) DO UPDATE
+            SET model = EXCLUDED.model, res_id = EXCLUDED.res_id, write_date = EXCLUDED.write_date
+    """, [
+        (BULK_MODULE, name, model_name, res_id, True, 1, 1)
+        for name, res_id in pairs
+    ], template="(%s, %s, %s, %s, %s, %s, %s, now() at time zone 'UTC', now() at time zone 'UTC')")
+
+
+def bulk_get_or_create(benv, model_name, specs):
+    """
+    Batched get_or_create over [(xmlid name, values), ...]
+
+    Looks up existing XML IDs once per batch, creates the missing records
+    with a single multi-record create() and registers their XML IDs with a
+    single INSERT.
+
+    Returns:
+        tuple: ({xmlid name: res_id} for every spec, number of records created)
+    """
+    Model = benv[model_name].with_context(**BULK_CONTEXT)
+    result = {}
+    created = 0
+    for batch in chunked(specs, BULK_BATCH_SIZE):
+        found = existing_xmlids(benv, model_name, [name for name, _values in batch])
+        missing = [(name, values) for name, values in batch if name not in found]
+        if missing:
+            records = Model.create([values for _name, values in missing])
+            pairs = list(zip([name for name, _values in missing], records.ids))
+            insert_xmlids(benv.cr, model_name, pairs)
+            found.update(pairs)
+            created += len(pairs)
+        result.update(found)
+    return result, created
+
+
+def seed_board_tasks(benv, board_index, project_id, stage_ids, user_ids):
+    """Create tasks and comments for one board, committing per batch"""
+    created_tasks = 0
+    created_comments = 0
+    author_partner_ids = benv['res.users'].browse(user_ids).mapped('partner_id').ids
+    comment_subtype_id = benv.ref('mail.mt_comment').id
+
+    for batch in chunked(range(BULK_TASKS_PER_BOARD), BULK_BATCH_SIZE):
+        task_ids, created = bulk_get_or_create(benv, 'project.task', [
+            (f'task_{board_index}_{t}', {
+                'name': f'Bulk task {board_index}-{t}',
+                'project_id': project_id,
+                'stage_id': stage_ids[t % len(stage_ids)],
+                'user_id': user_ids[(board_index + t) % len(user_ids)],
+                'priority': str(t % 4),
+                'sequence': t,
+            })
+            for t in batch
+        ])
+        created_tasks += created
+
+        if BULK_COMMENTS_PER_TASK:
+            _comment_ids, created = bulk_get_or_create(benv, 'mail.message', [
+                (f'comment_{board_index}_{t}_{c}', {
+                    'model': 'project.task',
+                    'res_id': task_ids[f'task_{board_index}_{t}'],
+                    'message_type': 'comment',
+                    'subtype_id': comment_subtype_id,
+                    'author_id': author_partner_ids[(t + c) % len(author_partner_ids)],
+                    'body': f'Bulk comment {c} on task {board_index}-{t}',
+                })
+                for t in batch
+                for c in range(BULK_COMMENTS_PER_TASK)
+            ])
+            created_comments += created
+
+        benv.cr.commit()
+    return created_tasks, created_comments
+
+
+def seed_board_tasks_worker(registry, board_jobs, stage_ids, user_ids):
+    """Worker entry point: own cursor + environment per thread"""
+    from odoo import api, SUPERUSER_ID
+    totals = [0, 0]
+    with registry.cursor() as cr:
+        benv = api.Environment(cr, SUPERUSER_ID, {})
+        for board_index, project_id in board_jobs:
+            tasks, comments = seed_board_tasks(benv, board_index, project_id, stage_ids, user_ids)
+            totals[0] += tasks
+            totals[1] += comments
+    return totals
+
+
+def run_bulk_seed():
+    """Generate a large, idempotent dataset (SEED_MODE=bulk)"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    started = time.time()
+    print(f"\n[bulk] boards={BULK_BOARDS} stages={BULK_STAGES} users={BULK_USERS} "
+          f"tasks/board={BULK_TASKS_PER_BOARD} comments/task={BULK_COMMENTS_PER_TASK} "
+          f"batch={BULK_BATCH_SIZE} workers={BULK_WORKERS}")
+
+    # Users: partners first (one create), then users linked to them
+    partner_ids, _created = bulk_get_or_create(env, 'res.partner', [
+        (f'partner_{u}', {
+            'name': f'Bulk User {u}',
+            'email': f'bulk.user{u}@example.com',
+            'type': 'contact',
+        })
+        for u in range(BULK_USERS)
+    ])
+    group_ids = [env.ref('base.group_user').id, env.ref('project.group_project_user').id]
+    user_map, _created = bulk_get_or_create(env, 'res.users', [
+        (f'user_{u}', {
+            'name': f'Bulk User {u}',
+            'login': f'bulk.user{u}@example.com',
+            'partner_id': partner_ids[f'partner_{u}'],
+            'groups_id': [(6, 0, group_ids)],
+        })
+        for u in range(BULK_USERS)
+    ])
+    user_ids = [user_map[f'user_{u}'] for u in range(BULK_USERS)]
+    print(f"  ✓ Users: {len(user_ids)}")
+
+    stage_map, _created = bulk_get_or_create(env, 'project.task.type', [
+        (f'stage_{s}', {'name': f'Bulk Stage {s}', 'sequence': (s + 1) * 10})
+        for s in range(BULK_STAGES)
+    ])
+    stage_ids = [stage_map[f'stage_{s}'] for s in range(BULK_STAGES)]
+    print(f"  ✓ Stages: {len(stage_ids)}")
+
+    board_map, _created = bulk_get_or_create(env, 'project.project', [
+        (f'board_{b}', {
+            'name': f'Bulk Board {b}',
+            'user_id': user_ids[b % len(user_ids)],
+            'privacy_visibility': 'employees',
+            'type_ids': [(6, 0, stage_ids)],
+        })
+        for b in range(BULK_BOARDS)
+    ])
+    print(f"  ✓ Boards: {len(board_map)}")
+    env.cr.commit()
+
+    board_jobs = [(b, board_map[f'board_{b}']) for b in range(BULK_BOARDS)]
+    workers = max(1, min(BULK_WORKERS, len(board_jobs)))
+    if workers == 1:
+        totals = [seed_board_tasks_worker(env.registry, board_jobs, stage_ids, user_ids)]
+    else:
+        # Round-robin boards over workers; each worker uses its own cursor
+        shards = [board_jobs[w::workers] for w in range(workers)]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            totals = list(pool.map(
+                lambda shard: seed_board_tasks_worker(env.registry, shard, stage_ids, user_ids),
+                shards,
+            ))
+
+    created_tasks = sum(t[0] for t in totals)
+    created_comments = sum(t[1] for t in totals)
+    elapsed = time.time() - started
+    print(f"  ✓ Tasks created: {created_tasks} (target {BULK_BOARDS * BULK_TASKS_PER_BOARD})")
+    print(f"  ✓ Comments created: {created_comments}")
+    print(f"  ✓ Elapsed: {elapsed:.1f}s "
+          f"({created_tasks / elapsed if elapsed else 0:.0f} tasks/s)")
+
+
+if SEED_MODE == 'bulk':
+    print("\n[BULK MODE]")
+    run_bulk_seed()
+    print("=" * 60)
+    print("✓ BULK SEEDING COMPLETE (IDEMPOTENT)")
+    print("=" * 60)
+    sys.exit(0)
+
 # ============================================================================
 # 1. Create users and partners
 # ============================================================================
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Sanitizer micro-benchmark: three-pass regex cleanup vs single-pass tokenizer
+
+Times services.sanitizer.sanitize_text() against the previous
+sanitize_markdown() + parse_mentions() pipeline on normal and adversarial
+bodies of growing size. The single pass must stay linear: ns/byte should
+be flat as the input grows, including on inputs built to make the old
+patterns backtrack (unclosed "<script", long "onononon" runs).
+
+Before timing, REGRESSIONS are checked: inputs whose removed tokens join
+the surrounding text into a new one must come out without a script
+block, javascript: or event handler.
+
+The legacy pipeline is quadratic on some inputs (a 64 KiB "onon..." body
+takes ~30 s), so it is skipped above legacy_max_kib (default 16).
+
+Runs without Odoo:
+    python3 odoo-module/benchmarks/bench_sanitizer.py [max_kib] [legacy_max_kib]
+"""
+
+import importlib.util
+import os
+import re
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SANITIZER_PATH = os.path.join(HERE, '..', 'ipai_taskboard_api', 'services', 'sanitizer.py')
+
+LEGACY_PATTERNS = [
+    r'<script[^>]*>.*?</script>',
+    r'javascript:',
+    r'on\w+\s*=',
+]
+LEGACY_EMAIL = re.compile(r'@([a-zA-Z0-9._-]+@[a-zA-Z0-9._-]+\.[a-zA-Z0-9_-]+)')
+
+
+def load_sanitizer():
+    spec = importlib.util.spec_from_file_location('sanitizer', SANITIZER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def legacy(text):
+    sanitized = text
+    for pattern in LEGACY_PATTERNS:
+        sanitized = re.sub(pattern, '', sanitized, flags=re.IGNORECASE | re.DOTALL)
+    return sanitized, list(set(LEGACY_EMAIL.findall(text)))
+
+
+def fill(unit, size):
+    return (unit * (size // len(unit) + 1))[:size]
+
+
+INPUTS = {
+    'comment': 'Please review the VAT accrual, cc @jane.doe@company.com and @ops@company.com. '
+               'Numbers in **bold** are <b>final</b>.\n',
+    'scripts': 'ok <script>alert(1)</script> <img src=x onerror=alert(1)> [x](javascript:alert(1)) ',
+    'unclosed-script': '<script',
+    'handler-run': 'on',
+    'mention-run': '@a.',
+    'nested-proto': 'javas<script>a</script>cript:',
+}
+
+# Removing a token must not leave a new one behind: (input, expected output)
+REGRESSIONS = [
+    ('<img src=x on<script></script>error=alert(1)>', '<img src=x alert(1)>'),
+    ('[x](javas<script>a</script>cript:alert(1))', '[x](alert(1))'),
+    ('<img src=x onerror  <script></script>=alert(1)>', '<img src=x alert(1)>'),
+    ('[x](' + 'java' * 3 + 'javascript:' + 'script:' * 3 + 'alert(1))', '[x](alert(1))'),
+]
+
+
+def check_regressions(sanitizer):
+    failures = 0
+    for text, expected in REGRESSIONS:
+        sanitized = sanitizer.sanitize_text(text)[0]
+        if sanitized != expected or sanitizer.TOKEN_RE.search(sanitized.replace('@', '')):
+            print(f'REGRESSION {text!r}: got {sanitized!r}, expected {expected!r}')
+            failures += 1
+    return failures
+
+
+def best_of(fn, text, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    max_kib = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    legacy_max_kib = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+
+    sanitizer = load_sanitizer()
+    if check_regressions(sanitizer):
+        sys.exit(1)
+
+    sizes = []
+    size = 16
+    while size <= max_kib:
+        sizes.append(size)
+        size *= 4
+
+    print(f'{"input":<16} {"KiB":>6} {"single-pass":>14} {"ns/byte":>8} {"legacy":>12} {"ns/byte":>8}')
+    for name, unit in INPUTS.items():
+        for kib in sizes:
+            text = fill(unit, kib * 1024)
+            fast = best_of(sanitizer.sanitize_text, text)
+            line = f'{name:<16} {kib:>6} {fast * 1000:>11.2f} ms {fast * 1e9 / len(text):>8.1f}'
+            if kib <= legacy_max_kib:
+                slow = best_of(legacy, text, repeat=1)
+                line += f' {slow * 1000:>9.2f} ms {slow * 1e9 / len(text):>8.1f}'
+            else:
+                line += f' {"skipped":>12}'
+            print(line)
+
+
+if __name__ == '__main__':
+    main()
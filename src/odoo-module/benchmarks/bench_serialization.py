@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Serialization micro-benchmark: JSON-RPC envelope vs REST transport
+
+Compares the per-request encoding CPU of a 1,000-card list_cards payload:
+
+* jsonrpc  — Odoo's JSON-RPC path: parse the request envelope, then
+             json.dumps({"jsonrpc", "id", "result": payload}) with a default hook
+* rest     — services.fastjson.dumps(payload) (orjson when installed)
+* rest-std — services.fastjson with orjson disabled (stdlib fallback)
+* rest-cached — every card is a render-cache hit (fastjson.PreEncoded):
+             pre-serialized fragments are spliced (orjson >= 3.9)
+
+Runs without Odoo:
+    python3 odoo-module/benchmarks/bench_serialization.py [cards] [rounds]
+"""
+
+import datetime
+import importlib.util
+import json
+import os
+import sys
+import timeit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FASTJSON_PATH = os.path.join(HERE, '..', 'ipai_taskboard_api', 'services', 'fastjson.py')
+
+
+def load_fastjson(disable_orjson=False):
+    spec = importlib.util.spec_from_file_location('fastjson', FASTJSON_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    if disable_orjson:
+        module.orjson = None
+    return module
+
+
+def make_card(i):
+    partner = {'partner_id': 1200 + i % 7, 'email': f'user{i % 7}@company.com', 'name': f'User {i % 7}', 'avatar_url': None}
+    return {
+        'card_id': f'task:{9000 + i}',
+        'board_id': 'project:42',
+        'stage_id': f'stage:{10 * (i % 5 + 1)}',
+        'title': f'Reconcile VAT input tax — entity {i}',
+        'description_md': 'Reconcile VAT input tax for December. ' * 4,
+        'priority': str(i % 4),
+        'due_date': datetime.date(2025, 12, 1 + i % 28).isoformat(),
+        'created_at': datetime.datetime(2025, 12, 1, 8, 30).isoformat(),
+        'updated_at': datetime.datetime(2025, 12, 15, 14, 20).isoformat(),
+        'owners': [partner],
+        'watchers': [partner, partner],
+        'tags': ['tag:1', 'tag:3'],
+        'parent_id': None,
+        'subtask_ids': [f'task:{20000 + i}'],
+        'checklist': [],
+        'dependencies': [],
+        'sequence': i,
+    }
+
+
+def json_default(value):
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    raise TypeError(repr(value))
+
+
+def main():
+    cards = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    payload = {'cards': [make_card(i) for i in range(cards)], 'total': cards, 'page': 0, 'limit': cards}
+    envelope = json.dumps({'jsonrpc': '2.0', 'method': 'call', 'id': 1, 'params': {'board_id': 'project:42', 'limit': cards}})
+
+    def jsonrpc():
+        request = json.loads(envelope)
+        return json.dumps(
+            {'jsonrpc': '2.0', 'id': request['id'], 'result': payload},
+            ensure_ascii=False, default=json_default,
+        ).encode()
+
+    fast = load_fastjson()
+    std = load_fastjson(disable_orjson=True)
+    variants = [('jsonrpc', jsonrpc), ('rest-std', lambda: std.dumps(payload))]
+    if fast.orjson is not None:
+        variants.append(('rest', lambda: fast.dumps(payload)))
+    else:
+        print('orjson not installed: "rest" uses the stdlib fallback only')
+    if fast.Fragment is not None:
+        cached = dict(payload, cards=[fast.PreEncoded(card, fast.encode_fragment(card)) for card in payload['cards']])
+        variants.append(('rest-cached', lambda: fast.dumps(cached)))
+    else:
+        print('orjson < 3.9: "rest-cached" (fragment splicing) skipped')
+
+    print(f'{cards} cards, {rounds} rounds')
+    baseline = None
+    for name, fn in variants:
+        size = len(fn())
+        best = min(timeit.repeat(fn, number=rounds, repeat=5)) / rounds
+        baseline = baseline or best
+        print(f'  {name:<11} {best * 1000:8.3f} ms/request  {size / 1024:8.1f} KiB  {baseline / best:5.1f}x')
+
+
+if __name__ == '__main__':
+    main()
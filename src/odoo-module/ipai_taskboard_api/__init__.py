@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
 
+from . import models
 from . import controllers
 from . import services
+from . import cli
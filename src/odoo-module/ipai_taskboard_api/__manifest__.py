@@ -45,6 +45,7 @@ Dependencies:
     'data': [
         'security/ir.model.access.csv',
         'security/record_rules.xml',
+        'data/ir_cron.xml',
     ],
     'installable': True,
     'application': False,
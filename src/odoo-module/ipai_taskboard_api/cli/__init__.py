@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+
+from . import snapshot_backfill
+from . import email_identity
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+odoo-bin taskboard_email_identity — Email identity backfill and duplicate report
+
+    odoo-bin taskboard_email_identity -c odoo.conf -d mydb --backfill
+    odoo-bin taskboard_email_identity -c odoo.conf -d mydb --duplicates [--limit 100] > dupes.csv
+
+--backfill recomputes res_partner.email_normalized where it is missing or
+stale (rows written with SQL), one transaction per --batch-size partners.
+--duplicates writes partners sharing a normalized email as CSV to stdout
+(email, partner ids, partner ids with a user); API lookups resolve such
+emails to the partner with a user, else the oldest partner.
+"""
+
+from odoo import SUPERUSER_ID, api
+from odoo.cli import Command
+from odoo.modules.registry import Registry
+from odoo.tools import config
+from pathlib import Path
+import csv
+import logging
+import optparse
+import sys
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class TaskboardEmailIdentity(Command):
+    """Backfill normalized partner emails and report duplicates"""
+    name = 'taskboard_email_identity'
+
+    def run(self, args):
+        parser = config.parser
+        parser.prog = f'{Path(sys.argv[0]).name} {self.name}'
+        group = optparse.OptionGroup(parser, 'Email identity')
+        group.add_option('--backfill', dest='identity_backfill', action='store_true', default=False,
+                         help='Recompute missing or stale email_normalized values')
+        group.add_option('--batch-size', dest='identity_batch_size', type='int', default=DEFAULT_BATCH_SIZE,
+                         help='Partners per transaction (default: %default)')
+        group.add_option('--duplicates', dest='identity_duplicates', action='store_true', default=False,
+                         help='Write partners sharing a normalized email as CSV to stdout')
+        group.add_option('--limit', dest='identity_limit', type='int',
+                         help='Largest duplicate groups to report (default: all)')
+        parser.add_option_group(group)
+        opt = config.parse_config(args, setup_logging=True)
+
+        if not (opt.identity_backfill or opt.identity_duplicates):
+            sys.exit('Nothing to do: pass --backfill and/or --duplicates')
+        if not config['db_name']:
+            sys.exit('-d/--database is required')
+
+        registry = Registry(config['db_name'])
+        if opt.identity_backfill:
+            self._backfill(registry, max(1, opt.identity_batch_size))
+        if opt.identity_duplicates:
+            with registry.cursor() as cr:
+                env = api.Environment(cr, SUPERUSER_ID, {})
+                report = env['res.partner']._duplicate_email_report(opt.identity_limit)
+            writer = csv.writer(sys.stdout)
+            writer.writerow(['email', 'partner_ids', 'user_partner_ids'])
+            for group_row in report:
+                writer.writerow([
+                    group_row['email'],
+                    ' '.join(map(str, group_row['partner_ids'])),
+                    ' '.join(map(str, group_row['user_partner_ids'])),
+                ])
+            _logger.info(f"{len(report)} duplicate email groups")
+
+    def _backfill(self, registry, batch_size):
+        with registry.cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {})
+            partner_ids = env['res.partner']._stale_email_normalized_ids()
+        for start in range(0, len(partner_ids), batch_size):
+            with registry.cursor() as cr:
+                env = api.Environment(cr, SUPERUSER_ID, {'active_test': False})
+                env['res.partner'].browse(partner_ids[start:start + batch_size])._recompute_email_normalized()
+            _logger.info(f"Recomputed email_normalized of {min(start + batch_size, len(partner_ids))}/{len(partner_ids)} partners")
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+odoo-bin taskboard_snapshot_backfill — Rebuild past daily board snapshots
+
+    odoo-bin taskboard_snapshot_backfill -c odoo.conf -d mydb \
+        --from 2025-01-01 [--to 2025-11-30] [--board project:42 ...]
+
+Replays stage tracking values into ipai_taskboard_board_snapshot (see
+models/board_snapshot.py), one slice of --slice-days days per transaction
+so a long backfill can be interrupted and resumed with a later --from.
+Existing rows of the rebuilt days are replaced.
+"""
+
+from odoo import SUPERUSER_ID, api, fields
+from odoo.cli import Command
+from odoo.modules.registry import Registry
+from odoo.tools import config
+from pathlib import Path
+import datetime
+import logging
+import optparse
+import sys
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_SLICE_DAYS = 31
+
+
+class TaskboardSnapshotBackfill(Command):
+    """Rebuild past daily board snapshots from stage tracking values"""
+    name = 'taskboard_snapshot_backfill'
+
+    def run(self, args):
+        parser = config.parser
+        parser.prog = f'{Path(sys.argv[0]).name} {self.name}'
+        group = optparse.OptionGroup(parser, 'Snapshot backfill')
+        group.add_option('--from', dest='backfill_from', help='First day to rebuild (YYYY-MM-DD)')
+        group.add_option('--to', dest='backfill_to', help='Last day to rebuild (default: yesterday)')
+        group.add_option('--board', dest='backfill_boards', action='append', default=[],
+                         help='Board to rebuild ("project:42"); repeat for several (default: all)')
+        group.add_option('--slice-days', dest='backfill_slice_days', type='int', default=DEFAULT_SLICE_DAYS,
+                         help='Days per transaction (default: %default)')
+        parser.add_option_group(group)
+        opt = config.parse_config(args, setup_logging=True)
+
+        if not opt.backfill_from:
+            sys.exit('--from is required')
+        if not config['db_name']:
+            sys.exit('-d/--database is required')
+        try:
+            date_from = fields.Date.to_date(opt.backfill_from)
+            date_to = (fields.Date.to_date(opt.backfill_to) if opt.backfill_to
+                       else fields.Date.today() - datetime.timedelta(days=1))
+        except ValueError:
+            sys.exit('--from and --to must be dates (YYYY-MM-DD)')
+        project_ids = []
+        for board in opt.backfill_boards:
+            prefix, _sep, number = board.partition(':')
+            if prefix != 'project' or not (number.isascii() and number.isdigit()):
+                sys.exit(f'Invalid board id: {board}')
+            project_ids.append(int(number))
+
+        registry = Registry(config['db_name'])
+        written = 0
+        start = date_from
+        while start <= date_to:
+            end = min(start + datetime.timedelta(days=max(1, opt.backfill_slice_days) - 1), date_to)
+            with registry.cursor() as cr:
+                env = api.Environment(cr, SUPERUSER_ID, {})
+                written += env['ipai.taskboard.board.snapshot']._backfill_snapshots(start, end, project_ids or None)
+            start = end + datetime.timedelta(days=1)
+        _logger.info(f"Snapshot backfill {date_from} → {date_to} done: {written} rows")
@@ -3,3 +3,10 @@
 from . import boards
 from . import cards
 from . import comments
+from . import mentions
+from . import batch
+from . import export
+from . import avatars
+from . import attachments
+from . import search
+from . import rest
@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*-
+"""
+Attachment Controller — Resumable card attachment uploads and downloads
+
+    POST /api/v1/cards/{card_id}/uploads             start an upload (JSON)
+    GET  /api/v1/uploads/{upload_id}                 offset to resume from (JSON)
+    PUT  /api/v1/uploads/{upload_id}                 next chunk, raw body (type='http')
+    GET  /api/v1/cards/{card_id}/attachments/{id}    download, Range-capable (type='http')
+
+Chunks bypass the 1 MB JSON body cap (security.MAX_BODY_SIZE): they are
+copied from the request stream to a spool file block by block and never
+held in memory as a whole (see services/uploads.py).
+
+Security:
+* Starting an upload requires write access to the card (ACL + record rules)
+* Upload sessions belong to the user who started them
+* Downloads require read access to the card
+"""
+
+from odoo import http, fields
+from odoo.exceptions import AccessError
+from odoo.http import request, Stream
+from psycopg2.errors import LockNotAvailable
+from ..services.mapping import map_upload, CONTRACT_VERSION
+from ..services.auth import require_auth
+from ..services.rate_limit import check_rate_limit
+from ..services.replica import note_primary_write
+from ..services.transport import rest_response, rest_error
+from ..services.uploads import (
+    UploadError,
+    max_upload_bytes,
+    new_upload_token,
+    parse_chunk_checksum,
+    write_chunk,
+    finalize_upload,
+)
+import re
+import logging
+
+_logger = logging.getLogger(__name__)
+
+_SHA256_RE = re.compile(r'^[0-9a-fA-F]{64}$')
+
+
+def _parse_card_id(card_id):
+    """ "task:123" → 123, or None """
+    prefix, _sep, number = card_id.partition(':')
+    if prefix != 'task' or not (number.isascii() and number.isdigit()):
+        return None
+    return int(number)
+
+
+def _own_upload(upload_id, lock=False):
+    """
+    The current user's upload session (sudo), optionally row-locked
+
+    Raises:
+        LockNotAvailable when another request holds the lock (the
+        savepoint keeps the request's transaction usable)
+    """
+    Upload = request.env['ipai.taskboard.upload'].sudo()
+    upload = Upload.search([('token', '=', upload_id), ('user_id', '=', request.env.uid)], limit=1)
+    if upload and lock:
+        with request.env.cr.savepoint(flush=False):
+            request.env.cr.execute("SELECT id FROM ipai_taskboard_upload WHERE id = %s FOR UPDATE NOWAIT", (upload.id,))
+        upload.invalidate_recordset()
+    return upload
+
+
+class AttachmentController(http.Controller):
+    """Card attachment endpoints"""
+
+    @http.route('/api/v1/cards/<string:card_id>/uploads', type='json', auth='user', methods=['POST'], csrf=False)
+    def create_upload(self, card_id, filename, size, mimetype=None, checksum=None):
+        """
+        Start a resumable upload of a card attachment
+
+        Body:
+            {
+                "filename": "BIR-2550Q-Q4.pdf",
+                "size": 48230112,
+                "mimetype": "application/pdf",
+                "checksum": "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08"
+            }
+
+            checksum (optional): SHA-256 (hex) of the whole file, verified
+                before the attachment is created
+
+        Returns:
+            { "upload": Upload DTO } — send chunks with PUT upload_id
+        """
+        require_auth()
+
+        limited = check_rate_limit('create_upload')
+        if limited:
+            return limited
+
+        errors = []
+        if not isinstance(filename, str) or not filename.strip() or len(filename) > 255:
+            errors.append('filename: must be a non-empty string of at most 255 characters')
+        if not isinstance(size, int) or isinstance(size, bool) or size <= 0:
+            errors.append('size: must be a positive integer')
+        if mimetype is not None and not isinstance(mimetype, str):
+            errors.append('mimetype: must be a string')
+        if checksum is not None and not (isinstance(checksum, str) and _SHA256_RE.match(checksum)):
+            errors.append('checksum: must be a hex SHA-256')
+        if errors:
+            return {
+                'error': {
+                    'code': 'VALIDATION_ERROR',
+                    'message': errors[0],
+                    'details': {'errors': errors},
+                }
+            }
+
+        try:
+            task_id = _parse_card_id(card_id)
+            if task_id is None:
+                return {
+                    'error': {
+                        'code': 'INVALID_CARD_ID',
+                        'message': f'Invalid card_id format: {card_id}',
+                    }
+                }
+
+            limit = max_upload_bytes(request.env)
+            if size > limit:
+                return {
+                    'error': {
+                        'code': 'VALIDATION_ERROR',
+                        'message': f'Files are limited to {limit} bytes',
+                        'details': {'field': 'size', 'max_bytes': limit},
+                    }
+                }
+
+            # Fetch task (ACL + record rules), attaching needs write access
+            task = request.env['project.task'].search([('id', '=', task_id)])
+            if not task:
+                return {
+                    'error': {
+                        'code': 'CARD_NOT_FOUND',
+                        'message': 'Card not found or access denied',
+                    }
+                }
+            task.check_access_rights('write')
+            task.check_access_rule('write')
+
+            upload = request.env['ipai.taskboard.upload'].sudo().create({
+                'token': new_upload_token(),
+                'task_id': task.id,
+                'user_id': request.env.uid,
+                'filename': filename.strip(),
+                'mimetype': mimetype,
+                'size': size,
+                'checksum': checksum.lower() if checksum else None,
+                'created_at': fields.Datetime.now(),
+            })
+
+            # Add contract version header
+            request.httprequest.environ['HTTP_X_CONTRACT_VERSION'] = CONTRACT_VERSION
+
+            note_primary_write()
+            _logger.info(f"User {request.env.user.id} started upload {upload.token} ({size} bytes) on card {card_id}")
+            return {'upload': map_upload(upload)}
+
+        except Exception as e:
+            _logger.error(f"Error starting upload on card {card_id}: {str(e)}", exc_info=True)
+            return {
+                'error': {
+                    'code': 'INTERNAL_ERROR',
+                    'message': str(e),
+                }
+            }
+
+    @http.route('/api/v1/uploads/<string:upload_id>', type='json', auth='user', methods=['GET'], csrf=False)
+    def get_upload(self, upload_id):
+        """
+        Get an upload's state (offset to resume from, attachment when complete)
+
+        Returns:
+            { "upload": Upload DTO }
+        """
+        require_auth()
+
+        limited = check_rate_limit('get_upload')
+        if limited:
+            return limited
+
+        try:
+            upload = _own_upload(upload_id)
+            if not upload:
+                return {
+                    'error': {
+                        'code': 'UPLOAD_NOT_FOUND',
+                        'message': 'Upload not found or expired',
+                    }
+                }
+
+            request.httprequest.environ['HTTP_X_CONTRACT_VERSION'] = CONTRACT_VERSION
+            return {'upload': map_upload(upload)}
+
+        except Exception as e:
+            _logger.error(f"Error fetching upload {upload_id}: {str(e)}", exc_info=True)
+            return {
+                'error': {
+                    'code': 'INTERNAL_ERROR',
+                    'message': str(e),
+                }
+            }
+
+    @http.route('/api/v1/uploads/<string:upload_id>', type='http', auth='user', methods=['PUT'], csrf=False)
+    def upload_chunk(self, upload_id, **kwargs):
+        """
+        Append the next chunk of an upload
+
+        Headers:
+            Upload-Offset (required): Current offset of the upload
+            Content-Length (required): Chunk size (at most max_chunk_bytes)
+            Upload-Checksum (optional): "sha256 <hex or base64>" of the chunk
+
+        Body: raw chunk bytes. An empty body at offset == size retries a
+        failed finalization.
+
+        Returns:
+            { "upload": Upload DTO } — "attachment" is set once the last
+            chunk is stored. 409 UPLOAD_OFFSET_MISMATCH carries the offset
+            to resume from; 409 UPLOAD_BUSY means another chunk of the
+            upload is being written (retry after it).
+        """
+        require_auth()
+
+        limited = check_rate_limit('upload_chunk')
+        if limited:
+            return rest_response(limited)
+
+        headers = request.httprequest.headers
+        try:
+            offset = int(headers.get('Upload-Offset', ''))
+            length = int(headers.get('Content-Length', ''))
+        except ValueError:
+            return rest_error('VALIDATION_ERROR', 'Upload-Offset and Content-Length headers are required',
+                              {'field': 'Upload-Offset'})
+
+        try:
+            expected = parse_chunk_checksum(headers.get('Upload-Checksum'))
+
+            # Row lock: parallel PUTs of one upload must not interleave
+            upload = _own_upload(upload_id, lock=True)
+            if not upload:
+                return rest_error('UPLOAD_NOT_FOUND', 'Upload not found or expired')
+            if upload.attachment_id:
+                return rest_response({'upload': map_upload(upload)})
+
+            dbname = request.env.cr.dbname
+            if length:
+                upload.received = write_chunk(dbname, upload, offset, request.httprequest.stream, length, expected)
+            elif offset != upload.received:
+                raise UploadError('UPLOAD_OFFSET_MISMATCH', f'Upload-Offset must be {upload.received}',
+                                  {'offset': upload.received})
+
+            if upload.received == upload.size:
+                # Attaching requires write access to the card, checked as the user
+                task = request.env['project.task'].browse(upload.task_id.id)
+                task.check_access_rights('write')
+                task.check_access_rule('write')
+                upload.attachment_id = finalize_upload(dbname, upload)
+
+            note_primary_write()
+            return rest_response({'upload': map_upload(upload)})
+
+        except UploadError as e:
+            return rest_response(e.payload())
+        except LockNotAvailable:
+            return rest_error('UPLOAD_BUSY', 'Another chunk of this upload is being written, retry after it')
+        except AccessError as e:
+            return rest_error('PERMISSION_DENIED', str(e))
+        except Exception as e:
+            _logger.error(f"Error writing chunk of upload {upload_id}: {str(e)}", exc_info=True)
+            return rest_error('INTERNAL_ERROR', str(e))
+
+    @http.route('/api/v1/cards/<string:card_id>/attachments/<int:attachment_id>', type='http', auth='user', methods=['GET'], csrf=False)
+    def download_attachment(self, card_id, attachment_id, **kwargs):
+        """
+        Download a card attachment
+
+        Supports Range requests (206 Partial Content) and conditional
+        requests (ETag / If-None-Match); filestore files are streamed from
+        disk, not loaded into the worker.
+
+        Returns:
+            File download, or an error response in the standard envelope
+        """
+        require_auth()
+
+        limited = check_rate_limit('download_attachment')
+        if limited:
+            return rest_response(limited)
+
+        try:
+            task_id = _parse_card_id(card_id)
+            if task_id is None:
+                return rest_error('INVALID_CARD_ID', f'Invalid card_id format: {card_id}')
+
+            # Fetch task (ACL + record rules)
+            task = request.env['project.task'].search([('id', '=', task_id)])
+            if not task:
+                return rest_error('CARD_NOT_FOUND', 'Card not found or access denied')
+
+            # Card access was checked above; the attachment must belong to it
+            attachment = request.env['ir.attachment'].sudo().search([
+                ('id', '=', attachment_id),
+                ('res_model', '=', 'project.task'),
+                ('res_id', '=', task.id),
+                ('res_field', '=', False),
+            ], limit=1)
+            if not attachment:
+                return rest_error('ATTACHMENT_NOT_FOUND', 'Attachment not found')
+
+            response = Stream.from_attachment(attachment).get_response(as_attachment=True)
+            response.headers['X-Contract-Version'] = CONTRACT_VERSION
+            return response
+
+        except Exception as e:
+            _logger.error(f"Error downloading attachment {attachment_id}: {str(e)}", exc_info=True)
+            return rest_error('INTERNAL_ERROR', str(e))
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Avatar Controller — GET /api/v1/avatars/{partner_id}/{digest}/{size} (type='http')
+
+Serves square partner thumbnails behind the content-hash URLs of
+Partner.avatar_url (see services/avatars.py). The digest changes with the
+image, so responses are cacheable forever (immutable).
+
+Fast path: the thumbnail is already in the on-disk cache → served from the
+file, no ORM read and no image processing. A miss checks read access on
+the partner, resizes its image once and stores the result.
+
+A request for a digest that is no longer current (a client holding an
+older card payload) is redirected to the current URL.
+"""
+
+from odoo import http
+from odoo.exceptions import AccessError
+from odoo.http import request
+from ..services.auth import require_auth
+from ..services.transport import rest_error
+from ..services.avatars import (
+    AVATAR_SIZES,
+    DIGEST_LENGTH,
+    avatar_digests,
+    avatar_path,
+    read_cached_thumbnail,
+    write_cached_thumbnail,
+    render_thumbnail,
+    thumbnail_mimetype,
+)
+import base64
+import logging
+
+_logger = logging.getLogger(__name__)
+
+IMMUTABLE_CACHE_CONTROL = 'private, max-age=31536000, immutable'
+
+
+class AvatarController(http.Controller):
+    """Avatar thumbnails"""
+
+    def _thumbnail_response(self, data, digest, size):
+        return request.make_response(data, headers=[
+            ('Content-Type', thumbnail_mimetype(data)),
+            ('Content-Length', str(len(data))),
+            ('Cache-Control', IMMUTABLE_CACHE_CONTROL),
+            ('ETag', f'"{digest}-{size}"'),
+        ])
+
+    @http.route('/api/v1/avatars/<int:partner_id>/<string:digest>/<int:size>', type='http', auth='user', methods=['GET'], csrf=False)
+    def get_avatar(self, partner_id, digest, size, **kwargs):
+        """
+        Get a partner's avatar thumbnail
+
+        Path params:
+            partner_id (int): res.partner id
+            digest (str): Image checksum prefix from Partner.avatar_url
+            size (int): Edge length in pixels (32, 64, 128 or 256)
+
+        Returns:
+            Image (Cache-Control: immutable), 302 to the current URL for an
+            outdated digest, or an error response in the standard envelope
+        """
+        require_auth()
+
+        if size not in AVATAR_SIZES:
+            return rest_error('VALIDATION_ERROR', f'size must be one of: {", ".join(map(str, AVATAR_SIZES))}',
+                              {'field': 'size'})
+        if len(digest) != DIGEST_LENGTH or not all(char in '0123456789abcdef' for char in digest):
+            return rest_error('VALIDATION_ERROR', 'Invalid avatar digest', {'field': 'digest'})
+
+        if request.httprequest.headers.get('If-None-Match') == f'"{digest}-{size}"':
+            return request.make_response(b'', status=304, headers=[('Cache-Control', IMMUTABLE_CACHE_CONTROL)])
+
+        dbname = request.env.cr.dbname
+        data = read_cached_thumbnail(dbname, partner_id, digest, size)
+        if data is not None:
+            return self._thumbnail_response(data, digest, size)
+
+        try:
+            # Cache miss: the user must be able to read the partner (ACL +
+            # record rules); a hidden partner answers like a missing one
+            partner = request.env['res.partner'].search([('id', '=', partner_id)])
+            if not partner:
+                return rest_error('AVATAR_NOT_FOUND', 'Avatar not found')
+
+            current = avatar_digests(request.env, [partner_id]).get(partner_id)
+            if not current:
+                return rest_error('AVATAR_NOT_FOUND', 'Avatar not found')
+            if current != digest:
+                return request.redirect(avatar_path(partner_id, current, size), code=302, local=True)
+
+            data = render_thumbnail(base64.b64decode(partner.sudo().image_1920), size)
+            write_cached_thumbnail(dbname, partner_id, digest, size, data)
+            _logger.info(f"Cached {size}px avatar of partner {partner_id}")
+            return self._thumbnail_response(data, digest, size)
+
+        except AccessError:
+            return rest_error('AVATAR_NOT_FOUND', 'Avatar not found')
+        except Exception as e:
+            _logger.error(f"Error serving avatar of partner {partner_id}: {str(e)}", exc_info=True)
+            return rest_error('INTERNAL_ERROR', str(e))
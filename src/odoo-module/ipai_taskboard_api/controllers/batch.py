@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+Batch Controller — POST /api/v1/batch
+
+Runs an ordered list of existing operations in one request and one
+database transaction (see services/batch.py):
+
+    create_card → create_comment on it → get_board for fresh card counts
+
+Security:
+* Every operation goes through its normal handler (ACL + record rules)
+* Authentication, rate limiting and Idempotency-Key are handled once
+"""
+
+from odoo import http
+from odoo.http import request
+from .boards import BoardController
+from .cards import CardController
+from .comments import CommentController
+from ..services.mapping import map_batch_results, CONTRACT_VERSION
+from ..services.auth import require_auth
+from ..services.rate_limit import check_rate_limit, route_cost
+from ..services.idempotency import claim_idempotency_key, complete_idempotency_key
+from ..services.replica import note_primary_write
+from ..services.queries import DEFAULT_PER_STAGE_LIMIT
+from ..services.batch import (
+    MAX_BATCH_OPERATIONS,
+    BatchReferenceError,
+    resolve_references,
+    batch_scope,
+)
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Operation name → (controller, handler name)
+BATCH_OPERATIONS = {
+    'create_card': (CardController, 'create_card'),
+    'update_card': (CardController, 'update_card'),
+    'create_comment': (CommentController, 'create_comment'),
+    'get_board': (BoardController, 'get_board'),
+    'list_cards': (CardController, 'list_cards'),
+}
+
+
+class _BatchAborted(Exception):
+    """Rolls back the batch savepoint when an operation fails"""
+
+    def __init__(self, error):
+        super().__init__(error['error']['message'])
+        self.error = error
+
+
+class BatchController(http.Controller):
+    """Multi-operation endpoint"""
+
+    @http.route('/api/v1/batch', type='json', auth='user', methods=['POST'], csrf=False)
+    def run_batch(self, operations=None):
+        """
+        Execute operations in order, all-or-nothing
+
+        Body:
+            {
+                "operations": [
+                    {"id": "new", "op": "create_card", "args": {"board_id": "project:42", ...}},
+                    {"op": "create_comment", "args": {"card_id": "$new.card.card_id", "body_md": "..."}},
+                    {"op": "get_board", "args": {"board_id": "project:42"}}
+                ]
+            }
+
+            op: create_card | update_card | create_comment | get_board | list_cards
+            args: the operation's usual parameters (path params included)
+            "$<id or index>.<path>" strings reference earlier results
+
+        Headers:
+            Idempotency-Key (optional): Applies to the whole batch
+
+        Returns:
+            {"results": [{"id", "op", "result"}, ...]}
+
+            On the first failing operation everything is rolled back and the
+            error of that operation is returned, with details.index/op.
+        """
+        require_auth()
+
+        operations = operations or []
+        error = self._validate_operations(operations)
+        if error:
+            return error
+
+        cost = route_cost('batch') + sum(self._operation_cost(operation) for operation in operations)
+        limited = check_rate_limit('batch', cost=cost)
+        if limited:
+            return limited
+
+        claim_id, replay = claim_idempotency_key('batch', {'operations': operations})
+        if replay is not None:
+            return replay
+
+        labels = {
+            operation['id']: index
+            for index, operation in enumerate(operations)
+            if operation.get('id')
+        }
+        results = []
+        try:
+            with batch_scope(), request.env.cr.savepoint():
+                for index, operation in enumerate(operations):
+                    results.append(self._run_operation(index, operation, results, labels))
+        except _BatchAborted as aborted:
+            _logger.info(f"User {request.env.user.id} batch rolled back: {aborted}")
+            return aborted.error
+
+        # Add contract version header
+        request.httprequest.environ['HTTP_X_CONTRACT_VERSION'] = CONTRACT_VERSION
+
+        note_primary_write()
+        _logger.info(f"User {request.env.user.id} ran a batch of {len(operations)} operations")
+        return complete_idempotency_key(claim_id, map_batch_results(operations, results))
+
+    def _validate_operations(self, operations):
+        """Check the envelope before anything runs"""
+        problem = None
+        if not isinstance(operations, list) or not operations:
+            problem = 'operations must be a non-empty list'
+        elif len(operations) > MAX_BATCH_OPERATIONS:
+            problem = f'At most {MAX_BATCH_OPERATIONS} operations per batch'
+        else:
+            for index, operation in enumerate(operations):
+                if not isinstance(operation, dict) or operation.get('op') not in BATCH_OPERATIONS:
+                    problem = f'operations[{index}].op must be one of: {", ".join(BATCH_OPERATIONS)}'
+                elif not isinstance(operation.get('args', {}), dict):
+                    problem = f'operations[{index}].args must be an object'
+                if problem:
+                    break
+
+        if problem:
+            return {
+                'error': {
+                    'code': 'VALIDATION_ERROR',
+                    'message': problem,
+                    'details': {'field': 'operations'},
+                }
+            }
+        return None
+
+    def _operation_cost(self, operation):
+        """Rate limit cost of one operation, as if it were called directly"""
+        args = operation.get('args') or {}
+        if operation['op'] != 'list_cards':
+            return route_cost(operation['op'])
+        stages = args.get('stages')
+        if stages:
+            return route_cost('list_cards', args.get('per_stage_limit', DEFAULT_PER_STAGE_LIMIT), len(stages))
+        return route_cost('list_cards', args.get('limit', 100))
+
+    def _run_operation(self, index, operation, results, labels):
+        """Run one operation; raise _BatchAborted on failure"""
+        name = operation['op']
+        controller, handler_name = BATCH_OPERATIONS[name]
+        try:
+            args = resolve_references(operation.get('args') or {}, results, labels)
+            result = getattr(controller(), handler_name)(**args)
+        except (BatchReferenceError, TypeError) as e:
+            result = {
+                'error': {
+                    'code': 'VALIDATION_ERROR',
+                    'message': str(e),
+                }
+            }
+
+        if isinstance(result, dict) and 'error' in result:
+            error = result['error']
+            raise _BatchAborted({
+                'error': {
+                    'code': error.get('code', 'INTERNAL_ERROR'),
+                    'message': f'Operation {index} ({name}) failed: {error.get("message", "")}',
+                    'details': {'index': index, 'op': name, 'error': error},
+                }
+            })
+        return result
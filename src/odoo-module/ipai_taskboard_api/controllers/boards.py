@@ -9,29 +9,87 @@ Security:
 * Returns only boards where current user is member or has access
 """
 
-from odoo import http
+from odoo import http, fields
 from odoo.http import request
 from ..services.mapping import (
     map_board,
     map_board_with_card_counts,
+    map_board_snapshot,
+    map_board_charts,
+    map_flow_metrics,
+    map_board_clone,
     CONTRACT_VERSION,
 )
+from ..services.queries import (
+    top_cards_per_stage,
+    replica_search,
+    replica_search_count,
+    board_snapshot_series,
+    flow_metrics,
+    sees_whole_board,
+    DEFAULT_PER_STAGE_LIMIT,
+    MAX_PER_STAGE_LIMIT,
+    DEFAULT_CHART_DAYS,
+    MAX_CHART_DAYS,
+)
 from ..services.auth import require_auth
+from ..services.rate_limit import check_rate_limit
+from ..services.replica import replica_read, note_primary_write
+from ..services.idempotency import claim_idempotency_key, complete_idempotency_key
+from ..services.board_clone import copy_board
+from ..services.schema import (
+    validate_create_board_input,
+    validate_clone_board_input,
+    validation_error,
+    sample_validate_output,
+)
 from ..services.rbac import check_board_access
 from ..services.security import (
     validate_request_method,
     validate_request_security,
     add_security_headers,
 )
+import datetime
 import logging
 
 _logger = logging.getLogger(__name__)
 
 
+def _date_window(date_from, date_to):
+    """
+    Parse a date_from/date_to query window (default: the last DEFAULT_CHART_DAYS days)
+
+    Returns:
+        tuple: (first day, last day, VALIDATION_ERROR payload or None)
+    """
+    try:
+        day_to = fields.Date.to_date(date_to) if date_to else fields.Date.today()
+        day_from = (fields.Date.to_date(date_from) if date_from
+                    else day_to - datetime.timedelta(days=DEFAULT_CHART_DAYS - 1))
+    except ValueError:
+        return None, None, {
+            'error': {
+                'code': 'VALIDATION_ERROR',
+                'message': 'date_from and date_to must be dates (YYYY-MM-DD)',
+                'details': {'field': 'date_from' if date_from else 'date_to'},
+            }
+        }
+    if day_from > day_to or (day_to - day_from).days >= MAX_CHART_DAYS:
+        return None, None, {
+            'error': {
+                'code': 'VALIDATION_ERROR',
+                'message': f'date_from must be before date_to, at most {MAX_CHART_DAYS} days apart',
+                'details': {'field': 'date_from'},
+            }
+        }
+    return day_from, day_to, None
+
+
 class BoardController(http.Controller):
     """Board endpoints (project.project)"""
 
     @http.route('/api/v1/boards', type='json', auth='user', methods=['GET'], csrf=False)
+    @replica_read
     def list_boards(self, page=0, limit=20):
         """
         List all boards accessible to current user
@@ -52,17 +110,22 @@ class BoardController(http.Controller):
         validate_request_security()
         require_auth()
         
+        limited = check_rate_limit('list_boards', items=limit)
+        if limited:
+            return limited
+        
         try:
             # Fetch accessible projects (ACL enforced automatically)
             Project = request.env['project.project']
             
             # Search with pagination
             offset = page * limit
-            projects = Project.search([], offset=offset, limit=limit, order='id desc')
-            total_count = Project.search_count([])
+            projects = replica_search(Project, [], offset=offset, limit=limit, order='id desc')
+            total_count = replica_search_count(Project, [])
             
             # Map to DTOs
             boards = [map_board(project) for project in projects]
+            sample_validate_output('board', boards)
             
             response = {
                 'boards': boards,
@@ -87,6 +150,7 @@ class BoardController(http.Controller):
             }
 
     @http.route('/api/v1/boards/<string:board_id>', type='json', auth='user', methods=['GET'], csrf=False)
+    @replica_read
     def get_board(self, board_id):
         """
         Get board detail with card counts
@@ -101,6 +165,10 @@ class BoardController(http.Controller):
         validate_request_security()
         require_auth()
         
+        limited = check_rate_limit('get_board')
+        if limited:
+            return limited
+        
         try:
             # Parse board_id: "project:123" → 123
             if not board_id.startswith('project:'):
@@ -131,6 +199,7 @@ class BoardController(http.Controller):
             
             # Map to DTO with card counts
             board = map_board_with_card_counts(project)
+            sample_validate_output('board', [board])
             
             # Add contract version header
             request.httprequest.environ['HTTP_X_CONTRACT_VERSION'] = CONTRACT_VERSION
@@ -154,6 +223,258 @@ class BoardController(http.Controller):
                 }
             }
 
+    @http.route('/api/v1/boards/<string:board_id>/snapshot', type='json', auth='user', methods=['GET'], csrf=False)
+    @replica_read
+    def get_board_snapshot(self, board_id, per_stage_limit=DEFAULT_PER_STAGE_LIMIT):
+        """
+        Get everything needed for first paint of a Kanban board in one call
+        
+        Path params:
+            board_id (str): Board ID in format "project:123"
+        
+        Query params:
+            per_stage_limit (int): Cards per column (default 20, max 100)
+        
+        Returns:
+            {
+                "board": Board DTO with card_counts,
+                "columns": [{"stage_id", "total", "cards": [Card, ...], "has_more"}, ...],
+                "per_stage_limit": int
+            }
+        """
+        validate_request_method(['GET'])
+        validate_request_security()
+        require_auth()
+        
+        limited = check_rate_limit('get_board_snapshot')
+        if limited:
+            return limited
+        
+        try:
+            if not board_id.startswith('project:'):
+                return {
+                    'error': {
+                        'code': 'INVALID_BOARD_ID',
+                        'message': f'Invalid board_id format: {board_id}',
+                    }
+                }
+            
+            if not str(per_stage_limit).isdigit():
+                return {
+                    'error': {
+                        'code': 'VALIDATION_ERROR',
+                        'message': 'per_stage_limit must be a positive integer',
+                        'details': {'field': 'per_stage_limit'},
+                    }
+                }
+            
+            project_id = int(board_id.split(':')[1])
+            per_stage_limit = max(1, min(int(per_stage_limit), MAX_PER_STAGE_LIMIT))
+            
+            # Fetch project (ACL enforced)
+            project = request.env['project.project'].browse(project_id)
+            
+            if not project.exists():
+                return {
+                    'error': {
+                        'code': 'BOARD_NOT_FOUND',
+                        'message': 'Board not found or access denied',
+                    }
+                }
+            
+            check_board_access(project, 'read')
+            
+            # One windowed query for the first page of every column
+            cards_by_stage = top_cards_per_stage(project_id, per_stage_limit)
+            snapshot = map_board_snapshot(project, cards_by_stage, per_stage_limit)
+            
+            # Add contract version header
+            request.httprequest.environ['HTTP_X_CONTRACT_VERSION'] = CONTRACT_VERSION
+            
+            _logger.info(f"User {request.env.user.id} loaded snapshot of board {board_id}")
+            return snapshot
+            
+        except ValueError:
+            return {
+                'error': {
+                    'code': 'INVALID_BOARD_ID',
+                    'message': f'Invalid board_id format: {board_id}',
+                }
+            }
+        except Exception as e:
+            _logger.error(f"Error fetching snapshot of board {board_id}: {str(e)}", exc_info=True)
+            return {
+                'error': {
+                    'code': 'INTERNAL_ERROR',
+                    'message': str(e),
+                }
+            }
+
+    @http.route('/api/v1/boards/<string:board_id>/charts', type='json', auth='user', methods=['GET'], csrf=False)
+    @replica_read
+    def get_board_charts(self, board_id, date_from=None, date_to=None):
+        """
+        Get cumulative-flow and burndown series from daily board snapshots
+        
+        Path params:
+            board_id (str): Board ID in format "project:123"
+        
+        Query params:
+            date_from (str): First day, YYYY-MM-DD (default: 29 days before date_to)
+            date_to (str): Last day, YYYY-MM-DD (default: today)
+        
+        Returns:
+            {
+                "board_id", "from", "to", "stages": [Stage, ...],
+                "cumulative_flow": [{"date", "counts": {"stage:20": 4, ...}}, ...],
+                "burndown": [{"date", "total", "remaining", "overdue"}, ...]
+            }
+        
+            Snapshots count every card of the board, so they are only served
+            to users whose record rules show them the whole board.
+        """
+        validate_request_method(['GET'])
+        validate_request_security()
+        require_auth()
+        
+        limited = check_rate_limit('get_board_charts')
+        if limited:
+            return limited
+        
+        try:
+            # Parse board_id: "project:123" → 123
+            prefix, _sep, number = board_id.partition(':')
+            if prefix != 'project' or not (number.isascii() and number.isdigit()):
+                return {
+                    'error': {
+                        'code': 'INVALID_BOARD_ID',
+                        'message': f'Invalid board_id format: {board_id}',
+                    }
+                }
+            
+            day_from, day_to, invalid = _date_window(date_from, date_to)
+            if invalid:
+                return invalid
+            
+            # Fetch project (ACL + record rules)
+            project = request.env['project.project'].search([('id', '=', int(number))])
+            if not project:
+                return {
+                    'error': {
+                        'code': 'BOARD_NOT_FOUND',
+                        'message': 'Board not found or access denied',
+                    }
+                }
+            
+            if not sees_whole_board(project):
+                return {
+                    'error': {
+                        'code': 'PERMISSION_DENIED',
+                        'message': 'Board charts require access to every card of the board',
+                    }
+                }
+            
+            # One indexed range read of the snapshot table
+            series = board_snapshot_series(project.id, day_from, day_to)
+            charts = map_board_charts(project, series, day_from, day_to)
+            
+            # Add contract version header
+            request.httprequest.environ['HTTP_X_CONTRACT_VERSION'] = CONTRACT_VERSION
+            
+            _logger.info(f"User {request.env.user.id} loaded charts of board {board_id} ({len(series)} days)")
+            return charts
+            
+        except Exception as e:
+            _logger.error(f"Error fetching charts of board {board_id}: {str(e)}", exc_info=True)
+            return {
+                'error': {
+                    'code': 'INTERNAL_ERROR',
+                    'message': str(e),
+                }
+            }
+
+    @http.route('/api/v1/boards/<string:board_id>/flow-metrics', type='json', auth='user', methods=['GET'], csrf=False)
+    @replica_read
+    def get_board_flow_metrics(self, board_id, date_from=None, date_to=None):
+        """
+        Get lead time, cycle time and time-in-stage percentiles of a board
+        
+        Path params:
+            board_id (str): Board ID in format "project:123"
+        
+        Query params:
+            date_from (str): First day, YYYY-MM-DD (default: 29 days before date_to)
+            date_to (str): Last day, YYYY-MM-DD (default: today)
+        
+        Returns:
+            {
+                "board_id", "from", "to", "completed",
+                "lead_time": {"p50", "p85", "p95"}, "cycle_time": {...},
+                "time_in_stage": [{"stage_id", "name", "transitions", "p50", "p85", "p95"}, ...]
+            }
+        
+            Durations are hours. Cards hidden from the user by record rules
+            are left out of every metric.
+        """
+        validate_request_method(['GET'])
+        validate_request_security()
+        require_auth()
+        
+        limited = check_rate_limit('get_board_flow_metrics')
+        if limited:
+            return limited
+        
+        try:
+            # Parse board_id: "project:123" → 123
+            prefix, _sep, number = board_id.partition(':')
+            if prefix != 'project' or not (number.isascii() and number.isdigit()):
+                return {
+                    'error': {
+                        'code': 'INVALID_BOARD_ID',
+                        'message': f'Invalid board_id format: {board_id}',
+                    }
+                }
+            
+            day_from, day_to, invalid = _date_window(date_from, date_to)
+            if invalid:
+                return invalid
+            
+            # Fetch project (ACL + record rules)
+            project = request.env['project.project'].search([('id', '=', int(number))])
+            if not project:
+                return {
+                    'error': {
+                        'code': 'BOARD_NOT_FOUND',
+                        'message': 'Board not found or access denied',
+                    }
+                }
+            
+            # Restrict to visible cards unless the user sees the whole board
+            task_query = None
+            if not sees_whole_board(project):
+                task_query = request.env['project.task'].with_context(active_test=False)._search(
+                    [('project_id', '=', project.id)]
+                )
+            
+            # Two aggregate queries over the stage transition facts
+            metrics = flow_metrics(project.id, day_from, day_to, task_query)
+            result = map_flow_metrics(project, metrics, day_from, day_to)
+            
+            # Add contract version header
+            request.httprequest.environ['HTTP_X_CONTRACT_VERSION'] = CONTRACT_VERSION
+            
+            _logger.info(f"User {request.env.user.id} loaded flow metrics of board {board_id} ({metrics['completed']} completed)")
+            return result
+            
+        except Exception as e:
+            _logger.error(f"Error fetching flow metrics of board {board_id}: {str(e)}", exc_info=True)
+            return {
+                'error': {
+                    'code': 'INTERNAL_ERROR',
+                    'message': str(e),
+                }
+            }
+
     @http.route('/api/v1/boards', type='json', auth='user', methods=['POST'], csrf=False)
     def create_board(self, name, description=None, visibility='team'):
         """
@@ -173,8 +494,19 @@ class BoardController(http.Controller):
         validate_request_security()
         require_auth()
         
+        limited = check_rate_limit('create_board')
+        if limited:
+            return limited
+        
+        # Schema validation before any ORM work
+        _parsed, errors = validate_create_board_input({
+            'name': name, 'description': description, 'visibility': visibility,
+        })
+        if errors:
+            return validation_error(errors)
+        
         try:
-            if not name or not name.strip():
+            if not name.strip():
                 return {
                     'error': {
                         'code': 'VALIDATION_ERROR',
@@ -198,6 +530,7 @@ class BoardController(http.Controller):
             # Add contract version header
             request.httprequest.environ['HTTP_X_CONTRACT_VERSION'] = CONTRACT_VERSION
             
+            note_primary_write()
             _logger.info(f"User {request.env.user.id} created board {project.id}")
             return {'board': board}
             
@@ -208,4 +541,108 @@ class BoardController(http.Controller):
                     'code': 'INTERNAL_ERROR',
                     'message': str(e),
                 }
-            }
\ No newline at end of file
+            }
+
+    @http.route('/api/v1/boards/<string:board_id>/clone', type='json', auth='user', methods=['POST'], csrf=False)
+    def clone_board(self, board_id, name, period_start=None, source_period_start=None, with_chatter=False):
+        """
+        Clone a board (stages, cards, subtask hierarchy, tags) for a new period
+        
+        Body:
+            {
+                "name": "Finance SSC Month-End — 2025-12",
+                "period_start": "2025-12-01",
+                "source_period_start": "2025-11-01",
+                "with_chatter": false
+            }
+        
+            period_start: Deadlines keep their offset to the period start
+                (omit to copy deadlines as they are)
+            source_period_start: Defaults to the first day of the month of
+                the source's earliest deadline
+            with_chatter: Keep tracking, creation logs and assignment mails
+                (default: one note on the new board instead)
+        
+        Headers:
+            Idempotency-Key (optional): Replays return the original response
+        
+        Returns:
+            { "board": Board DTO, "stages_created": int, "cards_created": int }
+        """
+        validate_request_method(['POST'])
+        validate_request_security()
+        require_auth()
+        
+        limited = check_rate_limit('clone_board')
+        if limited:
+            return limited
+        
+        payload = {
+            'name': name, 'period_start': period_start,
+            'source_period_start': source_period_start, 'with_chatter': with_chatter,
+        }
+        _parsed, errors = validate_clone_board_input(payload)
+        if errors:
+            return validation_error(errors)
+        
+        claim_id, replay = claim_idempotency_key('clone_board', dict(payload, board_id=board_id))
+        if replay is not None:
+            return replay
+        
+        try:
+            # Parse board_id: "project:123" → 123
+            prefix, _sep, number = board_id.partition(':')
+            if prefix != 'project' or not (number.isascii() and number.isdigit()):
+                return {
+                    'error': {
+                        'code': 'INVALID_BOARD_ID',
+                        'message': f'Invalid board_id format: {board_id}',
+                    }
+                }
+            
+            # Fetch source (ACL + record rules)
+            source = request.env['project.project'].search([('id', '=', int(number))])
+            if not source:
+                return {
+                    'error': {
+                        'code': 'BOARD_NOT_FOUND',
+                        'message': 'Board not found or access denied',
+                    }
+                }
+            
+            if not name.strip():
+                return {
+                    'error': {
+                        'code': 'VALIDATION_ERROR',
+                        'message': 'Board name is required',
+                        'details': {'field': 'name'},
+                    }
+                }
+            
+            project, stages_created, cards_created = copy_board(
+                source,
+                name.strip(),
+                period_start=fields.Date.to_date(period_start),
+                source_start=fields.Date.to_date(source_period_start),
+                with_chatter=bool(with_chatter),
+            )
+            
+            # Map to DTO
+            result = map_board_clone(project, stages_created, cards_created)
+            sample_validate_output('board', [result['board']])
+            
+            # Add contract version header
+            request.httprequest.environ['HTTP_X_CONTRACT_VERSION'] = CONTRACT_VERSION
+            
+            note_primary_write()
+            _logger.info(f"User {request.env.user.id} cloned board {board_id} into board {project.id} ({cards_created} cards)")
+            return complete_idempotency_key(claim_id, result)
+        
+        except Exception as e:
+            _logger.error(f"Error cloning board {board_id}: {str(e)}", exc_info=True)
+            return {
+                'error': {
+                    'code': 'INTERNAL_ERROR',
+                    'message': str(e),
+                }
+            }
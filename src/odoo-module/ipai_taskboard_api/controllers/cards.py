@@ -13,19 +13,63 @@ from odoo import http
 from odoo.http import request
 from ..services.mapping import (
     map_card,
+    map_cards,
+    map_card_batch,
+    map_card_column,
+    map_card_tree_node,
+    map_import_result,
     CONTRACT_VERSION,
 )
+from ..services.queries import (
+    card_visibility,
+    stage_card_page,
+    replica_search,
+    replica_search_count,
+    card_subtree,
+    card_ancestors,
+    DEFAULT_TREE_DEPTH,
+    MAX_TREE_DEPTH,
+    DEFAULT_PER_STAGE_LIMIT,
+    MAX_PER_STAGE_LIMIT,
+)
 from ..services.auth import require_auth
+from ..services.rate_limit import check_rate_limit
+from ..services.replica import replica_read, note_primary_write
+from ..services.idempotency import claim_idempotency_key, complete_idempotency_key
+from ..services.coalescing import coalesce_card_write
+from ..services.wip import check_wip_limit
+from ..services.identity import normalize_email
+from ..services.security import sanitize_markdown, validate_request_security
+from ..services.transport import TEXT_BODY_CONTENT_TYPES
+from ..services.card_import import (
+    parse_import_rows,
+    resolve_import_rows,
+    create_import_rows,
+    apply_deferred_side_effects,
+    ImportAborted,
+    MAX_IMPORT_BYTES,
+)
+from ..services.schema import (
+    validate_create_card_input,
+    validate_update_card_input,
+    validation_error,
+    sample_validate_output,
+)
 import logging
 
 _logger = logging.getLogger(__name__)
 
+# Upper bound for GET /api/v1/cards?ids=...
+MAX_MULTI_GET_IDS = 100
+
 
 class CardController(http.Controller):
     """Card endpoints (project.task)"""
 
     @http.route('/api/v1/boards/<string:board_id>/cards', type='json', auth='user', methods=['GET'], csrf=False)
-    def list_cards(self, board_id, stage=None, tag=None, owner=None, due_from=None, due_to=None, q=None, page=0, limit=100):
+    @replica_read
+    def list_cards(self, board_id, stage=None, tag=None, owner=None, due_from=None, due_to=None, q=None, page=0, limit=100,
+                   stages=None, per_stage_limit=DEFAULT_PER_STAGE_LIMIT, cursors=None):
         """
         List cards with filters
         
@@ -38,6 +82,9 @@ class CardController(http.Controller):
             q (str): Search query
             page (int): Page number
             limit (int): Items per page
+            stages (list[str]): Per-column mode — page each listed stage independently
+            per_stage_limit (int): Cards per column in per-column mode (max 100)
+            cursors (dict[str, str]): {stage_id: next_cursor} from the previous page
         
         Returns:
             {
@@ -46,9 +93,19 @@ class CardController(http.Controller):
                 "page": int,
                 "limit": int
             }
+            
+            Per-column mode (stages given):
+            {
+                "columns": [{"stage_id", "cards": [Card, ...], "next_cursor", "has_more"}, ...],
+                "per_stage_limit": int
+            }
         """
         require_auth()
         
+        limited = check_rate_limit('list_cards', items=per_stage_limit if stages else limit, pages=len(stages or ()))
+        if limited:
+            return limited
+        
         try:
             # Parse board_id
             if not board_id.startswith('project:'):
@@ -79,10 +136,8 @@ class CardController(http.Controller):
             # Filter by owner
             if owner:
                 if '@' in owner:
-                    # Email lookup
-                    partner = request.env['res.partner'].search([('email', '=', owner)], limit=1)
-                    if partner:
-                        domain.append(('user_id.partner_id', '=', partner.id))
+                    # Case-insensitive email match (indexed email_normalized)
+                    domain.append(('user_id.email_normalized', '=', normalize_email(owner) or owner))
                 else:
                     # Partner ID
                     try:
@@ -103,14 +158,45 @@ class CardController(http.Controller):
                 domain.append(('name', 'ilike', q))
                 domain.append(('description', 'ilike', q))
             
+            # Per-column mode: each stage is paged on its own (sequence, id)
+            # cursor, so scrolling one column never re-reads the others
+            if stages:
+                cursors = cursors or {}
+                per_stage_limit = max(1, min(int(per_stage_limit), MAX_PER_STAGE_LIMIT))
+                columns = []
+                for stage_key in stages:
+                    if not stage_key.startswith('stage:'):
+                        return {
+                            'error': {
+                                'code': 'VALIDATION_ERROR',
+                                'message': f'Invalid stage_id format: {stage_key}',
+                                'details': {'field': 'stages'},
+                            }
+                        }
+                    stage_id = int(stage_key.split(':')[1])
+                    tasks, next_cursor = stage_card_page(
+                        domain, stage_id, per_stage_limit, cursors.get(stage_key)
+                    )
+                    columns.append(map_card_column(stage_id, tasks, next_cursor))
+                
+                # Add contract version header
+                request.httprequest.environ['HTTP_X_CONTRACT_VERSION'] = CONTRACT_VERSION
+                
+                _logger.info(f"User {request.env.user.id} listed {len(columns)} columns for board {board_id}")
+                return {
+                    'columns': columns,
+                    'per_stage_limit': per_stage_limit,
+                }
+            
             # Fetch tasks (ACL enforced)
             Task = request.env['project.task']
             offset = page * limit
-            tasks = Task.search(domain, offset=offset, limit=limit, order='sequence,id')
-            total_count = Task.search_count(domain)
+            tasks = replica_search(Task, domain, offset=offset, limit=limit, order='sequence,id')
+            total_count = replica_search_count(Task, domain)
             
             # Map to DTOs
-            cards = [map_card(task) for task in tasks]
+            cards = map_cards(tasks)
+            sample_validate_output('card', cards)
             
             response = {
                 'cards': cards,
@@ -125,6 +211,13 @@ class CardController(http.Controller):
             _logger.info(f"User {request.env.user.id} listed {len(cards)} cards for board {board_id}")
             return response
             
+        except ValueError as e:
+            return {
+                'error': {
+                    'code': 'VALIDATION_ERROR',
+                    'message': str(e),
+                }
+            }
         except Exception as e:
             _logger.error(f"Error listing cards: {str(e)}", exc_info=True)
             return {
@@ -135,10 +228,15 @@ class CardController(http.Controller):
             }
 
     @http.route('/api/v1/cards/<string:card_id>', type='json', auth='user', methods=['GET'], csrf=False)
+    @replica_read
     def get_card(self, card_id):
         """Get card detail"""
         require_auth()
         
+        limited = check_rate_limit('get_card')
+        if limited:
+            return limited
+        
         try:
             # Parse card_id: "task:123" → 123
             if not card_id.startswith('task:'):
@@ -169,6 +267,7 @@ class CardController(http.Controller):
             
             # Map to DTO
             card = map_card(task)
+            sample_validate_output('card', [card])
             
             # Add contract version header
             request.httprequest.environ['HTTP_X_CONTRACT_VERSION'] = CONTRACT_VERSION
@@ -184,6 +283,193 @@ class CardController(http.Controller):
                 }
             }
 
+    @http.route('/api/v1/cards', type='json', auth='user', methods=['GET'], csrf=False)
+    def get_cards(self, ids=None):
+        """
+        Get many cards by id in one call
+        
+        Query params:
+            ids (list[str] | str): Card ids, as a list or comma-separated
+                ("task:1,task:2"); max 100
+        
+        Returns:
+            {
+                "items": [{"id": "task:1", "card": Card | null, "error": {"code", "message"} | null}, ...],
+                "found": int
+            }
+            
+            Items follow the order of ids. Missing cards are reported as
+            CARD_NOT_FOUND, unreadable ones as PERMISSION_DENIED and
+            malformed ids as INVALID_CARD_ID.
+        """
+        require_auth()
+        
+        try:
+            if isinstance(ids, str):
+                ids = [card_key for card_key in ids.split(',') if card_key]
+            elif ids is not None and not isinstance(ids, list):
+                return {
+                    'error': {
+                        'code': 'VALIDATION_ERROR',
+                        'message': 'ids must be a list or a comma-separated string',
+                        'details': {'field': 'ids'},
+                    }
+                }
+            ids = [str(card_key).strip() for card_key in ids or []]
+            
+            # Charged per requested id, once ids is known to be a list
+            limited = check_rate_limit('get_cards', items=len(ids))
+            if limited:
+                return limited
+            
+            if not ids:
+                return {
+                    'error': {
+                        'code': 'VALIDATION_ERROR',
+                        'message': 'ids is required',
+                        'details': {'field': 'ids'},
+                    }
+                }
+            if len(ids) > MAX_MULTI_GET_IDS:
+                return {
+                    'error': {
+                        'code': 'VALIDATION_ERROR',
+                        'message': f'At most {MAX_MULTI_GET_IDS} ids per request',
+                        'details': {'field': 'ids'},
+                    }
+                }
+            
+            # Parse well-formed ids; malformed ones are reported per item
+            task_ids = {}
+            for card_key in ids:
+                prefix, _sep, number = card_key.partition(':')
+                if prefix == 'task' and number.isascii() and number.isdigit():
+                    task_ids[card_key] = int(number)
+            
+            # One access-filtered search + one probe for the rest
+            unique_ids = list(dict.fromkeys(task_ids.values()))
+            visible, hidden_ids = card_visibility(unique_ids) if unique_ids else (request.env['project.task'], set())
+            
+            # Batch-map visible cards (render cache, shared prefetch)
+            cards = dict(zip(visible.ids, map_cards(visible)))
+            sample_validate_output('card', list(cards.values()))
+            
+            # Add contract version header
+            request.httprequest.environ['HTTP_X_CONTRACT_VERSION'] = CONTRACT_VERSION
+            
+            _logger.info(f"User {request.env.user.id} fetched {len(cards)}/{len(ids)} cards by id")
+            return map_card_batch(ids, task_ids, cards, hidden_ids)
+            
+        except Exception as e:
+            _logger.error(f"Error fetching cards {ids}: {str(e)}", exc_info=True)
+            return {
+                'error': {
+                    'code': 'INTERNAL_ERROR',
+                    'message': str(e),
+                }
+            }
+
+    @http.route('/api/v1/cards/<string:card_id>/tree', type='json', auth='user', methods=['GET'], csrf=False)
+    def get_card_tree(self, card_id, direction='descendants', max_depth=DEFAULT_TREE_DEPTH):
+        """
+        Get a card's subtask hierarchy in one call
+        
+        Query params:
+            direction (str): 'descendants' (full subtree, default) or 'ancestors'
+            max_depth (int): Levels to walk (default 10, max 20)
+        
+        Returns:
+            {
+                "root_id": "task:123",
+                "direction": "descendants",
+                "nodes": [{"card": Card, "depth", "parent_id", "rollup": {"done", "total"}}, ...]
+            }
+            
+            Descendants are in pre-order (root first); ancestors run from the
+            top-level task down to the direct parent and carry no rollup.
+        """
+        require_auth()
+        
+        limited = check_rate_limit('get_card_tree')
+        if limited:
+            return limited
+        
+        try:
+            # Parse card_id
+            if not card_id.startswith('task:'):
+                return {
+                    'error': {
+                        'code': 'INVALID_CARD_ID',
+                        'message': f'Invalid card_id format: {card_id}',
+                    }
+                }
+            
+            if direction not in ('descendants', 'ancestors'):
+                return {
+                    'error': {
+                        'code': 'VALIDATION_ERROR',
+                        'message': f'Invalid direction: {direction}',
+                        'details': {'field': 'direction'},
+                    }
+                }
+            
+            try:
+                max_depth = max(1, min(int(max_depth), MAX_TREE_DEPTH))
+            except (TypeError, ValueError):
+                return {
+                    'error': {
+                        'code': 'VALIDATION_ERROR',
+                        'message': f'max_depth must be an integer (max {MAX_TREE_DEPTH})',
+                        'details': {'field': 'max_depth'},
+                    }
+                }
+            
+            task_id = int(card_id.split(':')[1])
+            
+            # Fetch task (ACL enforced)
+            Task = request.env['project.task']
+            task = Task.browse(task_id)
+            
+            if not task.exists():
+                return {
+                    'error': {
+                        'code': 'CARD_NOT_FOUND',
+                        'message': 'Card not found or access denied',
+                    }
+                }
+            
+            # Check access
+            task.check_access_rights('read')
+            task.check_access_rule('read')
+            
+            # One recursive query; rows are already filtered by record rules
+            if direction == 'descendants':
+                nodes = card_subtree(task_id, max_depth)
+            else:
+                nodes = card_ancestors(task_id, max_depth)
+            
+            # Browse all nodes at once so map_card prefetches in batch
+            tasks = Task.browse([node['id'] for node in nodes])
+            response = {
+                'root_id': card_id,
+                'direction': direction,
+                'nodes': [map_card_tree_node(t, node) for t, node in zip(tasks, nodes)],
+            }
+            
+            # Add contract version header
+            request.httprequest.environ['HTTP_X_CONTRACT_VERSION'] = CONTRACT_VERSION
+            
+            return response
+            
+        except Exception as e:
+            _logger.error(f"Error fetching tree of card {card_id}: {str(e)}", exc_info=True)
+            return {
+                'error': {
+                    'code': 'INTERNAL_ERROR',
+                    'message': str(e),
+                }
+            }
+
     @http.route('/api/v1/cards', type='json', auth='user', methods=['POST'], csrf=False)
     def create_card(self, board_id, stage_id, title, description_md=None, priority='1', due_date=None, owners=None, tags=None, parent_id=None):
         """
@@ -202,14 +488,38 @@ class CardController(http.Controller):
                 "parent_id": null
             }
         
+        Headers:
+            Idempotency-Key (optional): Replays return the original response
+        
         Returns:
             { "card": Card DTO }
+        
+            WIP_LIMIT_REACHED (409) when the stage is at its wip_limit
         """
         require_auth()
         
+        limited = check_rate_limit('create_card')
+        if limited:
+            return limited
+        
+        payload = {
+            'board_id': board_id, 'stage_id': stage_id, 'title': title,
+            'description_md': description_md, 'priority': priority, 'due_date': due_date,
+            'owners': owners, 'tags': tags, 'parent_id': parent_id,
+        }
+        
+        # Schema validation (single pass, ids parsed to int) before any ORM work
+        parsed, errors = validate_create_card_input(payload)
+        if errors:
+            return validation_error(errors)
+        
+        claim_id, replay = claim_idempotency_key('create_card', payload)
+        if replay is not None:
+            return replay
+        
         try:
             # Validate required fields
-            if not title or not title.strip():
+            if not title.strip():
                 return {
                     'error': {
                         'code': 'VALIDATION_ERROR',
@@ -218,20 +528,16 @@ class CardController(http.Controller):
                     }
                 }
             
-            # Parse IDs
-            project_id = int(board_id.split(':')[1])
-            stage_id_int = int(stage_id.split(':')[1])
-            
-            # Prepare values
+            # Prepare values (ids already parsed by the validator)
             vals = {
                 'name': title.strip(),
-                'project_id': project_id,
-                'stage_id': stage_id_int,
+                'project_id': parsed['board_id'],
+                'stage_id': parsed['stage_id'],
                 'priority': priority,
             }
             
             if description_md:
-                vals['description'] = description_md
+                vals['description'] = sanitize_markdown(description_md)
             
             if due_date:
                 vals['date_deadline'] = due_date
@@ -245,12 +551,16 @@ class CardController(http.Controller):
             
             # Set tags
             if tags:
-                tag_ids = [int(tag.split(':')[1]) for tag in tags if tag.startswith('tag:')]
-                vals['tag_ids'] = [(6, 0, tag_ids)]
+                vals['tag_ids'] = [(6, 0, parsed['tags'])]
             
             # Set parent
             if parent_id:
-                vals['parent_id'] = int(parent_id.split(':')[1])
+                vals['parent_id'] = parsed['parent_id']
+            
+            # Target column must have room (row lock held until commit)
+            full = check_wip_limit(vals['project_id'], vals['stage_id'])
+            if full:
+                return full
             
             # Create task
             Task = request.env['project.task']
@@ -258,12 +568,14 @@ class CardController(http.Controller):
             
             # Map to DTO
             card = map_card(task)
+            sample_validate_output('card', [card])
             
             # Add contract version header
             request.httprequest.environ['HTTP_X_CONTRACT_VERSION'] = CONTRACT_VERSION
             
+            note_primary_write()
             _logger.info(f"User {request.env.user.id} created card {task.id} in board {board_id}")
-            return {'card': card}
+            return complete_idempotency_key(claim_id, {'card': card})
             
         except Exception as e:
             _logger.error(f"Error creating card: {str(e)}", exc_info=True)
@@ -274,6 +586,139 @@ class CardController(http.Controller):
                 }
             }
 
+    @http.route('/api/v1/boards/<string:board_id>/cards:import', type='json', auth='user', methods=['POST'], csrf=False)
+    def import_cards(self, board_id, data, format='csv', dry_run=False, skip_invalid=False, defer_tracking=False):
+        """
+        Bulk-create cards from CSV or NDJSON (see services/card_import.py)
+        
+        Body:
+            {
+                "data": "title,stage,owner,tags,due_date\\nClose VAT,To Do,jane@company.com,\\"Tax, Q4\\",2025-12-31\\n",
+                "format": "csv",
+                "dry_run": false,
+                "skip_invalid": false,
+                "defer_tracking": false
+            }
+        
+            format: csv (header row required) | ndjson (one JSON object per line)
+            dry_run: Validate and resolve every row, create nothing
+            skip_invalid: Import the valid rows even if some rows fail
+                (default: any failing row aborts the whole import)
+            defer_tracking: Create without tracking/mail side effects, then
+                subscribe owners and log the import once on the board
+        
+        Headers:
+            Idempotency-Key (optional): Replays return the original response
+        
+        Returns:
+            ImportResult: {"board_id", "dry_run", "total_rows", "valid_rows",
+                           "created": [{"row", "card_id"}], "errors": [{"row", "errors"}],
+                           "ignored_columns"}
+        
+            Without skip_invalid, failing rows return VALIDATION_ERROR with the
+            ImportResult (nothing created) in details.
+        """
+        # JSON-RPC, or the raw file on the REST route: never a form post.
+        # JSON escaping can double the size of the data
+        validate_request_security(TEXT_BODY_CONTENT_TYPES, 2 * MAX_IMPORT_BYTES)
+        require_auth()
+        
+        try:
+            rows, parse_errors, ignored_columns = parse_import_rows(data, format)
+        except ValueError as e:
+            return {
+                'error': {
+                    'code': 'VALIDATION_ERROR',
+                    'message': str(e),
+                    'details': {'field': 'data'},
+                }
+            }
+        
+        limited = check_rate_limit('import_cards', items=len(rows))
+        if limited:
+            return limited
+        
+        claim_id, replay = None, None
+        if not dry_run:
+            claim_id, replay = claim_idempotency_key('import_cards', {
+                'board_id': board_id, 'data': data, 'format': format,
+                'skip_invalid': skip_invalid, 'defer_tracking': defer_tracking,
+            })
+        if replay is not None:
+            return replay
+        
+        try:
+            # Parse board_id: "project:123" → 123
+            prefix, _sep, number = board_id.partition(':')
+            if prefix != 'project' or not (number.isascii() and number.isdigit()):
+                return {
+                    'error': {
+                        'code': 'INVALID_BOARD_ID',
+                        'message': f'Invalid board_id format: {board_id}',
+                    }
+                }
+            
+            project = request.env['project.project'].search([('id', '=', int(number))])
+            if not project:
+                return {
+                    'error': {
+                        'code': 'BOARD_NOT_FOUND',
+                        'message': 'Board not found or access denied',
+                    }
+                }
+            
+            # One lookup per kind (stages, owners, tags, parents) for all rows
+            items, errors = resolve_import_rows(rows, project.id)
+            errors = parse_errors + errors
+            total_rows = len(rows) + len(parse_errors)
+            
+            created = []
+            if not dry_run and (skip_invalid or not errors):
+                try:
+                    with request.env.cr.savepoint():
+                        created, create_errors = create_import_rows(items, defer_tracking)
+                        errors += create_errors
+                        if create_errors and not skip_invalid:
+                            raise ImportAborted(create_errors)
+                        if defer_tracking:
+                            apply_deferred_side_effects(project, created)
+                except ImportAborted:
+                    created = []
+            
+            result = map_import_result(
+                board_id, total_rows, len(items), created, errors, ignored_columns, bool(dry_run),
+            )
+            
+            # Add contract version header
+            request.httprequest.environ['HTTP_X_CONTRACT_VERSION'] = CONTRACT_VERSION
+            
+            if errors and not dry_run and not skip_invalid:
+                _logger.info(f"User {request.env.user.id} import into board {board_id} rejected: {len(errors)} failing rows")
+                return {
+                    'error': {
+                        'code': 'VALIDATION_ERROR',
+                        'message': f'{len(errors)} of {total_rows} rows failed; nothing was imported',
+                        'details': result,
+                    }
+                }
+            
+            if created:
+                note_primary_write()
+            _logger.info(
+                f"User {request.env.user.id} imported {len(created)}/{total_rows} cards into board {board_id}"
+                f"{' (dry run)' if dry_run else ''}"
+            )
+            return complete_idempotency_key(claim_id, result)
+        
+        except Exception as e:
+            _logger.error(f"Error importing cards into board {board_id}: {str(e)}", exc_info=True)
+            return {
+                'error': {
+                    'code': 'INTERNAL_ERROR',
+                    'message': str(e),
+                }
+            }
+
     @http.route('/api/v1/cards/<string:card_id>', type='json', auth='user', methods=['PATCH'], csrf=False)
     def update_card(self, card_id, title=None, description_md=None, stage_id=None, priority=None, due_date=None, owners=None, tags=None, checklist=None):
         """
@@ -281,11 +726,29 @@ class CardController(http.Controller):
         
         Body: Only fields to update
         
+        Rapid successive PATCHes from the same session are coalesced
+        (see services/coalescing.py).
+        
         Returns:
             { "card": Card DTO }
+        
+            WIP_LIMIT_REACHED (409) when moving into a stage at its wip_limit
         """
         require_auth()
         
+        limited = check_rate_limit('update_card')
+        if limited:
+            return limited
+        
+        # Schema validation (single pass, ids parsed to int) before any ORM work
+        parsed, errors = validate_update_card_input({
+            'title': title, 'description_md': description_md, 'stage_id': stage_id,
+            'priority': priority, 'due_date': due_date, 'owners': owners, 'tags': tags,
+            'checklist': checklist,
+        })
+        if errors:
+            return validation_error(errors)
+        
         try:
             # Parse card_id
             if not card_id.startswith('task:'):
@@ -321,11 +784,11 @@ class CardController(http.Controller):
                 vals['name'] = title.strip()
             
             if description_md is not None:
-                vals['description'] = description_md
+                vals['description'] = sanitize_markdown(description_md)
             
             if stage_id is not None:
                 # Stage change triggers audit trail
-                vals['stage_id'] = int(stage_id.split(':')[1])
+                vals['stage_id'] = parsed['stage_id']
             
             if priority is not None:
                 vals['priority'] = priority
@@ -339,18 +802,25 @@ class CardController(http.Controller):
                     vals['user_id'] = partner.user_ids[0].id
             
             if tags is not None:
-                tag_ids = [int(tag.split(':')[1]) for tag in tags if tag.startswith('tag:')]
-                vals['tag_ids'] = [(6, 0, tag_ids)]
+                vals['tag_ids'] = [(6, 0, parsed['tags'])]
+            
+            # Moving into another column: the target must have room
+            if 'stage_id' in vals and task.active and vals['stage_id'] != task.stage_id.id:
+                full = check_wip_limit(task.project_id.id, vals['stage_id'])
+                if full:
+                    return full
             
-            # Update task
-            task.write(vals)
+            # Update task (no-op fields dropped, typing bursts coalesced)
+            coalesce_card_write(task, vals)
             
             # Map to DTO
             card = map_card(task)
+            sample_validate_output('card', [card])
             
             # Add contract version header
             request.httprequest.environ['HTTP_X_CONTRACT_VERSION'] = CONTRACT_VERSION
             
+            note_primary_write()
             _logger.info(f"User {request.env.user.id} updated card {card_id}")
             return {'card': card}
             
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 """
-Comment Controller — POST /api/v1/cards/{id}/comments, GET /api/v1/cards/{id}/activity
+Comment Controller — POST /api/v1/cards/{id}/comments, GET /api/v1/cards/{id}/activity,
+GET /api/v1/boards/{id}/activity
 
 Canonical mapping: mail.message → Activity DTO
 
@@ -13,20 +14,35 @@ from odoo import http
 from odoo.http import request
 from ..services.mapping import (
     map_activity,
+    map_board_activity,
     CONTRACT_VERSION,
 )
 from ..services.auth import require_auth
-from ..services.mentions import parse_mentions, resolve_mentions
+from ..services.queries import board_activity_page, card_activity_page
+from ..services.rate_limit import check_rate_limit
+from ..services.replica import replica_read, note_primary_write
+from ..services.idempotency import claim_idempotency_key, complete_idempotency_key
+from ..services.mentions import resolve_mentions
+from ..services.sanitizer import sanitize_text
+from ..services.schema import (
+    validate_create_comment_input,
+    validation_error,
+    sample_validate_output,
+)
 import logging
 import re
 
 _logger = logging.getLogger(__name__)
 
+# Upper bound for GET /api/v1/boards/{id}/activity page size
+MAX_BOARD_ACTIVITY_LIMIT = 200
+
 
 class CommentController(http.Controller):
     """Comment/Activity endpoints (mail.message)"""
 
     @http.route('/api/v1/cards/<string:card_id>/activity', type='json', auth='user', methods=['GET'], csrf=False)
+    @replica_read
     def get_card_activity(self, card_id, activity_type=None, page=0, limit=50):
         """
         Get activity history for a card
@@ -46,6 +62,10 @@ class CommentController(http.Controller):
         """
         require_auth()
         
+        limited = check_rate_limit('get_card_activity', items=limit)
+        if limited:
+            return limited
+        
         try:
             # Parse card_id
             if not card_id.startswith('task:'):
@@ -74,29 +94,13 @@ class CommentController(http.Controller):
             task.check_access_rights('read')
             task.check_access_rule('read')
             
-            # Build domain for messages
-            domain = [
-                ('model', '=', 'project.task'),
-                ('res_id', '=', task_id),
-            ]
-            
-            # Filter by type
-            if activity_type:
-                # Map API type to Odoo message_type/subtype
-                # For now, simple filter on message_type
-                if activity_type == 'comment':
-                    domain.append(('message_type', '=', 'comment'))
-                elif activity_type in ['stage_change', 'field_update', 'assignment']:
-                    domain.append(('message_type', '=', 'notification'))
-            
-            # Fetch messages
-            Message = request.env['mail.message']
+            # Fetch messages (filtered by activity_type on message_type)
             offset = page * limit
-            messages = Message.search(domain, offset=offset, limit=limit, order='create_date desc')
-            total_count = Message.search_count(domain)
+            messages, total_count = card_activity_page(task_id, activity_type, limit, offset)
             
             # Map to DTOs
             activities = [map_activity(msg, task) for msg in messages]
+            sample_validate_output('activity', activities)
             
             response = {
                 'activities': activities,
@@ -119,6 +123,83 @@ class CommentController(http.Controller):
                 }
             }
 
+    @http.route('/api/v1/boards/<string:board_id>/activity', type='json', auth='user', methods=['GET'], csrf=False)
+    @replica_read
+    def get_board_activity(self, board_id, activity_type=None, cursor=None, limit=50):
+        """
+        Get the activity feed of every card on a board, newest first
+        
+        Query params:
+            activity_type (str): Filter by type (comment, stage_change, field_update, assignment, mention)
+            cursor (str): next_cursor from the previous page
+            limit (int): Items per page (max 200)
+        
+        Returns:
+            {
+                "items": [{"card_id": "task:1", "card_title": str, "activity": Activity}, ...],
+                "next_cursor": str | null,
+                "has_more": bool
+            }
+        """
+        require_auth()
+        
+        limited = check_rate_limit('get_board_activity', items=limit)
+        if limited:
+            return limited
+        
+        try:
+            # Parse board_id
+            if not board_id.startswith('project:'):
+                return {
+                    'error': {
+                        'code': 'INVALID_BOARD_ID',
+                        'message': f'Invalid board_id format: {board_id}',
+                    }
+                }
+            
+            project_id = int(board_id.split(':')[1])
+            limit = max(1, min(int(limit), MAX_BOARD_ACTIVITY_LIMIT))
+            
+            # Fetch project (ACL enforced)
+            project = request.env['project.project'].browse(project_id)
+            if not project.exists():
+                return {
+                    'error': {
+                        'code': 'BOARD_NOT_FOUND',
+                        'message': 'Board not found or access denied',
+                    }
+                }
+            project.check_access_rights('read')
+            project.check_access_rule('read')
+            
+            # One keyset query over the board's task messages
+            messages, next_cursor = board_activity_page(project_id, activity_type, limit, cursor)
+            
+            # Map to DTOs (authors/tracking/partners loaded per page)
+            response = map_board_activity(messages, next_cursor)
+            sample_validate_output('activity', [item['activity'] for item in response['items']])
+            
+            # Add contract version header
+            request.httprequest.environ['HTTP_X_CONTRACT_VERSION'] = CONTRACT_VERSION
+            
+            return response
+            
+        except ValueError as e:
+            return {
+                'error': {
+                    'code': 'VALIDATION_ERROR',
+                    'message': str(e),
+                }
+            }
+        except Exception as e:
+            _logger.error(f"Error fetching activity for board {board_id}: {str(e)}", exc_info=True)
+            return {
+                'error': {
+                    'code': 'INTERNAL_ERROR',
+                    'message': str(e),
+                }
+            }
+
     @http.route('/api/v1/cards/<string:card_id>/comments', type='json', auth='user', methods=['POST'], csrf=False)
     def create_comment(self, card_id, body_md, mentions=None):
         """
@@ -130,6 +211,9 @@ class CommentController(http.Controller):
                 "mentions": ["juan.cruz@company.com"]
             }
         
+        Headers:
+            Idempotency-Key (optional): Replays return the original response
+        
         Returns:
             { "activity": Activity DTO }
         
@@ -140,9 +224,24 @@ class CommentController(http.Controller):
         """
         require_auth()
         
+        limited = check_rate_limit('create_comment')
+        if limited:
+            return limited
+        
+        # Schema validation before any ORM work
+        _parsed, errors = validate_create_comment_input({'body_md': body_md, 'mentions': mentions})
+        if errors:
+            return validation_error(errors)
+        
+        claim_id, replay = claim_idempotency_key('create_comment', {
+            'card_id': card_id, 'body_md': body_md, 'mentions': mentions,
+        })
+        if replay is not None:
+            return replay
+        
         try:
             # Validate body
-            if not body_md or not body_md.strip():
+            if not body_md.strip():
                 return {
                     'error': {
                         'code': 'VALIDATION_ERROR',
@@ -178,9 +277,10 @@ class CommentController(http.Controller):
             task.check_access_rights('write')
             task.check_access_rule('write')
             
-            # Parse mentions from body if not provided
+            # Sanitize body and collect @mentions in a single pass
+            body_md, parsed_mentions = sanitize_text(body_md)
             if not mentions:
-                mentions = parse_mentions(body_md)
+                mentions = parsed_mentions
             
             # Resolve mentions to partner IDs
             mentioned_partner_ids = []
@@ -198,16 +298,18 @@ class CommentController(http.Controller):
             
             # Map to DTO
             activity = map_activity(message, task)
+            sample_validate_output('activity', [activity])
             
             # Add contract version header
             request.httprequest.environ['HTTP_X_CONTRACT_VERSION'] = CONTRACT_VERSION
             
+            note_primary_write()
             _logger.info(
                 f"User {request.env.user.id} commented on card {card_id}, "
                 f"mentioned {len(mentioned_partner_ids)} partners"
             )
             
-            return {'activity': activity}
+            return complete_idempotency_key(claim_id, {'activity': activity})
             
         except Exception as e:
             _logger.error(f"Error creating comment on card {card_id}: {str(e)}", exc_info=True)
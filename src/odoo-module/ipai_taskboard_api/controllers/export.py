@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Export Controller — GET /api/v1/export/{cards|comments} (type='http')
+
+Streams every card or comment of one or more boards as a CSV or XLSX
+download (see services/export.py). JSON-RPC cannot stream, so this is a
+plain HTTP route; errors use the REST transport's error responses.
+
+Security:
+* Boards are checked with the user's ACL + record rules before streaming
+* Rows are access-filtered the same way list_cards/get_card_activity are
+"""
+
+from odoo import http, fields
+from odoo.http import request
+from ..services.auth import require_auth
+from ..services.rate_limit import check_rate_limit
+from ..services.transport import rest_response, rest_error
+from ..services.mapping import CONTRACT_VERSION
+from ..services.export import (
+    EXPORT_DATASETS,
+    EXPORT_FORMATS,
+    stream_export,
+    xlsxwriter,
+)
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class ExportController(http.Controller):
+    """Bulk export endpoints"""
+
+    @http.route('/api/v1/export/<string:dataset>', type='http', auth='user', methods=['GET'], csrf=False)
+    def export(self, dataset, boards=None, format='csv', **kwargs):
+        """
+        Stream all cards or comments of the given boards
+
+        Path params:
+            dataset (str): cards | comments
+
+        Query params:
+            boards (str): Comma-separated board ids ("project:1,project:2");
+                every accessible board when omitted
+            format (str): csv (default) | xlsx
+
+        Returns:
+            File download (Content-Disposition: attachment), or an error
+            response in the standard envelope
+        """
+        require_auth()
+
+        limited = check_rate_limit('export')
+        if limited:
+            return rest_response(limited)
+
+        if dataset not in EXPORT_DATASETS:
+            return rest_error('VALIDATION_ERROR', f'dataset must be one of: {", ".join(EXPORT_DATASETS)}',
+                              {'field': 'dataset'})
+        if format not in EXPORT_FORMATS:
+            return rest_error('VALIDATION_ERROR', f'format must be one of: {", ".join(EXPORT_FORMATS)}',
+                              {'field': 'format'})
+        if format == 'xlsx' and xlsxwriter is None:
+            return rest_error('VALIDATION_ERROR', 'XLSX export requires the xlsxwriter package',
+                              {'field': 'format'})
+
+        try:
+            # Parse boards: "project:1,project:2" → [1, 2]
+            Project = request.env['project.project']
+            if boards:
+                board_ids = [item for item in boards.split(',') if item]
+                project_ids = []
+                for board_id in board_ids:
+                    prefix, _sep, number = board_id.partition(':')
+                    if prefix != 'project' or not (number.isascii() and number.isdigit()):
+                        return rest_error('INVALID_BOARD_ID', f'Invalid board_id format: {board_id}')
+                    project_ids.append(int(number))
+
+                # Every requested board must be visible (ACL + record rules)
+                visible = Project.search([('id', 'in', project_ids)])
+                hidden = set(project_ids) - set(visible.ids)
+                if hidden:
+                    return rest_error('BOARD_NOT_FOUND', 'Board not found or access denied',
+                                      {'board_ids': [f'project:{project_id}' for project_id in sorted(hidden)]})
+            else:
+                project_ids = Project.search([]).ids
+
+            content_type, extension = EXPORT_FORMATS[format]
+            filename = f'taskboard-{dataset}-{fields.Date.today().isoformat()}.{extension}'
+            body = stream_export(
+                request.env.registry,
+                request.env.uid,
+                dict(request.env.context),
+                dataset,
+                format,
+                sorted(set(project_ids)),
+            )
+
+            _logger.info(f"User {request.env.user.id} exporting {dataset} of {len(project_ids)} boards as {format}")
+            response = request.make_response(body, headers=[
+                ('Content-Type', content_type),
+                ('Content-Disposition', f'attachment; filename="{filename}"'),
+                ('Cache-Control', 'no-store'),
+                ('X-Contract-Version', CONTRACT_VERSION),
+            ])
+            response.direct_passthrough = True
+            return response
+
+        except Exception as e:
+            _logger.error(f"Error exporting {dataset}: {str(e)}", exc_info=True)
+            return rest_error('INTERNAL_ERROR', str(e))
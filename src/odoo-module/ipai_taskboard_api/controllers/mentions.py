@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+Mentions Controller — GET /api/v1/me/mentions, GET /api/v1/me/mentions/unread_count,
+POST /api/v1/me/mentions/read
+
+The current user's mentions inbox: card messages that list the user's
+partner as a recipient (create_comment mentions), with read state from
+mail.notification.
+
+Performance:
+* unread_count reads one row of ipai.taskboard.mention.counter, kept up
+  to date by mail.notification create/write/unlink — cheap enough for the
+  sidebar badge to poll
+
+Security:
+* Only the current user's own mentions are returned
+* Cards are filtered by ACL + record rules
+"""
+
+from odoo import http
+from odoo.http import request
+from ..services.mapping import map_mentions_page, CONTRACT_VERSION
+from ..services.auth import require_auth
+from ..services.rate_limit import check_rate_limit
+from ..services.replica import note_primary_write
+from ..services.queries import mentions_page
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Upper bound for GET /api/v1/me/mentions page size
+MAX_MENTIONS_LIMIT = 100
+
+
+class MentionController(http.Controller):
+    """Mentions inbox endpoints (mail.notification)"""
+
+    @http.route('/api/v1/me/mentions', type='json', auth='user', methods=['GET'], csrf=False)
+    def list_mentions(self, unread_only=False, cursor=None, limit=50):
+        """
+        List card messages where the current user was mentioned, newest first
+        
+        Query params:
+            unread_only (bool): Only unread mentions
+            cursor (str): next_cursor from the previous page
+            limit (int): Items per page (max 100)
+        
+        Returns:
+            {
+                "items": [{"mention_id": "msg:1", "card_id", "card_title", "board_id",
+                           "is_read": bool, "activity": Activity}, ...],
+                "unread": int,
+                "next_cursor": str | null,
+                "has_more": bool
+            }
+        """
+        require_auth()
+        
+        limited = check_rate_limit('list_mentions', items=limit)
+        if limited:
+            return limited
+        
+        try:
+            limit = max(1, min(int(limit), MAX_MENTIONS_LIMIT))
+            if isinstance(unread_only, str):
+                unread_only = unread_only.lower() in ('1', 'true', 'yes')
+            
+            partner = request.env.user.partner_id
+            rows, next_cursor = mentions_page(partner.id, bool(unread_only), limit, cursor)
+            
+            messages = request.env['mail.message'].browse([message_id for message_id, _is_read in rows])
+            unread = request.env['ipai.taskboard.mention.counter'].sudo()._get_unread(partner.id)
+            response = map_mentions_page(messages, dict(rows), next_cursor, unread)
+            
+            # Add contract version header
+            request.httprequest.environ['HTTP_X_CONTRACT_VERSION'] = CONTRACT_VERSION
+            
+            return response
+            
+        except ValueError as e:
+            return {
+                'error': {
+                    'code': 'VALIDATION_ERROR',
+                    'message': str(e),
+                }
+            }
+        except Exception as e:
+            _logger.error(f"Error listing mentions: {str(e)}", exc_info=True)
+            return {
+                'error': {
+                    'code': 'INTERNAL_ERROR',
+                    'message': str(e),
+                }
+            }
+
+    @http.route('/api/v1/me/mentions/unread_count', type='json', auth='user', methods=['GET'], csrf=False)
+    def get_unread_mentions_count(self):
+        """
+        Unread mention count for the sidebar badge (one primary-key read)
+        
+        Returns:
+            { "unread": int }
+        """
+        require_auth()
+        
+        limited = check_rate_limit('get_unread_mentions_count')
+        if limited:
+            return limited
+        
+        unread = request.env['ipai.taskboard.mention.counter'].sudo()._get_unread(
+            request.env.user.partner_id.id
+        )
+        
+        # Add contract version header
+        request.httprequest.environ['HTTP_X_CONTRACT_VERSION'] = CONTRACT_VERSION
+        
+        return {'unread': unread}
+
+    @http.route('/api/v1/me/mentions/read', type='json', auth='user', methods=['POST'], csrf=False)
+    def mark_mentions_read(self, mention_ids=None):
+        """
+        Mark mentions as read
+        
+        Body:
+            { "mention_ids": ["msg:1", "msg:2"] }   (omit to mark all as read)
+        
+        Returns:
+            { "unread": int }
+        """
+        require_auth()
+        
+        limited = check_rate_limit('mark_mentions_read')
+        if limited:
+            return limited
+        
+        try:
+            Message = request.env['mail.message']
+            partner = request.env.user.partner_id
+            
+            if mention_ids is None:
+                # Every message of the user's inbox that is a card mention
+                messages = Message.search([
+                    ('model', '=', 'project.task'),
+                    ('partner_ids', 'in', partner.ids),
+                    ('needaction', '=', True),
+                ])
+            else:
+                message_ids = []
+                for mention_id in mention_ids:
+                    if not isinstance(mention_id, str) or not mention_id.startswith('msg:'):
+                        return {
+                            'error': {
+                                'code': 'VALIDATION_ERROR',
+                                'message': f'Invalid mention_id format: {mention_id}',
+                                'details': {'field': 'mention_ids'},
+                            }
+                        }
+                    message_ids.append(int(mention_id.split(':')[1]))
+                messages = Message.browse(message_ids).exists()
+            
+            # Flags only the current user's notifications (counter follows via mail.notification.write)
+            messages.set_message_done()
+            unread = request.env['ipai.taskboard.mention.counter'].sudo()._get_unread(partner.id)
+            
+            note_primary_write()
+            _logger.info(f"User {request.env.user.id} marked {len(messages)} mentions as read")
+            return {'unread': unread}
+            
+        except ValueError as e:
+            return {
+                'error': {
+                    'code': 'VALIDATION_ERROR',
+                    'message': str(e),
+                }
+            }
+        except Exception as e:
+            _logger.error(f"Error marking mentions as read: {str(e)}", exc_info=True)
+            return {
+                'error': {
+                    'code': 'INTERNAL_ERROR',
+                    'message': str(e),
+                }
+            }
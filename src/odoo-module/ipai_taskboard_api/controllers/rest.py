@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+REST Controller — /api/v1/rest/* (type='http')
+
+Lean transport next to the JSON-RPC routes: same handlers, same DTOs, but
+query-string GETs, fast serialization and real HTTP status codes.
+
+    JSON-RPC: POST /api/v1/boards/project:42/cards  {"jsonrpc": "2.0", "params": {...}}
+    REST:     GET  /api/v1/rest/boards/project:42/cards?stage=stage:30&limit=50
+
+Security:
+* Same auth, ACL and record rules as the JSON-RPC routes (handlers are shared)
+* Routes are csrf=False: writes must be sent as application/json, which a
+  cross-site form cannot do (415 UNSUPPORTED_MEDIA_TYPE otherwise)
+"""
+
+from odoo import http
+from odoo.http import request
+from odoo.exceptions import AccessDenied, AccessError, ValidationError
+from .boards import BoardController
+from .cards import CardController
+from .comments import CommentController
+from .mentions import MentionController
+from .batch import BatchController
+from .attachments import AttachmentController
+from .search import SearchController
+from ..services.transport import (
+    rest_response,
+    rest_error,
+    require_content_type,
+    UnsupportedMediaType,
+    JSON_CONTENT_TYPES,
+    read_json_body,
+    read_text_body,
+    query_args,
+)
+import logging
+
+_logger = logging.getLogger(__name__)
+
+PAGE_INT_ARGS = ('page', 'limit')
+
+
+class RestController(http.Controller):
+    """REST transport for board, card and comment endpoints"""
+
+    def _call(self, handler, *path_args, status=200, body=False, int_args=(), list_args=(), json_args=(), text_body=None):
+        """
+        Run a JSON-RPC handler and serialize its result as a REST response
+        
+        Args:
+            handler: Bound controller method (route-decorated)
+            *path_args: Positional path parameters
+            status (int): HTTP status on success
+            body (bool): Read kwargs from the JSON body instead of the query string
+            int_args/list_args/json_args: Query-string coercions (see query_args)
+            text_body (str): Pass the raw request body (text) as this keyword,
+                next to the query-string arguments
+        """
+        try:
+            if request.httprequest.method not in ('GET', 'HEAD') and not text_body:
+                # Also writes without a body: no cross-site form can send JSON
+                require_content_type(JSON_CONTENT_TYPES)
+            if body:
+                kwargs = read_json_body()
+            else:
+                kwargs = query_args(int_args, list_args, json_args)
+            if text_body:
+                kwargs[text_body] = read_text_body()
+            return rest_response(handler(*path_args, **kwargs), status)
+        except UnsupportedMediaType as e:
+            return rest_error('UNSUPPORTED_MEDIA_TYPE', str(e))
+        except AccessDenied as e:
+            return rest_error('UNAUTHORIZED', str(e))
+        except AccessError as e:
+            return rest_error('PERMISSION_DENIED', str(e))
+        except (ValidationError, ValueError, TypeError) as e:
+            return rest_error('VALIDATION_ERROR', str(e))
+
+    # ------------------------------------------------------------------
+    # Boards
+    # ------------------------------------------------------------------
+
+    @http.route('/api/v1/rest/boards', type='http', auth='user', methods=['GET'], csrf=False)
+    def rest_list_boards(self, **kwargs):
+        return self._call(BoardController().list_boards, int_args=PAGE_INT_ARGS)
+
+    @http.route('/api/v1/rest/boards', type='http', auth='user', methods=['POST'], csrf=False)
+    def rest_create_board(self, **kwargs):
+        return self._call(BoardController().create_board, status=201, body=True)
+
+    @http.route('/api/v1/rest/boards/<string:board_id>', type='http', auth='user', methods=['GET'], csrf=False)
+    def rest_get_board(self, board_id, **kwargs):
+        return self._call(BoardController().get_board, board_id)
+
+    @http.route('/api/v1/rest/boards/<string:board_id>/clone', type='http', auth='user', methods=['POST'], csrf=False)
+    def rest_clone_board(self, board_id, **kwargs):
+        return self._call(BoardController().clone_board, board_id, status=201, body=True)
+
+    @http.route('/api/v1/rest/boards/<string:board_id>/snapshot', type='http', auth='user', methods=['GET'], csrf=False)
+    def rest_get_board_snapshot(self, board_id, **kwargs):
+        return self._call(BoardController().get_board_snapshot, board_id, int_args=('per_stage_limit',))
+
+    @http.route('/api/v1/rest/boards/<string:board_id>/charts', type='http', auth='user', methods=['GET'], csrf=False)
+    def rest_get_board_charts(self, board_id, **kwargs):
+        return self._call(BoardController().get_board_charts, board_id)
+
+    @http.route('/api/v1/rest/boards/<string:board_id>/flow-metrics', type='http', auth='user', methods=['GET'], csrf=False)
+    def rest_get_board_flow_metrics(self, board_id, **kwargs):
+        return self._call(BoardController().get_board_flow_metrics, board_id)
+
+    # ------------------------------------------------------------------
+    # Cards
+    # ------------------------------------------------------------------
+
+    @http.route('/api/v1/rest/boards/<string:board_id>/cards', type='http', auth='user', methods=['GET'], csrf=False)
+    def rest_list_cards(self, board_id, **kwargs):
+        return self._call(
+            CardController().list_cards, board_id,
+            int_args=PAGE_INT_ARGS + ('per_stage_limit',),
+            list_args=('stages',),
+            json_args=('cursors',),
+        )
+
+    @http.route('/api/v1/rest/cards', type='http', auth='user', methods=['POST'], csrf=False)
+    def rest_create_card(self, **kwargs):
+        return self._call(CardController().create_card, status=201, body=True)
+
+    @http.route('/api/v1/rest/boards/<string:board_id>/cards:import', type='http', auth='user', methods=['POST'], csrf=False)
+    def rest_import_cards(self, board_id, **kwargs):
+        return self._call(
+            CardController().import_cards, board_id,
+            json_args=('dry_run', 'skip_invalid', 'defer_tracking'),
+            text_body='data',
+        )
+
+    @http.route('/api/v1/rest/cards', type='http', auth='user', methods=['GET'], csrf=False)
+    def rest_get_cards(self, **kwargs):
+        return self._call(CardController().get_cards, list_args=('ids',))
+
+    @http.route('/api/v1/rest/cards/<string:card_id>', type='http', auth='user', methods=['GET'], csrf=False)
+    def rest_get_card(self, card_id, **kwargs):
+        return self._call(CardController().get_card, card_id)
+
+    @http.route('/api/v1/rest/cards/<string:card_id>', type='http', auth='user', methods=['PATCH'], csrf=False)
+    def rest_update_card(self, card_id, **kwargs):
+        return self._call(CardController().update_card, card_id, body=True)
+
+    @http.route('/api/v1/rest/cards/<string:card_id>/tree', type='http', auth='user', methods=['GET'], csrf=False)
+    def rest_get_card_tree(self, card_id, **kwargs):
+        return self._call(CardController().get_card_tree, card_id, int_args=('max_depth',))
+
+    # ------------------------------------------------------------------
+    # Comments / activity
+    # ------------------------------------------------------------------
+
+    @http.route('/api/v1/rest/cards/<string:card_id>/activity', type='http', auth='user', methods=['GET'], csrf=False)
+    def rest_get_card_activity(self, card_id, **kwargs):
+        return self._call(CommentController().get_card_activity, card_id, int_args=PAGE_INT_ARGS)
+
+    @http.route('/api/v1/rest/boards/<string:board_id>/activity', type='http', auth='user', methods=['GET'], csrf=False)
+    def rest_get_board_activity(self, board_id, **kwargs):
+        return self._call(CommentController().get_board_activity, board_id, int_args=('limit',))
+
+    @http.route('/api/v1/rest/cards/<string:card_id>/comments', type='http', auth='user', methods=['POST'], csrf=False)
+    def rest_create_comment(self, card_id, **kwargs):
+        return self._call(CommentController().create_comment, card_id, status=201, body=True)
+
+    # ------------------------------------------------------------------
+    # Attachment uploads (chunks and downloads are type='http' already)
+    # ------------------------------------------------------------------
+
+    @http.route('/api/v1/rest/cards/<string:card_id>/uploads', type='http', auth='user', methods=['POST'], csrf=False)
+    def rest_create_upload(self, card_id, **kwargs):
+        return self._call(AttachmentController().create_upload, card_id, status=201, body=True)
+
+    @http.route('/api/v1/rest/uploads/<string:upload_id>', type='http', auth='user', methods=['GET'], csrf=False)
+    def rest_get_upload(self, upload_id, **kwargs):
+        return self._call(AttachmentController().get_upload, upload_id)
+
+    # ------------------------------------------------------------------
+    # Mentions inbox
+    # ------------------------------------------------------------------
+
+    @http.route('/api/v1/rest/me/mentions', type='http', auth='user', methods=['GET'], csrf=False)
+    def rest_list_mentions(self, **kwargs):
+        return self._call(MentionController().list_mentions, int_args=('limit',))
+
+    @http.route('/api/v1/rest/me/mentions/unread_count', type='http', auth='user', methods=['GET'], csrf=False)
+    def rest_get_unread_mentions_count(self, **kwargs):
+        return self._call(MentionController().get_unread_mentions_count)
+
+    @http.route('/api/v1/rest/me/mentions/read', type='http', auth='user', methods=['POST'], csrf=False)
+    def rest_mark_mentions_read(self, **kwargs):
+        return self._call(MentionController().mark_mentions_read, body=True)
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    @http.route('/api/v1/rest/search', type='http', auth='user', methods=['GET'], csrf=False)
+    def rest_search(self, **kwargs):
+        return self._call(SearchController().search, int_args=('limit',), list_args=('types',), json_args=('cursors',))
+
+    # ------------------------------------------------------------------
+    # Batch
+    # ------------------------------------------------------------------
+
+    @http.route('/api/v1/rest/batch', type='http', auth='user', methods=['POST'], csrf=False)
+    def rest_run_batch(self, **kwargs):
+        return self._call(BatchController().run_batch, body=True)
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Search Controller — GET /api/v1/search
+
+Cross-board full-text search of cards (title + description), card
+comments (mail.message bodies) and boards, in one indexed SQL statement
+(see services/search.py).
+
+Security:
+* Cards, comments and boards are filtered by ACL + record rules
+* Users outside base.group_user only find public comments
+"""
+
+from odoo import http
+from odoo.http import request
+from ..services.mapping import map_search_results, CONTRACT_VERSION
+from ..services.auth import require_auth
+from ..services.rate_limit import check_rate_limit
+from ..services.replica import replica_read
+from ..services.search import search_page, SEARCH_TYPES, DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class SearchController(http.Controller):
+    """Global search endpoint"""
+
+    @http.route('/api/v1/search', type='json', auth='user', methods=['GET'], csrf=False)
+    @replica_read
+    def search(self, q=None, types=None, limit=DEFAULT_SEARCH_LIMIT, cursors=None):
+        """
+        Search cards, comments and boards across every board the user can see
+
+        Query params:
+            q (str): Search terms; every term must match, as a word prefix
+            types (list[str]): Result types to return (default: card, comment, board)
+            limit (int): Hits per type (max 50)
+            cursors (dict[str, str]): {type: next_cursor} from the previous page
+
+        Returns:
+            {
+                "query": str,
+                "sections": [{"type", "groups": [{"board_id", "board_name", "hits": [...]}],
+                              "next_cursor", "has_more"}, ...]
+            }
+        """
+        require_auth()
+
+        limited = check_rate_limit('search', items=limit)
+        if limited:
+            return limited
+
+        try:
+            limit = max(1, min(int(limit), MAX_SEARCH_LIMIT))
+            if cursors is not None and not isinstance(cursors, dict):
+                raise ValueError('cursors: must be an object of {type: cursor}')
+
+            pages = search_page(q, types or SEARCH_TYPES, limit, cursors)
+            response = map_search_results(q, pages)
+
+            # Add contract version header
+            request.httprequest.environ['HTTP_X_CONTRACT_VERSION'] = CONTRACT_VERSION
+
+            hits = sum(len(hits) for hits, _cursor in pages.values())
+            _logger.info(f"User {request.env.user.id} searched {len(pages)} types, {hits} hits")
+            return response
+
+        except ValueError as e:
+            return {
+                'error': {
+                    'code': 'VALIDATION_ERROR',
+                    'message': str(e),
+                }
+            }
+        except Exception as e:
+            _logger.error(f"Error searching: {str(e)}", exc_info=True)
+            return {
+                'error': {
+                    'code': 'INTERNAL_ERROR',
+                    'message': str(e),
+                }
+            }
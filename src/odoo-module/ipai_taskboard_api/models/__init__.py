@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+
+from . import project_task
+from . import mail_message
+from . import mail_notification
+from . import idempotency_key
+from . import rate_limit_bucket
+from . import mention_counter
+from . import project_task_type
+from . import project_project
+from . import stage_occupancy
+from . import board_snapshot
+from . import stage_transition
+from . import res_partner
+from . import upload_session
+from . import ir_http
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+Daily board snapshots for cumulative-flow and burndown charts
+
+One row per (day, board, stage): the active cards of the board in that
+stage when the day was captured, and how many of them were overdue
+(deadline before the day, stage not folded). GET /api/v1/boards/{id}/charts reads a
+date range of these rows instead of replaying mail.tracking.value.
+
+A daily cron captures today's rows for every board in one grouped
+INSERT ... SELECT, after deleting whatever an earlier run left for the day. Past days are rebuilt from stage tracking by
+_backfill_snapshots() (odoo-bin taskboard_snapshot_backfill, see
+cli/snapshot_backfill.py).
+"""
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class TaskboardBoardSnapshot(models.Model):
+    _name = 'ipai.taskboard.board.snapshot'
+    _description = 'Taskboard API Daily Board Snapshot'
+    _log_access = False
+    _order = 'date, project_id, stage_id'
+
+    date = fields.Date(required=True)
+    project_id = fields.Many2one('project.project', required=True, ondelete='cascade')
+    stage_id = fields.Many2one('project.task.type', required=True, ondelete='cascade')
+    cards = fields.Integer(required=True, default=0)
+    overdue = fields.Integer(required=True, default=0)
+
+    _sql_constraints = [
+        # Also the index of the charts query: WHERE project_id = ? AND date BETWEEN ...
+        ('project_date_stage_uniq', 'unique(project_id, date, stage_id)', 'One snapshot row per board column and day.'),
+    ]
+
+    def _replace(self, date_from, date_to, project_ids, rows_sql):
+        """
+        Replace the snapshots of a date range with the (date, project_id,
+        stage_id, cards, overdue) rows
+
+        Existing rows of the range (and boards, None = all) are deleted
+        first in the same transaction, so a column that has emptied since
+        the last run does not keep its old count.
+        """
+        board_filter = SQL("AND project_id = ANY(%s)", list(project_ids)) if project_ids else SQL()
+        self.env.cr.execute(SQL(
+            "DELETE FROM ipai_taskboard_board_snapshot WHERE date BETWEEN %s AND %s %s",
+            date_from, date_to, board_filter,
+        ))
+        self.env.cr.execute(SQL(
+            """
+            INSERT INTO ipai_taskboard_board_snapshot (date, project_id, stage_id, cards, overdue)
+            %s
+            ON CONFLICT (project_id, date, stage_id) DO UPDATE
+                SET cards = EXCLUDED.cards, overdue = EXCLUDED.overdue
+            """,
+            rows_sql,
+        ))
+        return self.env.cr.rowcount
+
+    @api.model
+    def _capture_snapshot(self, day=None):
+        """
+        Cron: snapshot every board column for one day (default: today)
+
+        Re-running for the same day replaces that day's rows.
+        """
+        day = day or fields.Date.today()
+        self.env['project.task'].flush_model(['project_id', 'stage_id', 'active', 'date_deadline'])
+        self.env['project.task.type'].flush_model(['fold'])
+        rows = self._replace(day, day, None, SQL(
+            """
+            SELECT %(day)s::date, t.project_id, t.stage_id, count(*),
+                   count(*) FILTER (WHERE t.date_deadline < %(day)s::date AND NOT COALESCE(s.fold, false))
+            FROM project_task t
+            JOIN project_task_type s ON s.id = t.stage_id
+            WHERE t.active AND t.project_id IS NOT NULL
+            GROUP BY t.project_id, t.stage_id
+            """,
+            day=day,
+        ))
+        _logger.info(f"Captured {rows} board snapshot rows for {day}")
+        return rows
+
+    @api.model
+    def _backfill_snapshots(self, date_from, date_to, project_ids=None):
+        """
+        Rebuild snapshots of past days from stage tracking values
+
+        Each card's stage history becomes intervals: its first stage (old
+        value of its first stage change, else its current stage) from
+        creation to the first change, then the new value of every change
+        until the next one. A day counts the interval that holds its end.
+        Archived cards are left out and cards moved to another board are
+        counted on their current board (neither change is tracked per day).
+
+        Args:
+            date_from (date): First day to rebuild
+            date_to (date): Last day to rebuild
+            project_ids (list[int]): Boards to rebuild (default: all)
+
+        Returns:
+            int: Snapshot rows written
+        """
+        self.env['project.task'].flush_model()
+        self.env['mail.tracking.value'].flush_model()
+        stage_field = self.env['ir.model.fields']._get('project.task', 'stage_id')
+        board_filter = SQL("AND t.project_id = ANY(%s)", list(project_ids)) if project_ids else SQL()
+
+        rows = self._replace(date_from, date_to, project_ids, SQL(
+            """
+            WITH tasks AS (
+                SELECT t.id, t.project_id, t.stage_id, t.create_date, t.date_deadline
+                FROM project_task t
+                WHERE t.active AND t.project_id IS NOT NULL %(boards)s
+            ),
+            changes AS (
+                SELECT m.res_id AS task_id, m.date AS changed_at, v.id,
+                       v.old_value_integer AS old_stage, v.new_value_integer AS new_stage
+                FROM mail_tracking_value v
+                JOIN mail_message m ON m.id = v.mail_message_id
+                JOIN tasks t ON t.id = m.res_id
+                WHERE v.field_id = %(field)s AND m.model = 'project.task'
+            ),
+            first_changes AS (
+                SELECT DISTINCT ON (c.task_id) c.task_id, c.old_stage, c.changed_at
+                FROM changes c
+                ORDER BY c.task_id, c.changed_at, c.id
+            ),
+            intervals AS (
+                SELECT t.id AS task_id, COALESCE(f.old_stage, t.stage_id) AS stage_id,
+                       t.create_date AS valid_from, f.changed_at AS valid_to
+                FROM tasks t
+                LEFT JOIN first_changes f ON f.task_id = t.id
+                UNION ALL
+                SELECT c.task_id, c.new_stage, c.changed_at,
+                       lead(c.changed_at) OVER (PARTITION BY c.task_id ORDER BY c.changed_at, c.id)
+                FROM changes c
+            ),
+            history AS (
+                SELECT d::date AS day, t.project_id, i.stage_id, t.date_deadline
+                FROM generate_series(%(start)s::date, %(end)s::date, interval '1 day') d
+                JOIN intervals i
+                  ON i.valid_from < d + interval '1 day'
+                 AND (i.valid_to IS NULL OR i.valid_to >= d + interval '1 day')
+                JOIN tasks t ON t.id = i.task_id
+            )
+            SELECT h.day, h.project_id, h.stage_id, count(*),
+                   count(*) FILTER (WHERE h.date_deadline < h.day AND NOT COALESCE(s.fold, false))
+            FROM history h
+            JOIN project_task_type s ON s.id = h.stage_id
+            GROUP BY h.day, h.project_id, h.stage_id
+            """,
+            field=stage_field.id,
+            start=date_from,
+            end=date_to,
+            boards=board_filter,
+        ))
+        _logger.info(f"Backfilled {rows} board snapshot rows for {date_from} → {date_to}")
+        return rows
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Idempotency keys for retried API writes
+
+One row per (user, Idempotency-Key header). The first request claims the
+key and stores its response; replays within the TTL get that response back
+without touching project.task or mail.message.
+
+Rows are claimed/completed with raw SQL (see services/idempotency.py) so
+that concurrent retries race on the unique index instead of the ORM cache.
+"""
+
+from odoo import api, fields, models
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Default TTL, overridable via ir.config_parameter
+IDEMPOTENCY_TTL_PARAM = 'ipai_taskboard_api.idempotency_ttl_hours'
+DEFAULT_IDEMPOTENCY_TTL_HOURS = 24
+
+
+class TaskboardIdempotencyKey(models.Model):
+    _name = 'ipai.taskboard.idempotency.key'
+    _description = 'Taskboard API Idempotency Key'
+    _log_access = False
+
+    idempotency_key = fields.Char(required=True)
+    user_id = fields.Many2one('res.users', required=True, ondelete='cascade')
+    route = fields.Char(required=True)
+    fingerprint = fields.Char(required=True, help='SHA-256 of the request payload')
+    response = fields.Text(help='Serialized JSON response of the first request')
+    claimed_at = fields.Datetime(required=True, index=True)
+
+    _sql_constraints = [
+        ('user_key_uniq', 'unique(user_id, idempotency_key)',
+         'Idempotency keys must be unique per user.'),
+    ]
+
+    @api.model
+    def _get_ttl_hours(self):
+        value = self.env['ir.config_parameter'].sudo().get_param(IDEMPOTENCY_TTL_PARAM)
+        return int(value) if value else DEFAULT_IDEMPOTENCY_TTL_HOURS
+
+    @api.model
+    def _gc_expired_keys(self):
+        """Cron: delete keys older than the TTL"""
+        self.env.cr.execute(
+            "DELETE FROM ipai_taskboard_idempotency_key "
+            "WHERE claimed_at < (now() at time zone 'UTC') - make_interval(hours => %s)",
+            (self._get_ttl_hours(),),
+        )
+        _logger.info(f"Purged {self.env.cr.rowcount} expired idempotency keys")
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""
+ir.http extension for the Taskboard API
+
+JSON-RPC copies the client's params.context into the request environment.
+Batch mode is tracked in a ContextVar (services/batch.py), never in the
+context; a client-sent "taskboard_batch" key is dropped before dispatch so
+nothing can mistake it for the batch marker.
+"""
+
+from odoo import models
+from odoo.http import request
+from ..services.batch import BATCH_CONTEXT_KEY
+
+
+class IrHttp(models.AbstractModel):
+    _inherit = 'ir.http'
+
+    @classmethod
+    def _dispatch(cls, endpoint):
+        if request.db and BATCH_CONTEXT_KEY in request.env.context:
+            context = dict(request.env.context)
+            context.pop(BATCH_CONTEXT_KEY)
+            request.update_env(context=context)
+        return super()._dispatch(endpoint)
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+mail.message extensions for the Taskboard API
+
+Adds the indexes behind the activity feeds and comment search.
+"""
+
+from odoo import models
+from odoo.tools.sql import create_index
+from ..services.search import message_document, COMMENT_MESSAGE_WHERE
+
+
+class MailMessage(models.Model):
+    _inherit = 'mail.message'
+
+    def init(self):
+        super().init()
+        # Board activity feed: messages of a board's tasks, newest first,
+        # keyset-paged on (create_date, id). Per-card scans for small or
+        # quiet boards; also serves get_card_activity's ORDER BY create_date.
+        create_index(
+            self.env.cr,
+            'mail_message_task_feed_idx',
+            self._table,
+            ['res_id', 'create_date DESC', 'id DESC'],
+            where="model = 'project.task'",
+        )
+        # Large, busy boards: walk all task messages newest first and stop
+        # as soon as a page of the board's messages is found
+        create_index(
+            self.env.cr,
+            'mail_message_task_recent_idx',
+            self._table,
+            ['create_date DESC', 'id DESC'],
+            where="model = 'project.task'",
+        )
+        # Global search: bodies of card comments and emails (services/search.py)
+        create_index(
+            self.env.cr,
+            'mail_message_search_idx',
+            self._table,
+            [message_document().code],
+            method='gin',
+            where=COMMENT_MESSAGE_WHERE,
+        )
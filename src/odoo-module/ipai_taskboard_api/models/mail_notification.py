@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+mail.notification extensions for the Taskboard API
+
+Keeps ipai.taskboard.mention.counter in step with unread mentions and
+adds the index behind the mentions inbox.
+"""
+
+from odoo import api, models
+from odoo.tools.sql import create_index
+
+
+class MailNotification(models.Model):
+    _inherit = 'mail.notification'
+
+    def init(self):
+        super().init()
+        # Unread mentions of one partner (counter reconcile, inbox unread filter)
+        create_index(
+            self.env.cr,
+            'mail_notification_unread_partner_idx',
+            self._table,
+            ['res_partner_id', 'mail_message_id'],
+            where='NOT is_read',
+        )
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        notifications = super().create(vals_list)
+        unread = notifications.filtered(lambda notification: not notification.is_read)
+        self.env['ipai.taskboard.mention.counter'].sudo()._apply_notification_delta(unread.ids, 1)
+        return notifications
+
+    def write(self, vals):
+        if 'is_read' not in vals:
+            return super().write(vals)
+        flipped = self.filtered(lambda notification: notification.is_read != bool(vals['is_read']))
+        result = super().write(vals)
+        self.env['ipai.taskboard.mention.counter'].sudo()._apply_notification_delta(
+            flipped.ids, -1 if vals['is_read'] else 1,
+        )
+        return result
+
+    def unlink(self):
+        unread = self.filtered(lambda notification: not notification.is_read)
+        # Count before the rows (and their message links) are gone
+        self.env['ipai.taskboard.mention.counter'].sudo()._apply_notification_delta(unread.ids, -1)
+        return super().unlink()
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Unread mention counters for the sidebar badge
+
+One row per partner: the number of unread inbox notifications on card
+messages that mention the partner. Maintained incrementally by
+mail.notification create/write/unlink (see models/mail_notification.py),
+so GET /api/v1/me/mentions/unread_count is a single-row primary-key read.
+
+A daily cron recomputes every counter from mail_notification to repair
+drift from writes that bypass the ORM.
+"""
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# A notification counts as a mention when its partner is a recipient
+# (mail_message_res_partner_rel) of a project.task message
+_MENTION_JOIN = """
+    JOIN mail_message m ON m.id = n.mail_message_id AND m.model = 'project.task'
+    JOIN mail_message_res_partner_rel r
+      ON r.mail_message_id = n.mail_message_id AND r.res_partner_id = n.res_partner_id
+"""
+
+
+class TaskboardMentionCounter(models.Model):
+    _name = 'ipai.taskboard.mention.counter'
+    _description = 'Taskboard API Unread Mention Counter'
+    _log_access = False
+
+    partner_id = fields.Many2one('res.partner', required=True, ondelete='cascade')
+    unread = fields.Integer(required=True, default=0)
+
+    _sql_constraints = [
+        ('partner_uniq', 'unique(partner_id)', 'One mention counter per partner.'),
+    ]
+
+    @api.model
+    def _apply_notification_delta(self, notification_ids, delta):
+        """
+        Add delta to the counters of the partners mentioned by these notifications
+
+        Args:
+            notification_ids (list[int]): mail.notification ids
+            delta (int): 1 (new / unread again) or -1 (read / deleted)
+        """
+        if not notification_ids:
+            return
+        # Recipients of freshly posted messages may still sit in the ORM cache
+        self.env['mail.message'].flush_model(['model', 'partner_ids'])
+        self.env['mail.notification'].flush_model(['mail_message_id', 'res_partner_id'])
+        mentions = SQL(
+            """
+            SELECT n.res_partner_id AS partner_id, count(*) AS mentions
+            FROM mail_notification n
+            """ + _MENTION_JOIN + """
+            WHERE n.id = ANY(%s)
+            GROUP BY n.res_partner_id
+            """,
+            list(notification_ids),
+        )
+        if delta > 0:
+            self.env.cr.execute(SQL(
+                """
+                INSERT INTO ipai_taskboard_mention_counter (partner_id, unread)
+                SELECT partner_id, mentions FROM (%s) delta
+                ON CONFLICT (partner_id) DO UPDATE
+                    SET unread = ipai_taskboard_mention_counter.unread + EXCLUDED.unread
+                """,
+                mentions,
+            ))
+        else:
+            self.env.cr.execute(SQL(
+                """
+                UPDATE ipai_taskboard_mention_counter c
+                SET unread = GREATEST(0, c.unread - delta.mentions)
+                FROM (%s) delta
+                WHERE c.partner_id = delta.partner_id
+                """,
+                mentions,
+            ))
+
+    @api.model
+    def _get_unread(self, partner_id):
+        self.env.cr.execute(
+            "SELECT unread FROM ipai_taskboard_mention_counter WHERE partner_id = %s",
+            (partner_id,),
+        )
+        row = self.env.cr.fetchone()
+        return row[0] if row else 0
+
+    @api.model
+    def _reconcile_counters(self):
+        """Cron: recompute every counter from mail_notification"""
+        self.env['mail.notification'].flush_model()
+        self.env.cr.execute(SQL(
+            """
+            WITH actual AS (
+                SELECT n.res_partner_id AS partner_id, count(*) AS unread
+                FROM mail_notification n
+            """ + _MENTION_JOIN + """
+                WHERE NOT n.is_read
+                GROUP BY n.res_partner_id
+            )
+            INSERT INTO ipai_taskboard_mention_counter (partner_id, unread)
+            SELECT p.partner_id, COALESCE(a.unread, 0)
+            FROM (
+                SELECT partner_id FROM actual
+                UNION
+                SELECT partner_id FROM ipai_taskboard_mention_counter
+            ) p
+            LEFT JOIN actual a ON a.partner_id = p.partner_id
+            ON CONFLICT (partner_id) DO UPDATE
+                SET unread = EXCLUDED.unread
+                WHERE ipai_taskboard_mention_counter.unread IS DISTINCT FROM EXCLUDED.unread
+            """
+        ))
+        _logger.info(f"Reconciled {self.env.cr.rowcount} mention counters")
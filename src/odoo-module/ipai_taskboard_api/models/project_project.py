@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""
+project.project extensions for the Taskboard API
+
+Adds the full-text index behind board results of GET /api/v1/search.
+"""
+
+from odoo import models
+from odoo.tools.sql import create_index
+from ..services.search import board_document
+
+
+class ProjectProject(models.Model):
+    _inherit = 'project.project'
+
+    def init(self):
+        super().init()
+        # Global search: board names, every translation (services/search.py)
+        create_index(
+            self.env.cr,
+            'project_project_search_idx',
+            self._table,
+            [board_document().code],
+            method='gin',
+        )
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+project.task extensions for the Taskboard API
+
+Adds the indexes the API's access paths rely on, and keeps the per-column
+occupancy counters (models/stage_occupancy.py) in step with task
+create/write/unlink.
+"""
+
+from odoo import api, models
+from odoo.tools.sql import create_index
+from ..services.search import task_document
+
+
+# Fields that move a task between occupancy counters
+_OCCUPANCY_FIELDS = ('project_id', 'stage_id', 'active')
+
+
+class ProjectTask(models.Model):
+    _inherit = 'project.task'
+
+    def init(self):
+        super().init()
+        # Per-column keyset pagination: WHERE project_id = ? AND stage_id = ?
+        # ORDER BY sequence, id (list_cards with stages=[...], board snapshot)
+        create_index(
+            self.env.cr,
+            'project_task_stage_cursor_idx',
+            self._table,
+            ['project_id', 'stage_id', 'sequence', 'id'],
+        )
+        # Global search: card title + description (services/search.py)
+        create_index(
+            self.env.cr,
+            'project_task_search_idx',
+            self._table,
+            [task_document().code],
+            method='gin',
+        )
+
+    def _occupancy_keys(self):
+        """{task id: (project_id, stage_id)} for tasks counted in a column"""
+        return {
+            task.id: (task.project_id.id, task.stage_id.id)
+            for task in self
+            if task.active and task.project_id and task.stage_id
+        }
+
+    def _apply_occupancy_change(self, before, after):
+        deltas = {}
+        for key in before.values():
+            deltas[key] = deltas.get(key, 0) - 1
+        for key in after.values():
+            deltas[key] = deltas.get(key, 0) + 1
+        self.env['ipai.taskboard.stage.occupancy'].sudo()._apply_deltas(deltas)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        tasks = super().create(vals_list)
+        tasks.sudo()._apply_occupancy_change({}, tasks.sudo()._occupancy_keys())
+        return tasks
+
+    def write(self, vals):
+        if not any(field in vals for field in _OCCUPANCY_FIELDS):
+            return super().write(vals)
+        tasks = self.sudo()
+        before = tasks._occupancy_keys()
+        result = super().write(vals)
+        tasks._apply_occupancy_change(before, tasks._occupancy_keys())
+        return result
+
+    def unlink(self):
+        before = self.sudo()._occupancy_keys()
+        result = super().unlink()
+        self._apply_occupancy_change(before, {})
+        return result
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+"""
+project.task.type extensions for the Taskboard API
+
+Adds the per-stage WIP limit exposed as Stage.wip_limit.
+"""
+
+from odoo import fields, models
+
+
+class ProjectTaskType(models.Model):
+    _inherit = 'project.task.type'
+
+    wip_limit = fields.Integer(
+        string='WIP Limit',
+        default=0,
+        help='Maximum number of active cards per board in this stage (0 = no limit). '
+             'Enforced by the Taskboard API on card create and move.',
+    )
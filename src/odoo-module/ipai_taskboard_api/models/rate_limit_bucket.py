@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+Shared token buckets for the API rate limiter
+
+The table is UNLOGGED: bucket state is hot, tiny and disposable, so it
+skips WAL (and is simply emptied after a crash). See services/rate_limit.py.
+"""
+
+from odoo import fields, models
+
+
+class TaskboardRateLimitBucket(models.Model):
+    _name = 'ipai.taskboard.rate.limit.bucket'
+    _description = 'Taskboard API Rate Limit Bucket'
+    _table = 'ipai_taskboard_rate_limit_bucket'
+    _auto = False
+    _log_access = False
+
+    user_id = fields.Many2one('res.users', readonly=True)
+    tokens = fields.Float(readonly=True)
+    refilled_at = fields.Float(readonly=True, help='Epoch seconds of the last refill')
+
+    def init(self):
+        self.env.cr.execute("""
+            CREATE UNLOGGED TABLE IF NOT EXISTS ipai_taskboard_rate_limit_bucket (
+                id SERIAL PRIMARY KEY,
+                user_id INTEGER NOT NULL UNIQUE REFERENCES res_users(id) ON DELETE CASCADE,
+                tokens DOUBLE PRECISION NOT NULL,
+                refilled_at DOUBLE PRECISION NOT NULL
+            )
+        """)
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+res.partner extensions for the Taskboard API
+
+Email identity is case-insensitive: every API email lookup goes through
+email_normalized (lowercased address, stored and kept current by the mail
+module's compute), see services/identity.py. This adds the plain b-tree
+index those equality/IN lookups need, plus the backfill and duplicate
+report behind odoo-bin taskboard_email_identity (cli/email_identity.py).
+"""
+
+from odoo import api, models
+from odoo.tools.sql import create_index
+
+
+class ResPartner(models.Model):
+    _inherit = 'res.partner'
+
+    def init(self):
+        super().init()
+        # Exact email identity lookups (mentions, owner filters, import
+        # owners); the mail module only indexes the column for trigram search
+        create_index(
+            self.env.cr,
+            'res_partner_email_normalized_idx',
+            self._table,
+            ['email_normalized'],
+            where='email_normalized IS NOT NULL',
+        )
+
+    @api.model
+    def _stale_email_normalized_ids(self):
+        """
+        Partners whose email_normalized is missing or stale
+
+        Rows written with SQL (imports, migrations) skip the ORM compute.
+        Candidates have an email and an email_normalized that is empty or
+        differs from the trimmed, lowercased email ("Name <a@b.c>" emails
+        are candidates too; recomputing them is harmless).
+
+        Returns:
+            list[int]: res.partner ids, ascending
+        """
+        self.env.cr.execute("""
+            SELECT id FROM res_partner
+            WHERE email IS NOT NULL AND btrim(email) != ''
+              AND (email_normalized IS NULL OR email_normalized != lower(btrim(email)))
+            ORDER BY id
+        """)
+        return [row[0] for row in self.env.cr.fetchall()]
+
+    def _recompute_email_normalized(self):
+        """Recompute and write email_normalized of these partners"""
+        self.env.add_to_compute(self._fields['email_normalized'], self)
+        self.flush_recordset(['email_normalized'])
+
+    @api.model
+    def _duplicate_email_report(self, limit=None):
+        """
+        Partners sharing a normalized email, largest groups first
+
+        Returns:
+            list[dict]: {"email", "partner_ids", "user_partner_ids"}; identity
+            lookups pick the partner with a user, else the oldest one
+        """
+        self.env.cr.execute("""
+            SELECT p.email_normalized,
+                   array_agg(DISTINCT p.id ORDER BY p.id),
+                   array_agg(DISTINCT p.id) FILTER (WHERE u.id IS NOT NULL)
+            FROM res_partner p
+            LEFT JOIN res_users u ON u.partner_id = p.id
+            WHERE p.email_normalized IS NOT NULL
+            GROUP BY p.email_normalized
+            HAVING count(DISTINCT p.id) > 1
+            ORDER BY count(DISTINCT p.id) DESC, p.email_normalized
+            LIMIT %s
+        """, (limit,))
+        return [
+            {'email': email, 'partner_ids': partner_ids, 'user_partner_ids': user_partner_ids or []}
+            for email, partner_ids, user_partner_ids in self.env.cr.fetchall()
+        ]
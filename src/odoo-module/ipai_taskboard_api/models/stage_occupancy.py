@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Card counters per board column
+
+One row per (project, stage): the number of active tasks of the project in
+that stage. Maintained incrementally by project.task create/write/unlink
+(see models/project_task.py), in the same transaction as the task change,
+so WIP-limit checks and Kanban column counts are single indexed reads.
+
+An hourly cron recomputes every counter from project_task to repair drift
+from writes that bypass the ORM.
+"""
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class TaskboardStageOccupancy(models.Model):
+    _name = 'ipai.taskboard.stage.occupancy'
+    _description = 'Taskboard API Stage Occupancy Counter'
+    _log_access = False
+
+    project_id = fields.Many2one('project.project', required=True, ondelete='cascade')
+    stage_id = fields.Many2one('project.task.type', required=True, ondelete='cascade')
+    cards = fields.Integer(required=True, default=0)
+
+    _sql_constraints = [
+        ('project_stage_uniq', 'unique(project_id, stage_id)', 'One occupancy counter per board column.'),
+    ]
+
+    def init(self):
+        super().init()
+        # Seed the counters on install; afterwards the task hooks keep them current
+        self.env.cr.execute("SELECT 1 FROM ipai_taskboard_stage_occupancy LIMIT 1")
+        if not self.env.cr.fetchone():
+            self._reconcile_occupancy()
+
+    @api.model
+    def _apply_deltas(self, deltas):
+        """
+        Add deltas to column counters
+
+        Args:
+            deltas (dict[tuple[int, int], int]): {(project_id, stage_id): delta}
+        """
+        rows = [(project_id, stage_id, delta) for (project_id, stage_id), delta in deltas.items() if delta]
+        if not rows:
+            return
+        increments = [row for row in rows if row[2] > 0]
+        decrements = [row for row in rows if row[2] < 0]
+        if increments:
+            self.env.cr.execute(SQL(
+                """
+                INSERT INTO ipai_taskboard_stage_occupancy (project_id, stage_id, cards)
+                SELECT * FROM unnest(%s::int[], %s::int[], %s::int[])
+                ON CONFLICT (project_id, stage_id) DO UPDATE
+                    SET cards = ipai_taskboard_stage_occupancy.cards + EXCLUDED.cards
+                """,
+                [row[0] for row in increments],
+                [row[1] for row in increments],
+                [row[2] for row in increments],
+            ))
+        if decrements:
+            self.env.cr.execute(SQL(
+                """
+                UPDATE ipai_taskboard_stage_occupancy c
+                SET cards = GREATEST(0, c.cards + d.delta)
+                FROM unnest(%s::int[], %s::int[], %s::int[]) AS d(project_id, stage_id, delta)
+                WHERE c.project_id = d.project_id AND c.stage_id = d.stage_id
+                """,
+                [row[0] for row in decrements],
+                [row[1] for row in decrements],
+                [row[2] for row in decrements],
+            ))
+
+    @api.model
+    def _get_counts(self, project_id):
+        """{stage_id: cards} of one board (columns never filled are absent)"""
+        self.env.cr.execute(
+            "SELECT stage_id, cards FROM ipai_taskboard_stage_occupancy WHERE project_id = %s",
+            (project_id,),
+        )
+        return dict(self.env.cr.fetchall())
+
+    @api.model
+    def _lock_count(self, project_id, stage_id):
+        """
+        Current cards of a column, row-locked until the end of the transaction
+
+        Concurrent moves into the same column serialize on this row, so two
+        requests cannot both take the last free slot.
+        """
+        self.env.cr.execute("""
+            INSERT INTO ipai_taskboard_stage_occupancy (project_id, stage_id, cards)
+            VALUES (%s, %s, 0)
+            ON CONFLICT (project_id, stage_id) DO NOTHING
+        """, (project_id, stage_id))
+        self.env.cr.execute("""
+            SELECT cards FROM ipai_taskboard_stage_occupancy
+            WHERE project_id = %s AND stage_id = %s
+            FOR UPDATE
+        """, (project_id, stage_id))
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    def _reconcile_occupancy(self):
+        """Cron: recompute every counter from project_task"""
+        self.env['project.task'].flush_model(['project_id', 'stage_id', 'active'])
+        self.env.cr.execute("""
+            WITH actual AS (
+                SELECT project_id, stage_id, count(*) AS cards
+                FROM project_task
+                WHERE active AND project_id IS NOT NULL AND stage_id IS NOT NULL
+                GROUP BY project_id, stage_id
+            )
+            INSERT INTO ipai_taskboard_stage_occupancy (project_id, stage_id, cards)
+            SELECT k.project_id, k.stage_id, COALESCE(a.cards, 0)
+            FROM (
+                SELECT project_id, stage_id FROM actual
+                UNION
+                SELECT project_id, stage_id FROM ipai_taskboard_stage_occupancy
+            ) k
+            LEFT JOIN actual a ON a.project_id = k.project_id AND a.stage_id = k.stage_id
+            ON CONFLICT (project_id, stage_id) DO UPDATE
+                SET cards = EXCLUDED.cards
+                WHERE ipai_taskboard_stage_occupancy.cards IS DISTINCT FROM EXCLUDED.cards
+        """)
+        _logger.info(f"Reconciled {self.env.cr.rowcount} stage occupancy counters")
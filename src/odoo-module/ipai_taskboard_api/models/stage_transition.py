@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Stage transition facts for flow metrics
+
+One row per stage change of a card, copied from mail.tracking.value: when
+the card left from_stage for to_stage, when it had entered from_stage
+(its previous change, or its creation), and when the card was created.
+Lead time, cycle time and time-in-stage percentiles (services/queries.py
+flow_metrics()) are single aggregate queries over this table.
+
+A cron loads new tracking values incrementally: rows above the high-water
+mark (the highest tracking value id already loaded, minus a small overlap
+for ids committed out of order), TRANSITION_BATCH_SIZE at a time. The
+first runs drain the existing history the same way.
+"""
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+from odoo.tools.sql import create_index
+import logging
+
+_logger = logging.getLogger(__name__)
+
+TRANSITION_BATCH_SIZE = 50000
+
+# Tracking value ids below the high-water mark that are re-checked each run:
+# a transaction that allocated an id earlier may commit after a later one
+HWM_OVERLAP = 10000
+
+
+class TaskboardStageTransition(models.Model):
+    _name = 'ipai.taskboard.stage.transition'
+    _description = 'Taskboard API Stage Transition'
+    _log_access = False
+    _order = 'changed_at, tracking_value_id'
+
+    tracking_value_id = fields.Integer(required=True)
+    task_id = fields.Many2one('project.task', required=True, ondelete='cascade')
+    project_id = fields.Many2one('project.project', required=True, ondelete='cascade')
+    from_stage_id = fields.Many2one('project.task.type', ondelete='set null')
+    to_stage_id = fields.Many2one('project.task.type', ondelete='set null')
+    changed_at = fields.Datetime(required=True)
+    entered_at = fields.Datetime(required=True)
+    task_created_at = fields.Datetime(required=True)
+
+    _sql_constraints = [
+        ('tracking_value_uniq', 'unique(tracking_value_id)', 'One transition per tracking value.'),
+    ]
+
+    def init(self):
+        super().init()
+        # Flow metrics of one board over a date window
+        create_index(
+            self.env.cr,
+            'ipai_taskboard_stage_transition_board_idx',
+            self._table,
+            ['project_id', 'changed_at'],
+        )
+        # Previous transition of a card (entered_at) and its first move (cycle start)
+        create_index(
+            self.env.cr,
+            'ipai_taskboard_stage_transition_task_idx',
+            self._table,
+            ['task_id', 'changed_at'],
+        )
+
+    @api.model
+    def _load_transitions(self, batch_size=TRANSITION_BATCH_SIZE):
+        """
+        Cron: load stage changes tracked since the high-water mark
+
+        Reports progress to the cron, which runs again right away while a
+        full batch was loaded (initial history load).
+
+        Returns:
+            int: Transitions loaded
+        """
+        self.env['mail.tracking.value'].flush_model()
+        self.env.cr.execute("SELECT COALESCE(max(tracking_value_id), 0) FROM ipai_taskboard_stage_transition")
+        high_water_mark = self.env.cr.fetchone()[0]
+        stage_field = self.env['ir.model.fields']._get('project.task', 'stage_id')
+
+        self.env.cr.execute(SQL(
+            """
+            WITH new AS (
+                SELECT v.id AS tracking_value_id, t.id AS task_id, t.project_id,
+                       fs.id AS from_stage_id, ts.id AS to_stage_id,
+                       m.date AS changed_at, t.create_date AS task_created_at
+                FROM mail_tracking_value v
+                JOIN mail_message m ON m.id = v.mail_message_id AND m.model = 'project.task'
+                JOIN project_task t ON t.id = m.res_id AND t.project_id IS NOT NULL
+                LEFT JOIN project_task_type fs ON fs.id = v.old_value_integer
+                LEFT JOIN project_task_type ts ON ts.id = v.new_value_integer
+                WHERE v.id > %(low)s AND v.field_id = %(field)s
+                  AND NOT EXISTS (
+                      SELECT 1 FROM ipai_taskboard_stage_transition f WHERE f.tracking_value_id = v.id
+                  )
+                ORDER BY v.id
+                LIMIT %(limit)s
+            ),
+            ordered AS (
+                SELECT n.*,
+                       lag(n.changed_at) OVER (
+                           PARTITION BY n.task_id ORDER BY n.changed_at, n.tracking_value_id
+                       ) AS previous_change
+                FROM new n
+            )
+            INSERT INTO ipai_taskboard_stage_transition
+                (tracking_value_id, task_id, project_id, from_stage_id, to_stage_id,
+                 changed_at, entered_at, task_created_at)
+            SELECT o.tracking_value_id, o.task_id, o.project_id, o.from_stage_id, o.to_stage_id,
+                   o.changed_at,
+                   LEAST(o.changed_at, COALESCE(
+                       o.previous_change,
+                       (SELECT max(f.changed_at) FROM ipai_taskboard_stage_transition f
+                        WHERE f.task_id = o.task_id AND f.changed_at <= o.changed_at),
+                       o.task_created_at
+                   )),
+                   o.task_created_at
+            FROM ordered o
+            ON CONFLICT (tracking_value_id) DO NOTHING
+            """,
+            low=max(0, high_water_mark - HWM_OVERLAP),
+            field=stage_field.id,
+            limit=batch_size,
+        ))
+        loaded = self.env.cr.rowcount
+        if loaded:
+            _logger.info(f"Loaded {loaded} stage transitions (high-water mark {high_water_mark})")
+        if loaded >= batch_size:
+            self.env['ir.cron']._notify_progress(done=loaded, remaining=batch_size)
+        return loaded
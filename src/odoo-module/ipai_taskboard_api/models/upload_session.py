@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Resumable upload sessions for card attachments
+
+One row per upload started with POST /api/v1/cards/{id}/uploads: the
+target card, the uploading user, the declared file (name, size, optional
+SHA-256) and how many bytes have been received so far. Chunks are written
+to a spool file under data_dir (see services/uploads.py); the row only
+tracks progress, so an interrupted upload resumes at `received`.
+
+Finished uploads point at the ir.attachment they produced. A cron deletes
+unfinished sessions (and their spool files) after UPLOAD_TTL_HOURS and
+finished sessions after the same delay.
+"""
+
+from odoo import api, fields, models
+from ..services.uploads import remove_spool_file
+import logging
+
+_logger = logging.getLogger(__name__)
+
+UPLOAD_TTL_HOURS = 24
+
+
+class TaskboardUploadSession(models.Model):
+    _name = 'ipai.taskboard.upload'
+    _description = 'Taskboard API Upload Session'
+    _log_access = False
+
+    token = fields.Char(required=True, help='Opaque upload id used in URLs')
+    task_id = fields.Many2one('project.task', required=True, ondelete='cascade')
+    user_id = fields.Many2one('res.users', required=True, ondelete='cascade')
+    filename = fields.Char(required=True)
+    mimetype = fields.Char()
+    # int4, like ir.attachment.file_size: uploads.max_upload_bytes() caps sizes below 2 GiB
+    size = fields.Integer(required=True, help='Declared file size in bytes')
+    received = fields.Integer(required=True, default=0, help='Bytes written to the spool file')
+    checksum = fields.Char(help='Declared SHA-256 (hex) of the whole file')
+    attachment_id = fields.Many2one('ir.attachment', ondelete='set null')
+    created_at = fields.Datetime(required=True, index=True)
+
+    _sql_constraints = [
+        ('token_uniq', 'unique(token)', 'Upload ids must be unique.'),
+    ]
+
+    @api.model
+    def _gc_expired_uploads(self):
+        """Cron: delete sessions older than UPLOAD_TTL_HOURS and their spool files"""
+        self.env.cr.execute(
+            "DELETE FROM ipai_taskboard_upload "
+            "WHERE created_at < (now() at time zone 'UTC') - make_interval(hours => %s) "
+            "RETURNING token",
+            (UPLOAD_TTL_HOURS,),
+        )
+        tokens = [row[0] for row in self.env.cr.fetchall()]
+        for token in tokens:
+            remove_spool_file(self.env.cr.dbname, token)
+        _logger.info(f"Purged {len(tokens)} expired upload sessions")
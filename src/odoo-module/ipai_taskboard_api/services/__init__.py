@@ -1,6 +1,22 @@
 # -*- coding: utf-8 -*-
 
+from . import fastjson
+from . import render_cache
+from . import avatars
+from . import batch
+from . import replica
+from . import queries
 from . import mapping
 from . import auth
 from . import rbac
+from . import sanitizer
+from . import identity
 from . import mentions
+from . import idempotency
+from . import coalescing
+from . import rate_limit
+from . import transport
+from . import export
+from . import uploads
+from . import search
+from . import wip
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Avatar Service — Content-hash avatar URLs and an on-disk thumbnail cache
+
+Partner DTOs carry an avatar URL instead of inlined image data:
+
+    {web.base.url}/api/v1/avatars/{partner_id}/{digest}/{size}
+
+digest is the start of the checksum (SHA-1) of the partner's image_1920
+attachment, so the URL changes whenever the image does and responses can
+be cached as immutable. Checksums of every partner in the record's
+prefetch set are read in one query per transaction (no image data is
+loaded to build URLs).
+
+Thumbnails are resized once per (partner, digest, size) and written to
+<data_dir>/taskboard_avatars/<db>/<partner_id>/<digest>-<size>; repeated
+requests are served from that file without reading the image from the
+ORM or re-encoding it. Writing a new digest removes the partner's older
+files.
+"""
+
+from odoo.tools import SQL, config
+from odoo.tools.image import image_process
+from odoo.tools.mimetypes import guess_mimetype
+import os
+import tempfile
+import logging
+
+_logger = logging.getLogger(__name__)
+
+AVATAR_SIZES = (32, 64, 128, 256)
+DEFAULT_AVATAR_SIZE = 128
+DIGEST_LENGTH = 16
+
+# Checksums read ahead for the partners of one prefetch set
+MAX_PREFETCH = 1000
+
+_CACHE_KEY = 'taskboard_avatar_digests'
+
+
+def avatar_digests(env, partner_ids):
+    """
+    Read avatar digests of many partners in one query
+
+    Args:
+        env: Environment (checksums are read with SQL, no ACL involved)
+        partner_ids (iterable[int]): res.partner ids
+
+    Returns:
+        dict[int, str]: {partner_id: digest} for partners with an image
+    """
+    partner_ids = list(partner_ids)
+    if not partner_ids:
+        return {}
+    env['ir.attachment'].flush_model(['res_model', 'res_field', 'res_id', 'checksum'])
+    env.cr.execute(SQL(
+        """
+        SELECT res_id, checksum
+        FROM ir_attachment
+        WHERE res_model = 'res.partner' AND res_field = 'image_1920' AND res_id = ANY(%s)
+          AND checksum IS NOT NULL
+        """,
+        partner_ids,
+    ))
+    return {res_id: checksum[:DIGEST_LENGTH] for res_id, checksum in env.cr.fetchall()}
+
+
+def avatar_url(partner, size=DEFAULT_AVATAR_SIZE):
+    """
+    Content-hash avatar URL of a partner, or None without an image
+
+    Digests are cached on the cursor for the transaction; a miss reads the
+    digests of the partner's whole prefetch set at once, so mapping a page
+    of cards costs one query for all owners and watchers.
+    """
+    cache = partner.env.cr.cache.setdefault(_CACHE_KEY, {})
+    if partner.id not in cache:
+        missing = [pid for pid in partner._prefetch_ids if pid not in cache][:MAX_PREFETCH]
+        if partner.id not in missing:
+            missing.append(partner.id)
+        digests = avatar_digests(partner.env, missing)
+        cache.update({pid: digests.get(pid) for pid in missing})
+    digest = cache[partner.id]
+    if not digest:
+        return None
+    # Absolute: the contract types avatar_url as a URI
+    return f'{partner.get_base_url()}{avatar_path(partner.id, digest, size)}'
+
+
+def avatar_path(partner_id, digest, size=DEFAULT_AVATAR_SIZE):
+    return f'/api/v1/avatars/{partner_id}/{digest}/{size}'
+
+
+def _cache_dir(dbname, partner_id):
+    return os.path.join(config['data_dir'], 'taskboard_avatars', dbname, str(partner_id))
+
+
+def read_cached_thumbnail(dbname, partner_id, digest, size):
+    """Cached thumbnail bytes, or None"""
+    path = os.path.join(_cache_dir(dbname, partner_id), f'{digest}-{size}')
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def write_cached_thumbnail(dbname, partner_id, digest, size, data):
+    """Store a thumbnail atomically and drop the partner's files of older digests"""
+    directory = _cache_dir(dbname, partner_id)
+    os.makedirs(directory, exist_ok=True)
+    for entry in os.scandir(directory):
+        if entry.is_file() and not entry.name.startswith((f'{digest}-', '.tmp-')):
+            try:
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, os.path.join(directory, f'{digest}-{size}'))
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+
+def render_thumbnail(image, size):
+    """Square-crop and resize image bytes to size × size (source format kept)"""
+    return image_process(image, size=(size, size), crop='center')
+
+
+def thumbnail_mimetype(data):
+    return guess_mimetype(data, default='image/png')
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Batch Service — Run several API operations in one request and transaction
+
+Operations are executed in order by the existing handlers, inside one
+savepoint: the first failing operation rolls back every earlier write.
+
+While a batch runs, batch_scope() sets a ContextVar so per-call concerns
+are handled once, at batch level:
+* Rate limiting — the batch is charged the sum of its operations' costs
+* Idempotency-Key — claimed for the whole batch, not per operation
+* HTTP method checks — the batch itself is the (POST) request
+
+The marker is never read from the environment context: JSON-RPC copies
+the client's params.context there, so a "taskboard_batch" key sent by a
+client is stripped before dispatch (models/ir_http.py).
+
+References:
+    A string argument of the form "$<op>.<path>" is replaced by a value
+    from an earlier result. <op> is the operation index or its "id" label;
+    <path> walks dict keys and list indexes:
+
+        [{"id": "new", "op": "create_card", "args": {...}},
+         {"op": "create_comment", "args": {"card_id": "$new.card.card_id", ...}}]
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+import re
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Context key of the former context-based marker, stripped from client input
+BATCH_CONTEXT_KEY = 'taskboard_batch'
+MAX_BATCH_OPERATIONS = 20
+
+_REFERENCE_RE = re.compile(r'^\$([A-Za-z0-9_-]+)((?:\.[A-Za-z0-9_-]+)*)$')
+
+
+# True while batch operations run; set only by batch_scope()
+_in_batch = ContextVar('taskboard_batch', default=False)
+
+
+class BatchReferenceError(ValueError):
+    """Raised when a "$ref" argument cannot be resolved"""
+
+
+def in_batch():
+    """True while the current request is executing batch operations"""
+    return _in_batch.get()
+
+
+@contextmanager
+def batch_scope():
+    """Mark the operations run inside the block as batch operations"""
+    token = _in_batch.set(True)
+    try:
+        yield
+    finally:
+        _in_batch.reset(token)
+
+
+def resolve_references(value, results, labels):
+    """
+    Replace "$<op>.<path>" strings in value by values of earlier results
+
+    Args:
+        value: Operation arguments (any JSON value)
+        results (list): Results of the operations executed so far
+        labels (dict[str, int]): Operation "id" label → index
+
+    Returns:
+        value with every reference resolved
+
+    Raises:
+        BatchReferenceError for unknown/forward operations or paths
+    """
+    if isinstance(value, dict):
+        return {key: resolve_references(item, results, labels) for key, item in value.items()}
+    if isinstance(value, list):
+        return [resolve_references(item, results, labels) for item in value]
+    if not isinstance(value, str):
+        return value
+
+    match = _REFERENCE_RE.match(value)
+    if not match:
+        return value
+
+    target, path = match.group(1), match.group(2)
+    index = int(target) if target.isdigit() else labels.get(target)
+    if index is None or index >= len(results):
+        raise BatchReferenceError(f'{value}: operation {target} has not run yet')
+
+    resolved = results[index]
+    for segment in path.split('.')[1:]:
+        if isinstance(resolved, list) and segment.isdigit() and int(segment) < len(resolved):
+            resolved = resolved[int(segment)]
+        elif isinstance(resolved, dict) and segment in resolved:
+            resolved = resolved[segment]
+        else:
+            raise BatchReferenceError(f'{value}: no "{segment}" in the result of operation {target}')
+    return resolved
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+Board Clone Service — Copy a template board for a new period
+
+project.project.copy() duplicates tasks one by one (copy() per task, with
+tracking and chatter). copy_board() copies a board in a fixed number of
+statements instead:
+
+* one read of the source tasks (SQL over the user's _search() subselect)
+* one create() for the stages, one create() per subtask depth level
+* one INSERT ... SELECT for all task tags
+
+Deadlines keep their offset to the period start: with source period
+2025-11-01 and new period 2025-12-01, a 2025-11-28 deadline becomes
+2025-12-28 (same number of days after the start).
+
+Chatter (with_chatter=False, the default): tasks are created without
+tracking values, creation logs, follower auto-subscription or assignment
+mails; one note on the new board records the clone instead.
+"""
+
+from odoo.http import request
+from odoo.tools import SQL
+from .card_import import DEFERRED_TRACKING_CONTEXT
+import datetime
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+def source_period_start(deadlines):
+    """Default source period start: first day of the month of the earliest deadline"""
+    dated = [deadline for deadline in deadlines if deadline]
+    if not dated:
+        return None
+    earliest = min(dated)
+    return datetime.date(earliest.year, earliest.month, 1)
+
+
+def _read_source_tasks(project_id):
+    """Visible tasks of the board, parents before children where possible"""
+    tasks = request.env['project.task']._search([('project_id', '=', project_id)])
+    request.env.cr.execute(SQL(
+        """
+        SELECT t.id, t.parent_id, t.name, t.description, t.priority, t.sequence,
+               t.user_id, t.stage_id, t.date_deadline
+        FROM project_task t
+        WHERE t.id IN (%s)
+        ORDER BY t.sequence, t.id
+        """,
+        tasks.subselect(),
+    ))
+    columns = ('id', 'parent_id', 'name', 'description', 'priority', 'sequence',
+               'user_id', 'stage_id', 'date_deadline')
+    return [dict(zip(columns, row)) for row in request.env.cr.fetchall()]
+
+
+def _depth_levels(rows):
+    """Group rows by subtask depth; parents outside the board count as roots"""
+    ids = {row['id'] for row in rows}
+    children = {}
+    roots = []
+    for row in rows:
+        if row['parent_id'] in ids:
+            children.setdefault(row['parent_id'], []).append(row)
+        else:
+            roots.append(row)
+
+    levels = []
+    level = roots
+    while level:
+        levels.append(level)
+        level = [child for row in level for child in children.get(row['id'], ())]
+    return levels
+
+
+def copy_board(source, name, period_start=None, source_start=None, with_chatter=False):
+    """
+    Clone a board: stages, tasks, subtask hierarchy, tags, shifted deadlines
+
+    Args:
+        source: project.project record (readable by the user)
+        name (str): Name of the new board
+        period_start (date): Start of the new period (None = keep deadlines)
+        source_start (date): Start of the source period (default: first day
+            of the month of the source's earliest deadline)
+        with_chatter (bool): Keep tracking, creation logs and assignment mails
+
+    Returns:
+        tuple: (new project.project, stages created, cards created)
+    """
+    env = request.env
+    context = {} if with_chatter else DEFERRED_TRACKING_CONTEXT
+    Project = env['project.project'].with_context(**context)
+    Stage = env['project.task.type'].with_context(**context)
+    Task = env['project.task'].with_context(**context)
+
+    project = Project.create({
+        'name': name,
+        'description': source.description,
+        'privacy_visibility': source.privacy_visibility,
+        'user_id': env.user.id,
+        'tag_ids': [(6, 0, source.tag_ids.ids)],
+    })
+
+    # Stages: one create(), same order and fold state
+    source_stages = source.type_ids.sorted(lambda stage: (stage.sequence, stage.id))
+    new_stages = Stage.create([
+        {
+            'name': stage.name,
+            'sequence': stage.sequence,
+            'fold': stage.fold,
+            'project_ids': [(4, project.id)],
+        }
+        for stage in source_stages
+    ])
+    stage_map = dict(zip(source_stages.ids, new_stages.ids))
+
+    rows = _read_source_tasks(source.id)
+    shift = None
+    if period_start:
+        start = source_start or source_period_start(row['date_deadline'] for row in rows)
+        if start:
+            shift = datetime.timedelta(days=(period_start - start).days)
+
+    # Tasks: one create() per depth level, parents first
+    task_map = {}
+    for level in _depth_levels(rows):
+        vals_list = []
+        for row in level:
+            deadline = row['date_deadline']
+            if deadline and shift:
+                deadline += shift
+            vals_list.append({
+                'project_id': project.id,
+                'name': row['name'],
+                'description': row['description'],
+                'priority': row['priority'] or '1',
+                'sequence': row['sequence'],
+                'user_id': row['user_id'],
+                'stage_id': stage_map.get(row['stage_id'], False),
+                'parent_id': task_map.get(row['parent_id'], False),
+                'date_deadline': deadline or False,
+            })
+        created = Task.create(vals_list)
+        task_map.update(zip([row['id'] for row in level], created.ids))
+
+    # Tags: one INSERT ... SELECT over the old → new id mapping
+    if task_map:
+        tags_field = Task._fields['tag_ids']
+        Task.flush_model()
+        env.cr.execute(SQL(
+            """
+            INSERT INTO %(rel)s (%(task)s, %(tag)s)
+            SELECT m.new_id, r.%(tag)s
+            FROM %(rel)s r
+            JOIN unnest(%(old_ids)s::int[], %(new_ids)s::int[]) AS m(old_id, new_id)
+              ON r.%(task)s = m.old_id
+            ON CONFLICT DO NOTHING
+            """,
+            rel=SQL.identifier(tags_field.relation),
+            task=SQL.identifier(tags_field.column1),
+            tag=SQL.identifier(tags_field.column2),
+            old_ids=list(task_map),
+            new_ids=list(task_map.values()),
+        ))
+        Task.browse(task_map.values()).invalidate_recordset(['tag_ids'])
+
+    if not with_chatter:
+        project.message_post(
+            body=f'Cloned from {source.display_name} by {env.user.name}: '
+                 f'{len(new_stages)} stages, {len(task_map)} cards',
+            subtype_xmlid='mail.mt_note',
+        )
+
+    _logger.info(f"Cloned board {source.id} → {project.id}: {len(new_stages)} stages, {len(task_map)} cards")
+    return project, len(new_stages), len(task_map)
@@ -0,0 +1,363 @@
+# -*- coding: utf-8 -*-
+"""
+Card Import Service — Bulk-create cards from CSV or NDJSON
+
+Pipeline (POST /api/v1/boards/{id}/cards:import):
+1. parse_import_rows()   — CSV / NDJSON text → row dicts (one per card)
+2. resolve_import_rows() — validate rows and resolve stages, owners, tags
+   and parents with ONE lookup per kind for all distinct values
+3. create_import_rows()  — project.task.create() in IMPORT_CHUNK_SIZE
+   chunks; a failing chunk is retried row by row to report the bad rows
+
+Columns / keys (others are ignored, so card exports can be re-imported):
+    title (required), stage, description_md, priority, due_date,
+    owner (email or partner id; owner_email also accepted), tags, parent_id
+
+    stage: "stage:12" or a stage name of the board (case-insensitive)
+    tags: "tag:3" ids or tag names; comma-separated in CSV, list in NDJSON
+
+Deferred side effects (defer_tracking=True):
+    Tasks are created without tracking values, creation logs, follower
+    auto-subscription or assignment mails. Owners are then subscribed in
+    one call per distinct owner and a single note on the board records
+    the import.
+"""
+
+from odoo.http import request
+from .schema import validate_import_row
+from .security import sanitize_markdown
+from .identity import users_by_email
+import csv
+import io
+import json
+import logging
+
+_logger = logging.getLogger(__name__)
+
+MAX_IMPORT_ROWS = 10000
+MAX_IMPORT_BYTES = 10 * 1024 * 1024
+IMPORT_CHUNK_SIZE = 200
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+
+IMPORT_COLUMNS = (
+    'title', 'stage', 'description_md', 'priority', 'due_date',
+    'owner', 'owner_email', 'tags', 'parent_id',
+)
+
+# Context for create() when tracking and mail side effects are deferred
+DEFERRED_TRACKING_CONTEXT = {
+    'tracking_disable': True,
+    'mail_create_nolog': True,
+    'mail_create_nosubscribe': True,
+    'mail_auto_subscribe_no_notify': True,
+}
+
+
+class ImportAborted(Exception):
+    """Rolls back an import whose rows failed to create"""
+
+    def __init__(self, errors):
+        super().__init__(f'{len(errors)} rows failed')
+        self.errors = errors
+
+
+def _blank(value):
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def _normalize_row(raw):
+    """Raw CSV/NDJSON object → row dict with IMPORT_COLUMNS keys only"""
+    row = {}
+    for key, value in raw.items():
+        key = (key or '').strip().lower()
+        if key in IMPORT_COLUMNS and not _blank(value):
+            row[key] = value.strip() if isinstance(value, str) else value
+    if 'owner_email' in row:
+        row['owner'] = row.pop('owner_email')
+    tags = row.get('tags')
+    if isinstance(tags, str):
+        row['tags'] = [tag.strip() for tag in tags.split(',') if tag.strip()]
+    return row
+
+
+def parse_import_rows(data, import_format='csv'):
+    """
+    Parse CSV or NDJSON text into rows
+
+    Args:
+        data (str): File content
+        import_format (str): 'csv' (header row required) or 'ndjson'
+
+    Returns:
+        tuple: (rows, errors, ignored_columns)
+            rows: list of (row number, row dict); row numbers are 1-based
+                data rows (CSV header excluded)
+            errors: list of {"row", "errors"} for unparsable lines
+
+    Raises:
+        ValueError on an unknown format, oversized file or missing header
+    """
+    if import_format not in IMPORT_FORMATS:
+        raise ValueError(f'format must be one of: {", ".join(IMPORT_FORMATS)}')
+    if not isinstance(data, str) or not data.strip():
+        raise ValueError('data must be a non-empty string')
+    if len(data) > MAX_IMPORT_BYTES:
+        raise ValueError(f'Import data is larger than {MAX_IMPORT_BYTES} bytes')
+
+    rows, errors, seen_columns = [], [], set()
+    data = data.lstrip('\ufeff')
+
+    if import_format == 'csv':
+        reader = csv.DictReader(io.StringIO(data))
+        if not reader.fieldnames or 'title' not in [name.strip().lower() for name in reader.fieldnames]:
+            raise ValueError('CSV header must include a "title" column')
+        seen_columns.update(name.strip().lower() for name in reader.fieldnames)
+        for number, raw in enumerate(reader, start=1):
+            raw.pop(None, None)  # cells beyond the header
+            rows.append((number, _normalize_row(raw)))
+    else:
+        number = 0
+        for line in data.splitlines():
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                raw = json.loads(line)
+            except ValueError as e:
+                errors.append({'row': number, 'errors': [f'Invalid JSON: {e}']})
+                continue
+            if not isinstance(raw, dict):
+                errors.append({'row': number, 'errors': ['Each line must be a JSON object']})
+                continue
+            seen_columns.update(str(key).lower() for key in raw)
+            rows.append((number, _normalize_row(raw)))
+
+    if len(rows) + len(errors) > MAX_IMPORT_ROWS:
+        raise ValueError(f'At most {MAX_IMPORT_ROWS} rows per import')
+    return rows, errors, sorted(seen_columns - set(IMPORT_COLUMNS))
+
+
+def _prefixed_ids(values, prefix):
+    """Split "prefix:N" references from names: ({value: id}, names)"""
+    ids, names = {}, set()
+    for value in values:
+        text = str(value)
+        head, _sep, number = text.partition(':')
+        if head == prefix and number.isascii() and number.isdigit():
+            ids[text] = int(number)
+        else:
+            names.add(text)
+    return ids, names
+
+
+def _resolve_stages(values, project_id):
+    """{value: stage id}, from one read of the board's stages"""
+    Stage = request.env['project.task.type']
+    stages = Stage.search([('project_ids', 'in', [project_id])])
+    by_id = {stage.id: stage.id for stage in stages}
+    by_name = {}
+    for stage in stages:
+        by_name.setdefault(stage.name.strip().lower(), stage.id)
+
+    refs, names = _prefixed_ids(values, 'stage')
+    resolved = {value: by_id[stage_id] for value, stage_id in refs.items() if stage_id in by_id}
+    resolved.update({name: by_name[name.lower()] for name in names if name.lower() in by_name})
+    return resolved
+
+
+def _resolve_owners(values):
+    """{value: res.users id}: one search for emails (case-insensitive), one for partner ids"""
+    Users = request.env['res.users']
+    emails = {str(value) for value in values if '@' in str(value)}
+    partner_ids = {
+        value: int(value)
+        for value in values
+        if '@' not in str(value) and str(value).isascii() and str(value).isdigit()
+    }
+
+    resolved = {}
+    if emails:
+        resolved.update({email: user.id for email, user in users_by_email(emails).items()})
+    if partner_ids:
+        by_partner = {}
+        for user in Users.search([('partner_id', 'in', list(partner_ids.values()))]):
+            by_partner.setdefault(user.partner_id.id, user.id)
+        resolved.update({
+            value: by_partner[partner_id]
+            for value, partner_id in partner_ids.items()
+            if partner_id in by_partner
+        })
+    return resolved
+
+
+def _resolve_tags(values):
+    """{value: tag id}: one search for ids, one for exact names"""
+    Tag = request.env['project.tags']
+    refs, names = _prefixed_ids(values, 'tag')
+    resolved = {}
+    if refs:
+        existing = set(Tag.search([('id', 'in', list(refs.values()))]).ids)
+        resolved.update({value: tag_id for value, tag_id in refs.items() if tag_id in existing})
+    if names:
+        for tag in Tag.search([('name', 'in', list(names))]):
+            resolved.setdefault(tag.name, tag.id)
+    return resolved
+
+
+def _resolve_parents(values):
+    """{value: task id} for "task:N" parents visible to the user"""
+    refs, _names = _prefixed_ids(values, 'task')
+    if not refs:
+        return {}
+    visible = set(request.env['project.task'].search([('id', 'in', list(refs.values()))]).ids)
+    return {value: task_id for value, task_id in refs.items() if task_id in visible}
+
+
+def resolve_import_rows(rows, project_id):
+    """
+    Validate rows and turn them into project.task values
+
+    Args:
+        rows (list): (row number, row dict) from parse_import_rows()
+        project_id (int): Target board
+
+    Returns:
+        tuple: (items, errors)
+            items: list of (row number, create values) for valid rows
+            errors: list of {"row", "errors"} for invalid rows
+    """
+    def distinct(key):
+        values = set()
+        for _number, row in rows:
+            value = row.get(key)
+            if isinstance(value, list):
+                values.update(str(item) for item in value)
+            elif value is not None:
+                values.add(str(value))
+        return values
+
+    stages = _resolve_stages(distinct('stage'), project_id)
+    owners = _resolve_owners(distinct('owner'))
+    tags = _resolve_tags(distinct('tags'))
+    parents = _resolve_parents(distinct('parent_id'))
+
+    items, errors = [], []
+    for number, row in rows:
+        fields = {key: row.get(key) for key in ('title', 'description_md', 'priority', 'due_date')}
+        _value, row_errors = validate_import_row({key: value for key, value in fields.items() if value is not None})
+
+        vals = {'project_id': project_id}
+        if not row_errors:
+            vals['name'] = row['title']
+            vals['priority'] = row.get('priority') or '1'
+            if row.get('description_md'):
+                vals['description'] = sanitize_markdown(row['description_md'])
+            if row.get('due_date'):
+                vals['date_deadline'] = row['due_date']
+
+        if 'stage' in row:
+            stage_id = stages.get(str(row['stage']))
+            if stage_id:
+                vals['stage_id'] = stage_id
+            else:
+                row_errors.append(f'stage: unknown stage "{row["stage"]}" on this board')
+
+        if 'owner' in row:
+            user_id = owners.get(str(row['owner']))
+            if user_id:
+                vals['user_id'] = user_id
+            else:
+                row_errors.append(f'owner: no user with email or partner id "{row["owner"]}"')
+
+        if 'tags' in row:
+            if not isinstance(row['tags'], list):
+                row_errors.append('tags: must be a list or a comma-separated string')
+            else:
+                unknown = [str(tag) for tag in row['tags'] if str(tag) not in tags]
+                if unknown:
+                    row_errors.append(f'tags: unknown tags {", ".join(unknown)}')
+                else:
+                    vals['tag_ids'] = [(6, 0, sorted({tags[str(tag)] for tag in row['tags']}))]
+
+        if 'parent_id' in row:
+            parent_id = parents.get(str(row['parent_id']))
+            if parent_id:
+                vals['parent_id'] = parent_id
+            else:
+                row_errors.append(f'parent_id: card "{row["parent_id"]}" not found or access denied')
+
+        if row_errors:
+            errors.append({'row': number, 'errors': row_errors})
+        else:
+            items.append((number, vals))
+
+    return items, errors
+
+
+def create_import_rows(items, defer_tracking=False):
+    """
+    Create tasks in chunked multi-record create() calls
+
+    Each chunk runs in a savepoint; when it fails, its rows are created one
+    by one (each in its own savepoint) to pinpoint the failing rows.
+
+    Args:
+        items (list): (row number, create values) from resolve_import_rows()
+        defer_tracking (bool): Skip tracking/mail side effects during create
+
+    Returns:
+        tuple: (created, errors)
+            created: list of (row number, project.task record)
+            errors: list of {"row", "errors"}
+    """
+    Task = request.env['project.task']
+    if defer_tracking:
+        Task = Task.with_context(**DEFERRED_TRACKING_CONTEXT)
+    cr = request.env.cr
+
+    created, errors = [], []
+    for start in range(0, len(items), IMPORT_CHUNK_SIZE):
+        chunk = items[start:start + IMPORT_CHUNK_SIZE]
+        try:
+            with cr.savepoint():
+                tasks = Task.create([vals for _number, vals in chunk])
+            created.extend(zip([number for number, _vals in chunk], tasks))
+            continue
+        except Exception as e:
+            _logger.info(f"Import chunk at row {chunk[0][0]} failed ({e}), retrying row by row")
+
+        for number, vals in chunk:
+            try:
+                with cr.savepoint():
+                    created.append((number, Task.create(vals)))
+            except Exception as e:
+                errors.append({'row': number, 'errors': [str(e)]})
+
+    return created, errors
+
+
+def apply_deferred_side_effects(project, created):
+    """
+    Subscribe owners and log the import once, after a deferred import
+
+    Args:
+        project: project.project record (the board)
+        created (list): (row number, project.task) from create_import_rows()
+    """
+    if not created:
+        return
+    Task = request.env['project.task']
+    tasks_by_partner = {}
+    for _number, task in created:
+        if task.user_id:
+            tasks_by_partner.setdefault(task.user_id.partner_id.id, []).append(task.id)
+
+    # One subscription call per distinct owner instead of one per task
+    for partner_id, task_ids in tasks_by_partner.items():
+        Task.browse(task_ids).message_subscribe(partner_ids=[partner_id])
+
+    project.message_post(
+        body=f'{len(created)} cards imported by {request.env.user.name}',
+        subtype_xmlid='mail.mt_note',
+    )
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+Write Coalescing Service — Collapse bursts of PATCHes to one card
+
+Live editing (typing into a title) sends a PATCH per keystroke. Within a
+configurable window, successive PATCHes from the same session to the same
+card are coalesced:
+
+1. Fields whose value did not change are dropped (no-op PATCH → no write)
+2. Text fields (title/description) keep one chatter entry per burst: the
+   burst's first write is tracked as usual; later writes inside the window
+   skip mail tracking and update that entry's new value in place, so it
+   reads value before the burst → last value typed
+
+Structural changes (stage, owner, deadline, priority, tags) are always
+written with tracking — they are audit-relevant.
+
+The window is stored per session (shared by all prefork workers) and is
+configured via ir.config_parameter (milliseconds, 0 disables).
+"""
+
+from odoo.http import request
+from odoo.tools import is_html_empty
+import time
+import logging
+
+_logger = logging.getLogger(__name__)
+
+PATCH_COALESCE_PARAM = 'ipai_taskboard_api.patch_coalesce_ms'
+DEFAULT_PATCH_COALESCE_MS = 2000
+
+# Fields whose intermediate values are not worth an audit entry each
+COALESCIBLE_FIELDS = {'name', 'description'}
+
+SESSION_KEY = 'taskboard_patch_stamps'
+MAX_SESSION_STAMPS = 50
+
+
+def _get_window_seconds():
+    value = request.env['ir.config_parameter'].sudo().get_param(PATCH_COALESCE_PARAM)
+    return (int(value) if value else DEFAULT_PATCH_COALESCE_MS) / 1000.0
+
+
+def _changed_vals(task, vals):
+    """Drop values equal to what the task already holds"""
+    changed = {}
+    for field_name, value in vals.items():
+        field = task._fields.get(field_name)
+        if field is None:
+            pass
+        elif field.type in ('many2many', 'one2many'):
+            # Commands such as [(6, 0, ids)] — compare the resulting ids
+            if value and value[0][0] == 6 and set(value[0][2]) == set(task[field_name].ids):
+                continue
+        elif field.type == 'many2one':
+            if (value or False) == task[field_name].id:
+                continue
+        elif field.convert_to_record(field.convert_to_cache(value, task), task) == task[field_name]:
+            continue
+        changed[field_name] = value
+    return changed
+
+
+def _last_message_id(task):
+    messages = request.env['mail.message'].sudo().search(
+        [('model', '=', task._name), ('res_id', '=', task.id)], order='id desc', limit=1)
+    return messages.id or 0
+
+
+def _burst_entry(task, burst):
+    """The text-only tracking message that opened the burst, if any"""
+    messages = request.env['mail.message'].sudo().search([
+        ('model', '=', task._name),
+        ('res_id', '=', task.id),
+        ('id', '>', burst['after']),
+        ('message_type', '=', 'notification'),
+        ('author_id', '=', request.env.user.partner_id.id),
+    ], order='id asc')
+    return messages.filtered(
+        lambda message: message.tracking_value_ids
+        and set(message.tracking_value_ids.field_id.mapped('name')) <= COALESCIBLE_FIELDS
+        and is_html_empty(message.body)
+    )[:1]
+
+
+def _extend_burst(task, burst, changed):
+    """
+    Write a burst continuation onto the burst's chatter entry
+
+    The write itself is untracked; the entry's tracking values for the
+    changed fields get the values just written. Falls back to a tracked
+    write when the entry is missing or does not track a changed field.
+    """
+    entry = _burst_entry(task, burst)
+    tracking_values = {
+        value.field_id.name: value for value in entry.tracking_value_ids
+    }
+    if not entry or not set(changed) <= set(tracking_values):
+        task.write(changed)
+        return
+
+    task.with_context(tracking_disable=True, mail_notrack=True).write(changed)
+    for field_name in changed:
+        value = tracking_values[field_name]
+        column = 'new_value_char' if value.field_id.ttype == 'char' else 'new_value_text'
+        value.write({column: task[field_name] or False})
+
+
+def coalesce_card_write(task, vals):
+    """
+    Write vals to task, coalescing rapid successive PATCHes
+    
+    Args:
+        task: project.task record (write access already checked)
+        vals (dict): Values to write
+    
+    Returns:
+        bool: True if anything was written
+    """
+    changed = _changed_vals(task, vals)
+    if not changed:
+        return False
+    
+    window = _get_window_seconds()
+    now = time.time()
+    # {task_id: {"at": last write, "after": last message id before the
+    # burst}}
+    stamps = {
+        key: value for key, value in (request.session.get(SESSION_KEY) or {}).items()
+        if isinstance(value, dict)
+    }
+    burst = stamps.get(str(task.id))
+    
+    in_burst = bool(window and burst and now - burst['at'] < window)
+    if in_burst and set(changed) <= COALESCIBLE_FIELDS:
+        _extend_burst(task, burst, changed)
+        _logger.debug(f"Coalesced PATCH on task {task.id}: {sorted(changed)}")
+    else:
+        if window:
+            burst = {'after': _last_message_id(task)}
+        task.write(changed)
+    
+    if window:
+        burst['at'] = now
+        stamps[str(task.id)] = burst
+        if len(stamps) > MAX_SESSION_STAMPS:
+            # Keep the session small: only the most recently edited cards
+            recent = sorted(stamps.items(), key=lambda item: item[1]['at'])[-MAX_SESSION_STAMPS:]
+            stamps = dict(recent)
+        request.session[SESSION_KEY] = stamps
+    
+    return True
@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+"""
+Export Service — Stream boards' cards and comments as CSV or XLSX
+
+Exports run after the handler has returned: the response body is a
+generator that opens its own cursor (REPEATABLE READ, READ ONLY — one
+consistent snapshot for the whole file) and reads rows from a server-side
+(named) cursor in EXPORT_ITERSIZE batches.
+
+Memory stays constant in the number of rows:
+* rows never become ORM records; only one batch is held at a time
+* owner, tag, stage, board and author names come from prefetch
+  dictionaries, filled once per batch for the ids not seen yet — their
+  size is bounded by the number of distinct users/tags/stages/authors
+* CSV is flushed every CSV_CHUNK_BYTES; XLSX is written by xlsxwriter in
+  constant_memory mode to a temporary file which is then streamed
+
+SECURITY: Rows start from project.task._search() (ACL + record rules) for
+the exporting user; users outside base.group_user only get public
+messages (queries.PUBLIC_MESSAGE_CONDITION). Names of related records are
+read with sudo(), like the names shown on the cards themselves.
+"""
+
+from odoo import api
+from odoo.tools import SQL, html2plaintext
+from .queries import DEFAULT_ACTIVITY_MESSAGE_TYPES, PUBLIC_MESSAGE_CONDITION
+import csv
+import io
+import os
+import tempfile
+import logging
+
+try:
+    import xlsxwriter
+except ImportError:  # pragma: no cover - optional dependency
+    xlsxwriter = None
+
+_logger = logging.getLogger(__name__)
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_ITERSIZE = 2000
+
+# CSV bytes buffered before a chunk is sent
+CSV_CHUNK_BYTES = 64 * 1024
+
+# Data rows per XLSX sheet (Excel's limit, minus the header row)
+XLSX_MAX_ROWS = 1048575
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx'),
+}
+
+CARD_COLUMNS = (
+    'board_id', 'board', 'card_id', 'title', 'stage', 'priority', 'due_date',
+    'owner', 'owner_email', 'tags', 'parent_id', 'created_at', 'updated_at',
+)
+COMMENT_COLUMNS = (
+    'board_id', 'board', 'card_id', 'card_title', 'event_id', 'message_type',
+    'author', 'author_email', 'created_at', 'body_md',
+)
+
+
+class _Names:
+    """{id: {field: value}} of one model, filled batch by batch"""
+
+    def __init__(self, model, fields):
+        self.model = model.sudo().with_context(active_test=False)
+        self.fields = fields
+        self.values = {}
+
+    def load(self, ids):
+        """Read the ids not seen yet in one query"""
+        missing = {record_id for record_id in ids if record_id and record_id not in self.values}
+        if not missing:
+            return
+        for record in self.model.browse(missing).read(self.fields):
+            self.values[record['id']] = record
+        for record_id in missing:
+            self.values.setdefault(record_id, {})
+        # Drop the records from the ORM cache; the dict keeps what we need
+        self.model.invalidate_model(self.fields)
+
+    def get(self, record_id, field='display_name'):
+        return (self.values.get(record_id) or {}).get(field) or ''
+
+
+def _iso(value):
+    return value.isoformat() if value else ''
+
+
+def _batches(cr, query):
+    """Yield lists of rows from a server-side cursor"""
+    with cr._cnx.cursor('taskboard_export') as server_cursor:
+        server_cursor.itersize = EXPORT_ITERSIZE
+        server_cursor.execute(query.code, query.params)
+        while True:
+            rows = server_cursor.fetchmany(server_cursor.itersize)
+            if not rows:
+                return
+            yield rows
+
+
+def _card_rows(env, project_ids):
+    Task = env['project.task']
+    tags_field = Task._fields['tag_ids']
+    tasks = Task._search([('project_id', 'in', project_ids)])
+    query = SQL(
+        """
+        SELECT t.id, t.project_id, t.name, t.stage_id, t.priority, t.date_deadline,
+               t.user_id, t.parent_id, t.create_date, t.write_date,
+               ARRAY(SELECT r.%(tag)s FROM %(rel)s r WHERE r.%(task)s = t.id ORDER BY r.%(tag)s)
+        FROM project_task t
+        WHERE t.id IN (%(tasks)s)
+        ORDER BY t.project_id, t.id
+        """,
+        tag=SQL.identifier(tags_field.column2),
+        rel=SQL.identifier(tags_field.relation),
+        task=SQL.identifier(tags_field.column1),
+        tasks=tasks.subselect(),
+    )
+
+    boards = _Names(env['project.project'], ['display_name'])
+    stages = _Names(env['project.task.type'], ['display_name'])
+    owners = _Names(env['res.users'], ['display_name', 'email'])
+    tags = _Names(env['project.tags'], ['display_name'])
+
+    for rows in _batches(env.cr, query):
+        boards.load(row[1] for row in rows)
+        stages.load(row[3] for row in rows)
+        owners.load(row[6] for row in rows)
+        tags.load(tag_id for row in rows for tag_id in row[10])
+        for (task_id, project_id, name, stage_id, priority, deadline,
+             user_id, parent_id, created, updated, tag_ids) in rows:
+            yield (
+                f'project:{project_id}',
+                boards.get(project_id),
+                f'task:{task_id}',
+                name,
+                stages.get(stage_id),
+                priority or '1',
+                _iso(deadline),
+                owners.get(user_id),
+                owners.get(user_id, 'email'),
+                ', '.join(tags.get(tag_id) for tag_id in tag_ids),
+                f'task:{parent_id}' if parent_id else '',
+                _iso(created),
+                _iso(updated),
+            )
+
+
+def _comment_rows(env, project_ids):
+    tasks = env['project.task']._search([('project_id', 'in', project_ids)])
+    conditions = [
+        SQL("m.model = 'project.task'"),
+        SQL("m.res_id IN (%s)", tasks.subselect()),
+        SQL("m.message_type IN %s", DEFAULT_ACTIVITY_MESSAGE_TYPES),
+    ]
+    if not env.user._is_internal():
+        conditions.append(PUBLIC_MESSAGE_CONDITION)
+    # (res_id, create_date, id) follows mail_message_task_feed_idx: no sort
+    query = SQL(
+        """
+        SELECT m.id, t.project_id, t.id, t.name, m.message_type, m.author_id,
+               m.email_from, m.create_date, m.body
+        FROM mail_message m
+        JOIN project_task t ON t.id = m.res_id
+        WHERE %s
+        ORDER BY m.res_id, m.create_date, m.id
+        """,
+        SQL(" AND ").join(conditions),
+    )
+
+    boards = _Names(env['project.project'], ['display_name'])
+    authors = _Names(env['res.partner'], ['display_name', 'email'])
+
+    for rows in _batches(env.cr, query):
+        boards.load(row[1] for row in rows)
+        authors.load(row[5] for row in rows)
+        for (message_id, project_id, task_id, task_name, message_type,
+             author_id, email_from, created, body) in rows:
+            yield (
+                f'project:{project_id}',
+                boards.get(project_id),
+                f'task:{task_id}',
+                task_name,
+                f'msg:{message_id}',
+                message_type,
+                authors.get(author_id) or email_from or '',
+                authors.get(author_id, 'email') or email_from or '',
+                _iso(created),
+                # Stored bodies are HTML; html2plaintext keeps links and
+                # emphasis as markdown-style text
+                html2plaintext(body) if body else '',
+            )
+
+
+# Dataset → (columns, row generator)
+EXPORT_DATASETS = {
+    'cards': (CARD_COLUMNS, _card_rows),
+    'comments': (COMMENT_COLUMNS, _comment_rows),
+}
+
+
+def _csv_cell(value):
+    # Keep spreadsheet apps from evaluating user text as formulas
+    if isinstance(value, str) and value[:1] in ('=', '+', '-', '@', '\t', '\r'):
+        return "'" + value
+    return value
+
+
+def _csv_chunks(columns, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')  # BOM: Excel opens UTF-8 CSV correctly
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow([_csv_cell(value) for value in row])
+        if buffer.tell() >= CSV_CHUNK_BYTES:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
+
+
+def _xlsx_chunks(columns, rows, sheet_name):
+    fd, path = tempfile.mkstemp(suffix='.xlsx')
+    os.close(fd)
+    try:
+        workbook = xlsxwriter.Workbook(path, {
+            'constant_memory': True,
+            'strings_to_formulas': False,
+            'strings_to_urls': False,
+            'strings_to_numbers': False,
+        })
+        sheet, row_index, sheet_count = None, XLSX_MAX_ROWS, 0
+        for row in rows:
+            if row_index >= XLSX_MAX_ROWS:
+                sheet_count += 1
+                sheet = workbook.add_worksheet(f'{sheet_name} {sheet_count}' if sheet_count > 1 else sheet_name)
+                sheet.write_row(0, 0, columns)
+                row_index = 0
+            row_index += 1
+            sheet.write_row(row_index, 0, row)
+        if sheet is None:
+            workbook.add_worksheet(sheet_name).write_row(0, 0, columns)
+        workbook.close()
+
+        with open(path, 'rb') as xlsx_file:
+            while True:
+                chunk = xlsx_file.read(CSV_CHUNK_BYTES)
+                if not chunk:
+                    return
+                yield chunk
+    finally:
+        os.unlink(path)
+
+
+def stream_export(registry, uid, context, dataset, export_format, project_ids):
+    """
+    Generate the export file, chunk by chunk
+
+    Runs while the response is sent, after the request cursor is closed.
+
+    Args:
+        registry: Database registry of the request
+        uid (int): Exporting user
+        context (dict): Request context
+        dataset (str): Key of EXPORT_DATASETS
+        export_format (str): Key of EXPORT_FORMATS
+        project_ids (list[int]): Boards to export (already access-checked)
+
+    Yields:
+        bytes
+    """
+    columns, row_generator = EXPORT_DATASETS[dataset]
+    cr = registry.cursor()
+    try:
+        cr.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+        env = api.Environment(cr, uid, context)
+        rows = row_generator(env, project_ids)
+        if export_format == 'xlsx':
+            yield from _xlsx_chunks(columns, rows, dataset)
+        else:
+            yield from _csv_chunks(columns, rows)
+    except Exception as e:
+        # Headers are already sent: the client gets a truncated file
+        _logger.error(f"Export of {dataset} for user {uid} failed: {str(e)}", exc_info=True)
+        raise
+    finally:
+        cr.close()
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Fast JSON encoding for the REST transport
+
+Uses orjson when it is installed (optional dependency) and falls back to a
+preconfigured stdlib encoder otherwise. Both produce compact UTF-8 bytes
+ready to be written straight into the HTTP response.
+
+PreEncoded DTOs (see services/render_cache.py) carry their own serialized
+JSON; with orjson >= 3.9 that fragment is spliced into the output instead
+of being re-encoded. Otherwise they serialize like the plain dict they are.
+
+This module has no Odoo imports so it can be benchmarked standalone
+(see odoo-module/benchmarks/bench_serialization.py).
+"""
+
+import datetime
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+Fragment = getattr(orjson, 'Fragment', None)
+
+
+class PreEncoded(dict):
+    """DTO dict that also holds its serialized JSON (bytes) in .fragment"""
+
+    __slots__ = ('fragment',)
+
+    def __init__(self, dto, fragment=None):
+        super().__init__(dto)
+        self.fragment = fragment
+
+
+def _default(value):
+    """Serialize the non-JSON types that can appear in DTOs"""
+    if isinstance(value, PreEncoded):
+        return Fragment(value.fragment) if value.fragment is not None else dict(value)
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if isinstance(value, bytes):
+        return value.decode()
+    # Builtin subclasses (Markup, frozendict, ...) reach here via OPT_PASSTHROUGH_SUBCLASS
+    for base in (str, int, float, dict, list):
+        if isinstance(value, base):
+            return base(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+# Subclasses go through _default only when PreEncoded fragments can be spliced
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+if Fragment is not None:
+    _ORJSON_OPTIONS |= orjson.OPT_PASSTHROUGH_SUBCLASS
+
+# Built once: compact separators, no ASCII escaping of non-Latin text
+_stdlib_encoder = json.JSONEncoder(
+    ensure_ascii=False,
+    separators=(',', ':'),
+    default=_default,
+)
+
+
+def dumps(value):
+    """
+    Serialize value to compact JSON
+
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=_default, option=_ORJSON_OPTIONS)
+    return _stdlib_encoder.encode(value).encode()
+
+
+def encode_fragment(dto):
+    """
+    Serialize a DTO once so later responses can splice it in
+
+    Returns:
+        bytes | None: JSON fragment, None when splicing is unsupported
+    """
+    if Fragment is None:
+        return None
+    return dumps(dto)
+
+
+def loads(data):
+    """Parse JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
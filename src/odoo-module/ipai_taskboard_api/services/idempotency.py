@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+Idempotency Service — Replay-safe writes via the Idempotency-Key header
+
+Usage in a write endpoint (before the try/except block, so concurrency
+errors still reach Odoo's request retry):
+
+    claim_id, replay = claim_idempotency_key('create_card', payload)
+    if replay is not None:
+        return replay
+    ...
+    return complete_idempotency_key(claim_id, {'card': card})
+
+Concurrency:
+    The claim is an INSERT ... ON CONFLICT on (user_id, idempotency_key).
+    A retry racing an in-flight first request waits on the unique index;
+    once the first one commits, Postgres raises a serialization failure
+    (REPEATABLE READ) and Odoo retries the request, which then replays.
+"""
+
+from odoo.http import request
+from .batch import in_batch
+import hashlib
+import json
+import logging
+
+_logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+
+def _fingerprint(route, payload):
+    raw = json.dumps([route, payload], sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def claim_idempotency_key(route, payload):
+    """
+    Claim the request's Idempotency-Key, or fetch the stored response
+    
+    Args:
+        route (str): Logical operation name (e.g. 'create_card')
+        payload (dict): Request parameters used to detect key reuse
+    
+    Returns:
+        tuple: (claim_id, replay_response)
+            (None, None)      — no header, proceed without idempotency
+            (id, None)        — key claimed, proceed and complete it
+            (None, response)  — replay, return response as-is
+    """
+    key = request.httprequest.headers.get(IDEMPOTENCY_HEADER)
+    if not key or in_batch():
+        # Inside a batch the key belongs to the batch as a whole
+        return None, None
+    
+    if len(key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+        return None, {
+            'error': {
+                'code': 'VALIDATION_ERROR',
+                'message': f'{IDEMPOTENCY_HEADER} must be at most {MAX_IDEMPOTENCY_KEY_LENGTH} characters',
+                'details': {'field': IDEMPOTENCY_HEADER},
+            }
+        }
+    
+    cr = request.env.cr
+    user_id = request.env.user.id
+    fingerprint = _fingerprint(route, payload)
+    ttl_hours = request.env['ipai.taskboard.idempotency.key']._get_ttl_hours()
+    
+    # Insert, or take over an expired row / a row whose first request
+    # failed (no stored response); live completed rows are left alone
+    cr.execute("""
+        INSERT INTO ipai_taskboard_idempotency_key
+            (idempotency_key, user_id, route, fingerprint, response, claimed_at)
+        VALUES (%s, %s, %s, %s, NULL, now() at time zone 'UTC')
+        ON CONFLICT (user_id, idempotency_key) DO UPDATE
+            SET route = EXCLUDED.route,
+                fingerprint = EXCLUDED.fingerprint,
+                response = NULL,
+                claimed_at = EXCLUDED.claimed_at
+            WHERE ipai_taskboard_idempotency_key.response IS NULL
+               OR ipai_taskboard_idempotency_key.claimed_at
+                < (now() at time zone 'UTC') - make_interval(hours => %s)
+        RETURNING id
+    """, (key, user_id, route, fingerprint, ttl_hours))
+    row = cr.fetchone()
+    if row:
+        return row[0], None
+    
+    cr.execute("""
+        SELECT fingerprint, response FROM ipai_taskboard_idempotency_key
+        WHERE user_id = %s AND idempotency_key = %s
+    """, (user_id, key))
+    stored_fingerprint, stored_response = cr.fetchone()
+    
+    if stored_fingerprint != fingerprint:
+        _logger.warning(f"User {user_id} reused idempotency key {key} with a different payload")
+        return None, {
+            'error': {
+                'code': 'IDEMPOTENCY_KEY_REUSED',
+                'message': 'Idempotency-Key was already used with a different request',
+                'details': {'field': IDEMPOTENCY_HEADER},
+            }
+        }
+    
+    _logger.info(f"User {user_id} replayed {route} with idempotency key {key}")
+    return None, json.loads(stored_response)
+
+
+def complete_idempotency_key(claim_id, response):
+    """
+    Store the response of a successful request under its claimed key
+    
+    Failed requests simply never complete: their claim keeps a NULL
+    response and is taken over by the client's next retry.
+    
+    Args:
+        claim_id (int): id returned by claim_idempotency_key (None = no-op)
+        response (dict): Response about to be returned to the client
+    
+    Returns:
+        dict: response, unchanged
+    """
+    if claim_id:
+        request.env.cr.execute(
+            "UPDATE ipai_taskboard_idempotency_key SET response = %s WHERE id = %s",
+            (json.dumps(response, default=str), claim_id),
+        )
+    return response
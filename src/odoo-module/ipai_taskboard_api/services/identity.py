@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Identity Service — Case-insensitive email → partner/user resolution
+
+Email identity is case-insensitive: "Jane@Company.com" and
+"jane@company.com" are the same person. Every API email lookup compares
+res.partner.email_normalized (lowercased address, b-tree indexed by
+models/res_partner.py) with the normalized input, in one query for all
+emails of a request.
+
+When several partners share an email, the oldest one with a user wins,
+else the oldest partner (see odoo-bin taskboard_email_identity --duplicates).
+"""
+
+from odoo.http import request
+from odoo.tools import email_normalize
+
+
+def normalize_email(email):
+    """Lowercased bare address ("Jane <Jane@X.com>" → "jane@x.com"), or None"""
+    return email_normalize(email or '') or None
+
+
+def partners_by_email(emails, sudo=False):
+    """
+    Resolve emails to partners in one indexed search
+
+    Args:
+        emails (iterable[str]): Emails as given (any case)
+        sudo (bool): Search as superuser (mention resolution)
+
+    Returns:
+        dict[str, res.partner]: {email as given: partner} for found emails
+    """
+    normalized = {email: normalize_email(email) for email in emails}
+    wanted = {value for value in normalized.values() if value}
+    if not wanted:
+        return {}
+    Partner = request.env['res.partner']
+    if sudo:
+        Partner = Partner.sudo()
+    best = {}
+    for partner in Partner.search([('email_normalized', 'in', list(wanted))], order='id'):
+        current = best.get(partner.email_normalized)
+        # Duplicate emails: a partner with a user beats an older one without
+        if current is None or (partner.user_ids and not current.user_ids):
+            best[partner.email_normalized] = partner
+    return {email: best[value] for email, value in normalized.items() if value in best}
+
+
+def users_by_email(emails):
+    """
+    Resolve emails to users in one indexed search
+
+    Returns:
+        dict[str, res.users]: {email as given: user} for found emails
+    """
+    normalized = {email: normalize_email(email) for email in emails}
+    wanted = {value for value in normalized.values() if value}
+    if not wanted:
+        return {}
+    best = {}
+    for user in request.env['res.users'].search([('email_normalized', 'in', list(wanted))], order='id'):
+        best.setdefault(user.email_normalized, user)
+    return {email: best[value] for email, value in normalized.items() if value in best}
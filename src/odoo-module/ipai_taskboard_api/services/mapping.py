@@ -15,6 +15,12 @@ Mapping rules:
 """
 
 from odoo.http import request
+from .queries import stage_card_counts, encode_cursor, FLOW_PERCENTILES
+from .render_cache import map_cards_cached
+from .avatars import avatar_url
+from .uploads import MAX_CHUNK_BYTES
+from .search import HIGHLIGHT_START, HIGHLIGHT_STOP
+import html
 import logging
 
 _logger = logging.getLogger(__name__)
@@ -48,7 +54,7 @@ def map_partner(partner):
         'partner_id': partner.id,
         'email': partner.email or '',
         'name': partner.name or '',
-        'avatar_url': None,  # TODO: convert image_128 to URL
+        'avatar_url': avatar_url(partner),
     }
 
 
@@ -61,7 +67,7 @@ def map_stage(stage):
         'stage_id': f'stage:{stage.id}',
         'name': stage.name,
         'order': stage.sequence,
-        'wip_limit': None,  # TODO: OCA extension or custom field
+        'wip_limit': stage.wip_limit or None,
         'fold': stage.fold if hasattr(stage, 'fold') else False,
     }
 
@@ -122,6 +128,96 @@ def map_board(project):
     }
 
 
+def map_board_clone(project, stages_created, cards_created):
+    """Map a cloned project.project → BoardClone DTO"""
+    return {
+        'board': map_board(project),
+        'stages_created': stages_created,
+        'cards_created': cards_created,
+    }
+
+
+def map_board_charts(project, series, date_from, date_to):
+    """
+    Map daily board snapshots → BoardCharts DTO
+
+    Args:
+        project: project.project record
+        series (dict): {day: {stage_id: (cards, overdue)}} from board_snapshot_series()
+        date_from (date): First day of the range
+        date_to (date): Last day of the range
+
+    Returns:
+        dict: {"board_id", "from", "to", "stages", "cumulative_flow", "burndown"}
+            Burndown "remaining" counts cards outside folded (done) stages.
+    """
+    stages = project.type_ids
+    folded = {stage.id for stage in stages if stage.fold}
+    cumulative_flow, burndown = [], []
+    for day, rows in series.items():
+        cumulative_flow.append({
+            'date': day.isoformat(),
+            'counts': {f'stage:{stage.id}': rows.get(stage.id, (0, 0))[0] for stage in stages},
+        })
+        burndown.append({
+            'date': day.isoformat(),
+            'total': sum(cards for cards, _overdue in rows.values()),
+            'remaining': sum(cards for stage_id, (cards, _overdue) in rows.items() if stage_id not in folded),
+            'overdue': sum(overdue for _cards, overdue in rows.values()),
+        })
+    return {
+        'board_id': f'project:{project.id}',
+        'from': date_from.isoformat(),
+        'to': date_to.isoformat(),
+        'stages': [map_stage(stage) for stage in stages],
+        'cumulative_flow': cumulative_flow,
+        'burndown': burndown,
+    }
+
+
+def _percentile_hours(values):
+    """Percentile seconds (FLOW_PERCENTILES order) → {"p50": hours, ...}"""
+    values = values or [None] * len(FLOW_PERCENTILES)
+    return {
+        f'p{round(percentile * 100)}': round(value / 3600.0, 2) if value is not None else None
+        for percentile, value in zip(FLOW_PERCENTILES, values)
+    }
+
+
+def map_flow_metrics(project, metrics, date_from, date_to):
+    """
+    Map flow_metrics() → FlowMetrics DTO (durations in hours)
+
+    Returns:
+        dict: {"board_id", "from", "to", "completed",
+               "lead_time": {"p50", "p85", "p95"}, "cycle_time": {...},
+               "time_in_stage": [{"stage_id", "name", "transitions", "p50", ...}]}
+    """
+    stage_names = {stage.id: stage.name for stage in project.type_ids}
+    order = {stage_id: index for index, stage_id in enumerate(stage_names)}
+    stages = request.env['project.task.type'].sudo().browse(
+        [stage_id for stage_id, _count, _values in metrics['stages']]
+    )
+    stage_names.update({stage.id: stage.name for stage in stages.exists()})
+    return {
+        'board_id': f'project:{project.id}',
+        'from': date_from.isoformat(),
+        'to': date_to.isoformat(),
+        'completed': metrics['completed'],
+        'lead_time': _percentile_hours(metrics['lead_time']),
+        'cycle_time': _percentile_hours(metrics['cycle_time']),
+        'time_in_stage': [
+            dict(
+                {'stage_id': f'stage:{stage_id}', 'name': stage_names.get(stage_id), 'transitions': count},
+                **_percentile_hours(values),
+            )
+            for stage_id, count, values in sorted(
+                metrics['stages'], key=lambda row: (order.get(row[0], len(order)), row[0])
+            )
+        ],
+    }
+
+
 def map_board_with_card_counts(project):
     """Map project.project → Board DTO with card_counts"""
     board = map_board(project)
@@ -129,17 +225,47 @@ def map_board_with_card_counts(project):
     if not board:
         return None
     
-    # Count cards per stage
-    card_counts = {}
+    # Count cards per stage (one grouped query for all stages)
+    counts = stage_card_counts(project.id)
+    board['card_counts'] = {
+        f'stage:{stage.id}': counts.get(stage.id, 0)
+        for stage in project.type_ids
+    }
+    return board
+
+
+def map_board_snapshot(project, cards_by_stage, per_stage_limit):
+    """
+    Map project.project → BoardSnapshot DTO
+
+    Board metadata + card_counts + the first page of every column.
+    
+    Args:
+        project: project.project record
+        cards_by_stage (dict[int, project.task]): First cards per stage id
+        per_stage_limit (int): Page size used to build cards_by_stage
+    """
+    board = map_board_with_card_counts(project)
+    
+    if not board:
+        return None
+    
+    columns = []
     for stage in project.type_ids:
-        count = request.env['project.task'].search_count([
-            ('project_id', '=', project.id),
-            ('stage_id', '=', stage.id),
-        ])
-        card_counts[f'stage:{stage.id}'] = count
+        stage_key = f'stage:{stage.id}'
+        tasks = cards_by_stage.get(stage.id, request.env['project.task'])
+        next_cursor = None
+        if board['card_counts'][stage_key] > len(tasks) and tasks:
+            next_cursor = encode_cursor(tasks[-1].sequence, tasks[-1].id)
+        column = map_card_column(stage.id, tasks, next_cursor)
+        column['total'] = board['card_counts'][stage_key]
+        columns.append(column)
     
-    board['card_counts'] = card_counts
-    return board
+    return {
+        'board': board,
+        'columns': columns,
+        'per_stage_limit': per_stage_limit,
+    }
 
 
 def map_card(task):
@@ -164,11 +290,12 @@ def map_card(task):
     # Map parent
     parent_id = f'task:{task.parent_id.id}' if task.parent_id else None
     
-    # TODO: Map checklist (OCA extension)
-    checklist = None
+    # TODO: Map checklist (OCA extension); empty until then, the contract
+    # declares an array
+    checklist = []
     
     # TODO: Map dependencies (OCA extension)
-    dependencies = None
+    dependencies = []
     
     return {
         'card_id': f'task:{task.id}',
@@ -191,6 +318,161 @@ def map_card(task):
     }
 
 
+def map_cards(tasks):
+    """
+    Map project.task records → Card DTOs for list responses
+    
+    Unchanged cards are served from the render cache (services/render_cache.py)
+    instead of being re-mapped; the returned DTOs are shared, read-only dicts.
+    """
+    return map_cards_cached(tasks, map_card, CONTRACT_VERSION)
+
+
+def map_card_batch(card_keys, task_ids, cards, hidden_ids=()):
+    """
+    Map a multi-get result → CardBatch DTO (one item per requested id)
+    
+    Args:
+        card_keys (list[str]): Requested ids in request order ("task:N")
+        task_ids (dict[str, int]): Parsed task id of every well-formed key
+        cards (dict[int, dict]): Card DTOs of the visible cards by task id
+        hidden_ids (set[int]): Existing cards the user may not read
+    """
+    items = []
+    for card_key in card_keys:
+        task_id = task_ids.get(card_key)
+        card = cards.get(task_id)
+        if card is not None:
+            items.append({'id': card_key, 'card': card, 'error': None})
+            continue
+        
+        if task_id is None:
+            code, message = 'INVALID_CARD_ID', f'Invalid card_id format: {card_key}'
+        elif task_id in hidden_ids:
+            code, message = 'PERMISSION_DENIED', 'Access denied'
+        else:
+            code, message = 'CARD_NOT_FOUND', 'Card not found'
+        items.append({'id': card_key, 'card': None, 'error': {'code': code, 'message': message}})
+    
+    return {
+        'items': items,
+        'found': sum(1 for item in items if item['card'] is not None),
+    }
+
+
+def map_card_column(stage_id, tasks, next_cursor=None):
+    """
+    Map one page of a Kanban column → CardColumn DTO
+    
+    Args:
+        stage_id (int): project.task.type id
+        tasks: project.task records of this page (display order)
+        next_cursor (str): Cursor for the next page, None on the last page
+    """
+    return {
+        'stage_id': f'stage:{stage_id}',
+        'cards': map_cards(tasks),
+        'next_cursor': next_cursor,
+        'has_more': bool(next_cursor),
+    }
+
+
+def map_card_tree_node(task, node):
+    """
+    Map project.task + tree position → CardTreeNode DTO
+    
+    Args:
+        task: project.task record
+        node (dict): Row from queries.card_subtree / card_ancestors
+    """
+    rollup = None
+    if 'total' in node:
+        rollup = {
+            'done': node['done'],
+            'total': node['total'],
+        }
+    
+    return {
+        'card': map_card(task),
+        'depth': node['depth'],
+        'parent_id': f'task:{node["parent_id"]}' if node['parent_id'] else None,
+        'rollup': rollup,
+    }
+
+
+def map_batch_results(operations, results):
+    """
+    Map executed batch operations → BatchResult DTO
+    
+    Args:
+        operations (list[dict]): Operations as received ({"id", "op", "args"})
+        results (list[dict]): Result of each operation, same order
+    """
+    return {
+        'results': [
+            {
+                'id': operation.get('id'),
+                'op': operation['op'],
+                'result': result,
+            }
+            for operation, result in zip(operations, results)
+        ],
+    }
+
+
+def map_import_result(board_id, total_rows, valid_rows, created, errors, ignored_columns, dry_run):
+    """
+    Map a card import → ImportResult DTO
+    
+    Args:
+        board_id (str): Target board ("project:42")
+        total_rows (int): Data rows received
+        valid_rows (int): Rows that passed validation
+        created (list): (row number, project.task) — empty on dry runs
+        errors (list[dict]): {"row", "errors"} per failing row
+        ignored_columns (list[str]): Columns/keys that were not imported
+        dry_run (bool): Nothing was written
+    """
+    return {
+        'board_id': board_id,
+        'dry_run': dry_run,
+        'total_rows': total_rows,
+        'valid_rows': valid_rows,
+        'created': [{'row': number, 'card_id': f'task:{task.id}'} for number, task in created],
+        'errors': sorted(errors, key=lambda error: error['row']),
+        'ignored_columns': ignored_columns,
+    }
+
+
+def map_attachment(attachment):
+    """Map ir.attachment (of a card) → Attachment DTO"""
+    return {
+        'attachment_id': f'attachment:{attachment.id}',
+        'card_id': f'task:{attachment.res_id}',
+        'name': attachment.name,
+        'mimetype': attachment.mimetype,
+        'size': attachment.file_size,
+        'checksum': attachment.checksum,
+        'created_at': attachment.create_date.isoformat() if attachment.create_date else '',
+        'download_url': f'/api/v1/cards/task:{attachment.res_id}/attachments/{attachment.id}',
+    }
+
+
+def map_upload(upload):
+    """Map ipai.taskboard.upload → Upload DTO"""
+    done = bool(upload.attachment_id)
+    return {
+        'upload_id': upload.token,
+        'card_id': f'task:{upload.task_id.id}',
+        'filename': upload.filename,
+        'size': upload.size,
+        'offset': upload.received,
+        'complete': done,
+        'max_chunk_bytes': MAX_CHUNK_BYTES,
+        'attachment': map_attachment(upload.attachment_id) if done else None,
+    }
+
+
 def map_activity(message, task=None):
     """Map mail.message → Activity DTO"""
     if not message:
@@ -238,3 +520,137 @@ def map_activity(message, task=None):
         'metadata': metadata if metadata else None,
         'created_at': message.create_date.isoformat() if message.create_date else '',
     }
+
+
+def map_board_activity(messages, next_cursor=None):
+    """
+    Map a page of board activity → BoardActivityPage DTO
+    
+    Authors, tracking values, mentioned partners and card titles are loaded
+    once for the whole page instead of per message.
+    
+    Args:
+        messages: mail.message records (newest first) on project.task
+        next_cursor (str): Cursor for the next page, None on the last page
+    """
+    tasks = request.env['project.task'].browse(set(messages.mapped('res_id')))
+    tasks.mapped('name')
+    messages.author_id.mapped('email')
+    messages.partner_ids.mapped('email')
+    messages.subtype_id.mapped('name')
+    messages.tracking_value_ids.mapped('old_value_char')
+    
+    tasks_by_id = {task.id: task for task in tasks}
+    items = []
+    for message in messages:
+        task = tasks_by_id.get(message.res_id)
+        items.append({
+            'card_id': f'task:{message.res_id}',
+            'card_title': task.name if task else '',
+            'activity': map_activity(message, task),
+        })
+    
+    return {
+        'items': items,
+        'next_cursor': next_cursor,
+        'has_more': bool(next_cursor),
+    }
+
+
+def map_mentions_page(messages, read_state, next_cursor=None, unread=0):
+    """
+    Map a page of the current user's mentions → MentionsPage DTO
+    
+    Args:
+        messages: mail.message records (newest first) on project.task
+        read_state (dict[int, bool]): {message id: is_read}
+        next_cursor (str): Cursor for the next page, None on the last page
+        unread (int): Unread mention count (badge)
+    """
+    tasks = request.env['project.task'].browse(set(messages.mapped('res_id')))
+    tasks.mapped('project_id')
+    messages.author_id.mapped('email')
+    messages.partner_ids.mapped('email')
+    
+    tasks_by_id = {task.id: task for task in tasks}
+    items = []
+    for message in messages:
+        task = tasks_by_id.get(message.res_id)
+        items.append({
+            'mention_id': f'msg:{message.id}',
+            'card_id': f'task:{message.res_id}',
+            'card_title': task.name if task else '',
+            'board_id': f'project:{task.project_id.id}' if task and task.project_id else None,
+            'is_read': read_state.get(message.id, True),
+            'activity': map_activity(message, task),
+        })
+    
+    return {
+        'items': items,
+        'unread': unread,
+        'next_cursor': next_cursor,
+        'has_more': bool(next_cursor),
+    }
+
+
+def _map_highlight(snippet):
+    """ts_headline output → escaped HTML with <mark> around matches"""
+    text = html.escape(html.unescape(' '.join(snippet.split())), quote=False)
+    return text.replace(HIGHLIGHT_START, '<mark>').replace(HIGHLIGHT_STOP, '</mark>')
+
+
+def _map_search_hit(hit):
+    dto = {
+        'type': hit['kind'],
+        'score': round(hit['score'], 6),
+        'highlight': _map_highlight(hit['highlight']),
+    }
+    if hit['kind'] == 'card':
+        dto.update(card_id=f"task:{hit['id']}", title=hit['title'])
+    elif hit['kind'] == 'comment':
+        dto.update(
+            message_id=f"msg:{hit['id']}",
+            card_id=f"task:{hit['card_id']}",
+            card_title=hit['card_title'] or '',
+            author=hit['author'] or '',
+            created_at=hit['date'].isoformat() if hit['date'] else '',
+        )
+    else:
+        dto.update(board_id=f"project:{hit['id']}", title=hit['title'])
+    return dto
+
+
+def map_search_results(q, pages):
+    """
+    Map search_page() results → SearchResults DTO
+
+    One section per result type; within a section, hits are grouped by
+    board, boards ordered by their best hit and hits by score.
+
+    Args:
+        q (str): The query as sent
+        pages (dict[str, tuple]): {type: (hits, next cursor or None)}
+    """
+    sections = []
+    for kind, (hits, next_cursor) in pages.items():
+        groups = {}
+        for hit in hits:
+            group = groups.get(hit['board_id'])
+            if group is None:
+                group = groups[hit['board_id']] = {
+                    'board_id': f"project:{hit['board_id']}",
+                    'board_name': hit['board_name'],
+                    'hits': [],
+                }
+            group['hits'].append(_map_search_hit(hit))
+        sections.append({
+            'type': kind,
+            'groups': list(groups.values()),
+            'next_cursor': next_cursor,
+            'has_more': bool(next_cursor),
+        })
+
+    return {
+        'query': q,
+        'sections': sections,
+    }
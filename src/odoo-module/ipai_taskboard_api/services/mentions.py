@@ -4,7 +4,7 @@ Mentions Service — Parse and resolve @email mentions
 
 Email-based identity resolution:
 1. Parse @email from comment body
-2. Resolve email → res.partner (create if needed)
+2. Resolve email → res.partner, case-insensitively (create if needed)
 3. Add partner as follower on task
 4. Send notification
 
@@ -12,14 +12,12 @@ SECURITY: Partner creation is controlled - only creates minimal record.
 """
 
 from odoo.http import request
-import re
+from .sanitizer import sanitize_text
+from .identity import partners_by_email, normalize_email
 import logging
 
 _logger = logging.getLogger(__name__)
 
-# Email regex pattern
-EMAIL_PATTERN = re.compile(r'@([a-zA-Z0-9._-]+@[a-zA-Z0-9._-]+\.[a-zA-Z0-9_-]+)')
-
 
 def parse_mentions(body_text):
     """
@@ -29,20 +27,24 @@ def parse_mentions(body_text):
         body_text (str): Comment body with @mentions
     
     Returns:
-        list[str]: List of email addresses
+        list[str]: List of email addresses (deduplicated, in order of appearance)
+    
+    Note:
+        Comment creation gets mentions from sanitizer.sanitize_text() while
+        sanitizing the body; use this only when the text is not sanitized.
     """
     if not body_text:
         return []
     
-    emails = EMAIL_PATTERN.findall(body_text)
-    return list(set(emails))  # Deduplicate
+    return sanitize_text(body_text)[1]
 
 
 def resolve_mentions(emails):
     """
     Resolve email addresses to partner IDs
     
-    Creates partner records if they don't exist (email-only partners).
+    Emails match case-insensitively (services/identity.py). Creates
+    partner records if they don't exist (email-only partners).
     
     Args:
         emails (list[str]): List of email addresses
@@ -57,16 +59,18 @@ def resolve_mentions(emails):
     if not emails:
         return []
     
+    emails = [email for email in emails if email and '@' in email]
+    
+    # One case-insensitive lookup for all emails
+    # Use sudo() only for lookup - we validate access on the task itself
+    found = partners_by_email(emails, sudo=True)
+    
     partner_ids = []
     Partner = request.env['res.partner']
+    created = {}
     
     for email in emails:
-        if not email or '@' not in email:
-            continue
-        
-        # Search for existing partner by email
-        # Use sudo() only for lookup - we validate access on the task itself
-        partner = Partner.sudo().search([('email', '=', email)], limit=1)
+        partner = found.get(email) or created.get(normalize_email(email))
         
         if not partner:
             # Create minimal partner record for email identity
@@ -77,12 +81,14 @@ def resolve_mentions(emails):
                     'email': email,
                     'type': 'contact',
                 })
+                created[normalize_email(email)] = partner
                 _logger.info(f"Created partner for mentioned email: {email}")
             except Exception as e:
                 _logger.error(f"Failed to create partner for {email}: {str(e)}")
                 continue
         
-        partner_ids.append(partner.id)
+        if partner.id not in partner_ids:
+            partner_ids.append(partner.id)
     
     return partner_ids
 
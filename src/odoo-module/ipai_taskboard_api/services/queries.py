@@ -0,0 +1,667 @@
+# -*- coding: utf-8 -*-
+"""
+Query Service — Set-based reads for board-level views
+
+Helpers that fetch what a Kanban board needs in a fixed number of SQL
+statements, regardless of how many stages the board has.
+
+SECURITY: Every helper starts from Model._search(), so ACL + record rules
+are applied to the rows before any raw SQL windowing happens. The
+exceptions: stage_card_counts() reads unfiltered counters only for users
+whose record rules show them the whole board, and card_activity_page()
+expects the caller to have checked access to the card.
+
+Scans go through replica_fetchall() (services/replica.py): inside a
+@replica_read handler they run on the replica, the Query they are built
+from and the records they return are read on the primary.
+"""
+
+from odoo.http import request
+from odoo.tools import SQL
+from .replica import replica_fetchall
+import base64
+import json
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Default/maximum number of cards returned per column on first paint
+DEFAULT_PER_STAGE_LIMIT = 20
+MAX_PER_STAGE_LIMIT = 100
+
+# Default/maximum number of days of board chart series
+DEFAULT_CHART_DAYS = 30
+MAX_CHART_DAYS = 366
+
+# Percentiles reported by flow_metrics()
+FLOW_PERCENTILES = (0.5, 0.85, 0.95)
+
+
+def encode_cursor(*values):
+    """
+    Encode the sort key of the last row of a page as an opaque cursor
+
+    Args:
+        *values: Sort key values (e.g. sequence, id)
+
+    Returns:
+        str: URL-safe cursor token
+    """
+    raw = json.dumps(list(values), separators=(',', ':'), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, size=2):
+    """
+    Decode a cursor produced by encode_cursor()
+
+    Raises:
+        ValueError if the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise ValueError(f'Invalid cursor: {cursor}')
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError(f'Invalid cursor: {cursor}')
+    return values
+
+
+def keyset_domain(fields, values, descending=False):
+    """
+    Domain selecting rows strictly after (or before) a two-column sort key
+
+    Args:
+        fields (tuple[str, str]): Sort fields, e.g. ('sequence', 'id')
+        values (list): Sort key of the last row already returned
+        descending (bool): True for "ORDER BY a DESC, b DESC" pages
+
+    Returns:
+        list: Odoo domain
+    """
+    op = '<' if descending else '>'
+    (first, second), (first_value, second_value) = fields, values
+    return [
+        '|',
+        (first, op, first_value),
+        '&', (first, '=', first_value), (second, op, second_value),
+    ]
+
+
+def replica_search(model, domain, offset=0, limit=None, order=None):
+    """
+    search() whose id scan runs through replica_fetchall()
+
+    The Query (ACL + record rules) is built on the primary; ids the
+    primary no longer has are dropped.
+
+    Returns:
+        recordset of model, in query order
+    """
+    query = model._search(domain, offset=offset, limit=limit, order=order)
+    ids = [row[0] for row in replica_fetchall(query.select())]
+    return model.browse(ids).exists()
+
+
+def replica_search_count(model, domain):
+    """search_count() run through replica_fetchall()"""
+    query = model._search(domain)
+    [(count,)] = replica_fetchall(SQL("SELECT COUNT(*) FROM (%s) counted", query.select()))
+    return count
+
+
+def stage_card_page(domain, stage_id, limit, cursor=None):
+    """
+    Fetch one page of a single column, continuing after a stage cursor
+
+    Uses keyset pagination on (sequence, id) so deep pages cost the same as
+    the first one (index: project_task_stage_cursor_idx).
+
+    Args:
+        domain (list): Board + filter domain (without stage)
+        stage_id (int): project.task.type id
+        limit (int): Page size
+        cursor (str): Cursor returned with the previous page of this column
+
+    Returns:
+        tuple: (project.task page, next cursor or None)
+    """
+    page_domain = list(domain) + [('stage_id', '=', stage_id)]
+    if cursor:
+        page_domain += keyset_domain(('sequence', 'id'), decode_cursor(cursor))
+
+    Task = request.env['project.task']
+    query = Task._search(page_domain, limit=limit + 1, order='sequence,id')
+    rows = replica_fetchall(query.select(
+        SQL.identifier(query.table, 'id'),
+        SQL.identifier(query.table, 'sequence'),
+    ))
+    tasks = Task.browse([task_id for task_id, _sequence in rows[:limit]]).exists()
+    if len(rows) <= limit:
+        return tasks, None
+
+    last_id, last_sequence = rows[limit - 1]
+    return tasks, encode_cursor(last_sequence, last_id)
+
+
+def card_visibility(task_ids):
+    """
+    Split requested card ids into visible, hidden and missing ones
+
+    Visibility goes through search() (ACL + record rules, archived cards
+    included); only ids that are not visible are probed with raw SQL to
+    tell "forbidden" from "does not exist".
+
+    Args:
+        task_ids (list[int]): project.task ids (deduplicated)
+
+    Returns:
+        tuple: (visible project.task records, set of hidden ids)
+    """
+    Task = request.env['project.task'].with_context(active_test=False)
+    visible = Task.search([('id', 'in', task_ids)])
+    unseen = set(task_ids) - set(visible.ids)
+    hidden = set()
+    if unseen:
+        request.env.cr.execute(SQL(
+            "SELECT id FROM project_task WHERE id = ANY(%s)",
+            list(unseen),
+        ))
+        hidden = {row[0] for row in request.env.cr.fetchall()}
+    # Back to the default context: archived subtasks stay out of child_ids
+    return request.env['project.task'].browse(visible.ids), hidden
+
+
+def sees_whole_board(project):
+    """
+    Whether the project.task record rules show this user every task of the board
+
+    Decided from the rules themselves, not a copy of them: true when no
+    read rule applies to the user, or for project managers (whose
+    [(1, '=', 1)] rule is OR-ed with every other group rule). Anyone else
+    falls back to a filtered count, whatever the board.
+    """
+    if not request.env['ir.rule']._compute_domain('project.task', 'read'):
+        return True
+    return request.env.user.has_group('project.group_project_manager')
+
+
+def stage_card_counts(project_id):
+    """
+    Count cards per stage for a board
+
+    When the user sees every task of the board, the counts are the board's
+    maintained occupancy counters (one indexed read, see
+    models/stage_occupancy.py); otherwise one grouped query over the tasks
+    the user can see.
+
+    Args:
+        project_id (int): project.project id
+
+    Returns:
+        dict[int, int]: {stage_id: card count}
+    """
+    if sees_whole_board(request.env['project.project'].browse(project_id)):
+        return request.env['ipai.taskboard.stage.occupancy'].sudo()._get_counts(project_id)
+
+    query = request.env['project.task']._search([('project_id', '=', project_id)])
+    return dict(replica_fetchall(SQL(
+        """
+        SELECT t.stage_id, COUNT(*)
+        FROM project_task t
+        WHERE t.id IN (%s) AND t.stage_id IS NOT NULL
+        GROUP BY t.stage_id
+        """,
+        query.subselect(),
+    )))
+
+
+def board_snapshot_series(project_id, date_from, date_to):
+    """
+    Read a board's daily snapshot rows for a date range in one indexed query
+
+    Args:
+        project_id (int): project.project id
+        date_from (date): First day (inclusive)
+        date_to (date): Last day (inclusive)
+
+    Returns:
+        dict[date, dict[int, tuple[int, int]]]: {day: {stage_id: (cards, overdue)}},
+        days in ascending order; days without a snapshot are absent
+    """
+    rows = replica_fetchall(SQL(
+        """
+        SELECT date, stage_id, cards, overdue
+        FROM ipai_taskboard_board_snapshot
+        WHERE project_id = %s AND date BETWEEN %s AND %s
+        ORDER BY date
+        """,
+        project_id,
+        date_from,
+        date_to,
+    ))
+    series = {}
+    for day, stage_id, cards, overdue in rows:
+        series.setdefault(day, {})[stage_id] = (cards, overdue)
+    return series
+
+
+def flow_metrics(project_id, date_from, date_to, task_query=None):
+    """
+    Lead time, cycle time and time-in-stage percentiles of a board, in SQL
+
+    Reads stage transition facts (models/stage_transition.py) changed
+    between date_from and date_to:
+
+    * lead time: card creation → its last move into a folded (done) stage
+    * cycle time: the card's first move → that same move into done
+    * time in stage: time between entering and leaving a stage, per stage
+
+    Args:
+        project_id (int): project.project id
+        date_from (date): First day (inclusive)
+        date_to (date): Last day (inclusive)
+        task_query: project.task _search() Query restricting the cards
+            (None = every card of the board)
+
+    Returns:
+        dict: {"completed": int, "lead_time": [seconds per percentile],
+               "cycle_time": [...], "stages": [(stage_id, count, [...]), ...]}
+            Percentile lists follow FLOW_PERCENTILES (None when empty).
+    """
+    visible = SQL("AND f.task_id IN (%s)", task_query.subselect()) if task_query is not None else SQL()
+    window = SQL(
+        "f.project_id = %s AND f.changed_at >= %s AND f.changed_at < %s::date + 1 %s",
+        project_id, date_from, date_to, visible,
+    )
+    percentiles = list(FLOW_PERCENTILES)
+
+    [(completed, lead_time, cycle_time)] = replica_fetchall(SQL(
+        """
+        WITH done AS (
+            SELECT DISTINCT ON (f.task_id) f.task_id, f.changed_at AS done_at, f.task_created_at
+            FROM ipai_taskboard_stage_transition f
+            JOIN project_task_type s ON s.id = f.to_stage_id AND s.fold
+            WHERE %(window)s
+            ORDER BY f.task_id, f.changed_at DESC
+        )
+        SELECT count(*),
+               percentile_cont(%(percentiles)s::float8[]) WITHIN GROUP (
+                   ORDER BY extract(epoch FROM d.done_at - d.task_created_at)),
+               percentile_cont(%(percentiles)s::float8[]) WITHIN GROUP (
+                   ORDER BY extract(epoch FROM d.done_at - started.started_at))
+        FROM done d
+        CROSS JOIN LATERAL (
+            SELECT min(f.changed_at) AS started_at
+            FROM ipai_taskboard_stage_transition f
+            WHERE f.task_id = d.task_id
+        ) started
+        """,
+        window=window,
+        percentiles=percentiles,
+    ))
+
+    stages = replica_fetchall(SQL(
+        """
+        SELECT f.from_stage_id, count(*),
+               percentile_cont(%(percentiles)s::float8[]) WITHIN GROUP (
+                   ORDER BY extract(epoch FROM f.changed_at - f.entered_at))
+        FROM ipai_taskboard_stage_transition f
+        WHERE %(window)s AND f.from_stage_id IS NOT NULL
+        GROUP BY f.from_stage_id
+        """,
+        window=window,
+        percentiles=percentiles,
+    ))
+    return {
+        'completed': completed,
+        'lead_time': lead_time,
+        'cycle_time': cycle_time,
+        'stages': stages,
+    }
+
+
+def top_cards_per_stage(project_id, per_stage_limit=DEFAULT_PER_STAGE_LIMIT):
+    """
+    Fetch the first N cards of every stage in one windowed query
+
+    Cards are ranked with row_number() partitioned by stage, using the same
+    (sequence, id) ordering as list_cards.
+
+    Args:
+        project_id (int): project.project id
+        per_stage_limit (int): Cards to return per stage
+
+    Returns:
+        dict[int, project.task]: {stage_id: tasks in display order}
+    """
+    Task = request.env['project.task']
+    query = Task._search([('project_id', '=', project_id)])
+    rows = replica_fetchall(SQL(
+        """
+        SELECT ranked.id, ranked.stage_id
+        FROM (
+            SELECT t.id, t.stage_id,
+                   row_number() OVER (
+                       PARTITION BY t.stage_id ORDER BY t.sequence, t.id
+                   ) AS rn
+            FROM project_task t
+            WHERE t.id IN (%s)
+        ) ranked
+        WHERE ranked.rn <= %s
+        ORDER BY ranked.stage_id, ranked.rn
+        """,
+        query.subselect(),
+        per_stage_limit,
+    ))
+
+    # Share one prefetch set across columns so map_card reads fields in batch
+    all_ids = Task.browse([task_id for task_id, _stage_id in rows]).exists().ids
+    existing = set(all_ids)
+    ids_by_stage = {}
+    for task_id, stage_id in rows:
+        if task_id in existing:
+            ids_by_stage.setdefault(stage_id, []).append(task_id)
+    return {
+        stage_id: Task.browse(ids).with_prefetch(all_ids)
+        for stage_id, ids in ids_by_stage.items()
+    }
+
+
+# Activity type filter → mail.message types (same mapping as get_card_activity)
+ACTIVITY_MESSAGE_TYPES = {
+    'comment': ('comment',),
+    'stage_change': ('notification',),
+    'field_update': ('notification',),
+    'assignment': ('notification',),
+    'mention': ('comment', 'email'),
+}
+DEFAULT_ACTIVITY_MESSAGE_TYPES = ('comment', 'email', 'notification')
+
+# Messages visible outside base.group_user (mail.message alias "m")
+PUBLIC_MESSAGE_CONDITION = SQL(
+    """NOT m.is_internal AND EXISTS (
+           SELECT 1 FROM mail_message_subtype st
+           WHERE st.id = m.subtype_id AND NOT st.internal
+       )"""
+)
+
+
+def board_activity_page(project_id, activity_type=None, limit=50, cursor=None):
+    """
+    Fetch one page of a board's activity feed, newest first, in one query
+
+    Messages of every visible task of the board, keyset-paged on
+    (create_date, id) (indexes: mail_message_task_feed_idx,
+    mail_message_task_recent_idx).
+
+    Access: task visibility comes from project.task._search (ACL + record
+    rules); users outside base.group_user additionally only see public
+    messages, as mail.message's own search does.
+
+    Args:
+        project_id (int): project.project id
+        activity_type (str): Optional filter (see ACTIVITY_MESSAGE_TYPES)
+        limit (int): Page size
+        cursor (str): Cursor returned with the previous page
+
+    Returns:
+        tuple: (mail.message page, next cursor or None)
+
+    Raises:
+        ValueError on an unknown activity_type or malformed cursor
+    """
+    if activity_type and activity_type not in ACTIVITY_MESSAGE_TYPES:
+        raise ValueError(f'Invalid activity_type: {activity_type}')
+    message_types = ACTIVITY_MESSAGE_TYPES.get(activity_type, DEFAULT_ACTIVITY_MESSAGE_TYPES)
+
+    tasks = request.env['project.task']._search([('project_id', '=', project_id)])
+    conditions = [
+        SQL("m.model = 'project.task'"),
+        SQL("m.res_id IN (%s)", tasks.subselect()),
+        SQL("m.message_type IN %s", message_types),
+    ]
+    if activity_type == 'mention':
+        conditions.append(SQL(
+            "EXISTS (SELECT 1 FROM mail_message_res_partner_rel r WHERE r.mail_message_id = m.id)"
+        ))
+    if not request.env.user._is_internal():
+        conditions.append(PUBLIC_MESSAGE_CONDITION)
+    if cursor:
+        create_date, message_id = decode_cursor(cursor)
+        conditions.append(SQL("(m.create_date, m.id) < (%s::timestamp, %s)", create_date, message_id))
+
+    rows = replica_fetchall(SQL(
+        """
+        SELECT m.id, m.create_date
+        FROM mail_message m
+        WHERE %s
+        ORDER BY m.create_date DESC, m.id DESC
+        LIMIT %s
+        """,
+        SQL(" AND ").join(conditions),
+        limit + 1,
+    ))
+
+    messages = request.env['mail.message'].browse([row[0] for row in rows[:limit]]).exists()
+    if len(rows) <= limit:
+        return messages, None
+    last_id, last_create_date = rows[limit - 1]
+    return messages, encode_cursor(last_create_date.isoformat(), last_id)
+
+
+# Activity type filter of a single card's history → mail.message types
+CARD_ACTIVITY_MESSAGE_TYPES = {
+    'comment': ('comment',),
+    'stage_change': ('notification',),
+    'field_update': ('notification',),
+    'assignment': ('notification',),
+}
+
+
+def card_activity_page(task_id, activity_type=None, limit=50, offset=0):
+    """
+    Fetch one page of a card's messages, newest first, plus their total
+
+    The caller has checked read access on the card; users outside
+    base.group_user only see public messages, as mail.message's own
+    search does.
+
+    Args:
+        task_id (int): project.task id
+        activity_type (str): Optional filter (see CARD_ACTIVITY_MESSAGE_TYPES;
+            other values do not filter)
+        limit (int): Page size
+        offset (int): Messages to skip
+
+    Returns:
+        tuple: (mail.message page, total count)
+    """
+    conditions = [
+        SQL("m.model = 'project.task'"),
+        SQL("m.res_id = %s", task_id),
+    ]
+    if activity_type in CARD_ACTIVITY_MESSAGE_TYPES:
+        conditions.append(SQL("m.message_type IN %s", CARD_ACTIVITY_MESSAGE_TYPES[activity_type]))
+    if not request.env.user._is_internal():
+        conditions.append(PUBLIC_MESSAGE_CONDITION)
+    where = SQL(" AND ").join(conditions)
+
+    rows = replica_fetchall(SQL(
+        """
+        SELECT m.id
+        FROM mail_message m
+        WHERE %s
+        ORDER BY m.create_date DESC, m.id DESC
+        LIMIT %s OFFSET %s
+        """,
+        where,
+        limit,
+        offset,
+    ))
+    [(total,)] = replica_fetchall(SQL("SELECT COUNT(*) FROM mail_message m WHERE %s", where))
+    messages = request.env['mail.message'].browse([row[0] for row in rows]).exists()
+    return messages, total
+
+
+def mentions_page(partner_id, unread_only=False, limit=50, cursor=None):
+    """
+    Fetch one page of a partner's mentions on cards, newest first
+
+    A mention is a project.task message listing the partner among its
+    recipients (mail_message_res_partner_rel, indexed partner-first);
+    read state comes from the partner's mail_notification row.
+
+    Args:
+        partner_id (int): res.partner id (the current user's partner)
+        unread_only (bool): Only mentions with an unread notification
+        limit (int): Page size
+        cursor (str): Cursor returned with the previous page
+
+    Returns:
+        tuple: (list of (message_id, is_read), next cursor or None)
+    """
+    tasks = request.env['project.task']._search([])
+    conditions = [
+        SQL("r.res_partner_id = %s", partner_id),
+        SQL("m.model = 'project.task'"),
+        SQL("m.res_id IN (%s)", tasks.subselect()),
+    ]
+    if unread_only:
+        conditions.append(SQL("n.is_read IS FALSE"))
+    if cursor:
+        (message_id,) = decode_cursor(cursor, size=1)
+        conditions.append(SQL("m.id < %s", message_id))
+
+    request.env.cr.execute(SQL(
+        """
+        SELECT m.id, COALESCE(n.is_read, TRUE)
+        FROM mail_message_res_partner_rel r
+        JOIN mail_message m ON m.id = r.mail_message_id
+        LEFT JOIN mail_notification n
+               ON n.mail_message_id = m.id AND n.res_partner_id = r.res_partner_id
+        WHERE %s
+        ORDER BY m.id DESC
+        LIMIT %s
+        """,
+        SQL(" AND ").join(conditions),
+        limit + 1,
+    ))
+    rows = request.env.cr.fetchall()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1][0])
+
+
+# Recursion guard for card trees (finance checklists run ~5 levels deep)
+DEFAULT_TREE_DEPTH = 10
+MAX_TREE_DEPTH = 20
+
+
+def card_subtree(task_id, max_depth=DEFAULT_TREE_DEPTH):
+    """
+    Fetch a card's full subtree with done/total rollups in one recursive query
+
+    Nodes are returned in pre-order, siblings ordered by (sequence, id).
+    Rollups count the visible descendants of each node (the node itself
+    excluded). The walk stops at rows hidden by record rules: they are not
+    returned or counted, and neither is anything below them, so every
+    returned node's parent is in the result.
+
+    Args:
+        task_id (int): Root project.task id
+        max_depth (int): Levels below the root to descend
+
+    Returns:
+        list[dict]: [{id, parent_id, depth, done, total}, ...], root first
+    """
+    query = request.env['project.task']._search([])
+    request.env.cr.execute(SQL(
+        """
+        WITH RECURSIVE tree AS (
+            SELECT t.id, t.parent_id, 0 AS depth,
+                   ARRAY[t.id] AS path,
+                   ARRAY[t.sequence, t.id] AS sort_path,
+                   t.state = '1_done' AS is_done
+            FROM project_task t
+            WHERE t.id = %(task_id)s AND t.id IN (%(visible)s)
+            UNION ALL
+            SELECT c.id, c.parent_id, tree.depth + 1,
+                   tree.path || c.id,
+                   tree.sort_path || ARRAY[c.sequence, c.id],
+                   c.state = '1_done'
+            FROM project_task c
+            JOIN tree ON c.parent_id = tree.id
+            WHERE tree.depth < %(max_depth)s
+              AND NOT c.id = ANY(tree.path)
+              AND c.id IN (%(visible)s)
+        ),
+        rollup AS (
+            SELECT ancestor.id,
+                   count(*) AS total,
+                   count(*) FILTER (WHERE v.is_done) AS done
+            FROM tree v,
+                 unnest(v.path[1:array_length(v.path, 1) - 1]) AS ancestor(id)
+            GROUP BY ancestor.id
+        )
+        SELECT v.id, v.parent_id, v.depth,
+               COALESCE(r.done, 0), COALESCE(r.total, 0)
+        FROM tree v
+        LEFT JOIN rollup r ON r.id = v.id
+        ORDER BY v.sort_path
+        """,
+        task_id=task_id,
+        max_depth=max_depth,
+        visible=query.subselect(),
+    ))
+    return [
+        {'id': row[0], 'parent_id': row[1], 'depth': row[2], 'done': row[3], 'total': row[4]}
+        for row in request.env.cr.fetchall()
+    ]
+
+
+def card_ancestors(task_id, max_depth=MAX_TREE_DEPTH):
+    """
+    Fetch a card's ancestor chain in one recursive query
+
+    Args:
+        task_id (int): project.task id
+        max_depth (int): Maximum levels to climb
+
+    Returns:
+        list[dict]: [{id, parent_id, depth}, ...] from the root down to the
+        direct parent; depth is 0 for the root. The climb stops below the
+        first ancestor hidden by record rules, so the chain has no gaps.
+    """
+    query = request.env['project.task']._search([])
+    request.env.cr.execute(SQL(
+        """
+        WITH RECURSIVE chain AS (
+            SELECT p.id, p.parent_id, 1 AS distance, ARRAY[t.id, p.id] AS path
+            FROM project_task t
+            JOIN project_task p ON p.id = t.parent_id
+            WHERE t.id = %(task_id)s AND p.id IN (%(visible)s)
+            UNION ALL
+            SELECT p.id, p.parent_id, chain.distance + 1, chain.path || p.id
+            FROM project_task p
+            JOIN chain ON p.id = chain.parent_id
+            WHERE chain.distance < %(max_depth)s
+              AND NOT p.id = ANY(chain.path)
+              AND p.id IN (%(visible)s)
+        )
+        SELECT id, parent_id, distance
+        FROM chain
+        ORDER BY distance DESC
+        """,
+        task_id=task_id,
+        max_depth=max_depth,
+        visible=query.subselect(),
+    ))
+    rows = request.env.cr.fetchall()
+    top = rows[0][2] if rows else 0
+    return [
+        {'id': row[0], 'parent_id': row[1], 'depth': top - row[2]}
+        for row in rows
+    ]
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+Rate Limit Service — Cost-weighted token buckets shared across workers
+
+Each user has one bucket (capacity + refill rate) in the UNLOGGED table
+ipai_taskboard_rate_limit_bucket, shared by every prefork worker. Routes
+consume tokens by cost: a 1,000-card list_cards costs far more than a
+get_card.
+
+Fast path:
+    Workers don't hit Postgres on every request. They lease a small chunk
+    of tokens (LEASE_FRACTION of capacity, valid LEASE_TTL seconds) into
+    process memory and serve checks from it — a dict lookup under a lock.
+    Only when the lease is used up or expired does the worker take more
+    tokens from the shared bucket, in a short READ COMMITTED transaction
+    on its own cursor (no serialization conflicts with the request). The
+    same UPDATE gives the replaced lease's unused tokens back, so leasing
+    never costs a user more than the calls it served.
+
+Configuration (ir.config_parameter):
+    ipai_taskboard_api.rate_limit_capacity      tokens per bucket (0 disables)
+    ipai_taskboard_api.rate_limit_refill_per_sec refill rate
+"""
+
+from odoo.http import request
+from .batch import in_batch
+import math
+import threading
+import time
+import logging
+
+_logger = logging.getLogger(__name__)
+
+CAPACITY_PARAM = 'ipai_taskboard_api.rate_limit_capacity'
+REFILL_PARAM = 'ipai_taskboard_api.rate_limit_refill_per_sec'
+DEFAULT_CAPACITY = 600
+DEFAULT_REFILL_PER_SEC = 10.0
+
+# Base cost per route, in tokens
+ROUTE_COSTS = {
+    'list_boards': 1,
+    'get_board': 2,
+    'get_board_snapshot': 5,
+    'get_board_charts': 2,
+    'get_board_flow_metrics': 3,
+    'search': 3,
+    'list_cards': 1,
+    'get_card': 1,
+    'get_cards': 1,
+    'get_card_tree': 3,
+    'get_card_activity': 1,
+    'get_board_activity': 2,
+    'list_mentions': 1,
+    'get_unread_mentions_count': 1,
+    'mark_mentions_read': 2,
+    'create_board': 10,
+    'clone_board': 20,
+    'create_card': 5,
+    'update_card': 3,
+    'create_comment': 5,
+    'create_upload': 5,
+    'get_upload': 1,
+    'upload_chunk': 1,
+    'download_attachment': 1,
+    'import_cards': 10,
+    'batch': 1,
+    'export': 50,
+}
+DEFAULT_ROUTE_COST = 1
+
+# List endpoints additionally cost one token per ITEMS_PER_TOKEN requested rows
+ITEMS_PER_TOKEN = 50
+
+# Per-worker lease of shared tokens
+LEASE_FRACTION = 0.05
+LEASE_TTL = 1.0
+
+# {(dbname, user_id): [tokens, expires_at, shared_remaining]}
+_leases = {}
+_leases_lock = threading.Lock()
+
+# Expired leases are pruned once the table grows past this size
+MAX_LEASES = 10000
+
+
+def route_cost(route, items=0, pages=1):
+    """
+    Token cost of one call
+
+    Args:
+        route (str): Handler name (key of ROUTE_COSTS)
+        items (int): Rows requested per page by list endpoints (limit)
+        pages (int): Pages requested at once (e.g. columns in per-stage mode)
+    """
+    try:
+        rows = max(0, int(items or 0)) * max(1, int(pages or 1))
+    except (TypeError, ValueError):
+        rows = 0  # malformed limits are rejected by the handler itself
+    return ROUTE_COSTS.get(route, DEFAULT_ROUTE_COST) + rows // ITEMS_PER_TOKEN
+
+
+def _get_config():
+    params = request.env['ir.config_parameter'].sudo()
+    capacity = float(params.get_param(CAPACITY_PARAM) or DEFAULT_CAPACITY)
+    refill = float(params.get_param(REFILL_PARAM) or DEFAULT_REFILL_PER_SEC)
+    return capacity, refill
+
+
+def _take_shared(user_id, need, chunk, capacity, refill, returned=0):
+    """
+    Take need (+ up to chunk extra for the local lease) from the shared bucket
+
+    returned tokens (the unused part of the lease being replaced) are put
+    back first, in the same transaction.
+
+    Returns:
+        tuple: (granted tokens or 0 if denied, tokens left in the shared bucket)
+    """
+    now = time.time()
+    with request.env.registry.cursor() as cr:
+        cr.execute("SET TRANSACTION ISOLATION LEVEL READ COMMITTED")
+        cr.execute("""
+            INSERT INTO ipai_taskboard_rate_limit_bucket (user_id, tokens, refilled_at)
+            VALUES (%s, %s, %s)
+            ON CONFLICT (user_id) DO NOTHING
+        """, (user_id, capacity, now))
+        cr.execute("""
+            SELECT tokens, refilled_at FROM ipai_taskboard_rate_limit_bucket
+            WHERE user_id = %s FOR UPDATE
+        """, (user_id,))
+        tokens, refilled_at = cr.fetchone()
+
+        available = min(capacity, tokens + returned + max(0.0, now - refilled_at) * refill)
+        granted = min(available, need + chunk) if available >= need else 0
+
+        cr.execute("""
+            UPDATE ipai_taskboard_rate_limit_bucket
+            SET tokens = %s, refilled_at = %s
+            WHERE user_id = %s
+        """, (available - granted, now, user_id))
+    return granted, available - granted
+
+
+def check_rate_limit(route, items=0, pages=1, cost=None):
+    """
+    Consume the cost of this call from the current user's bucket
+
+    Sets X-RateLimit-Limit / X-RateLimit-Remaining (and Retry-After when
+    limited) on the response. Operations of a batch are not charged
+    individually: the batch pays for all of them up front.
+
+    Args:
+        route (str): Handler name (key of ROUTE_COSTS)
+        items (int): Rows requested per page by list endpoints
+        pages (int): Pages requested at once
+        cost (int): Explicit token cost (overrides route/items/pages)
+
+    Returns:
+        dict | None: RATE_LIMITED error payload, or None if allowed
+    """
+    if in_batch():
+        return None
+
+    capacity, refill = _get_config()
+    if capacity <= 0:
+        return None
+
+    if cost is None:
+        cost = route_cost(route, items, pages)
+    key = (request.env.cr.dbname, request.env.uid)
+    now = time.monotonic()
+
+    with _leases_lock:
+        lease = _leases.get(key)
+        if lease and lease[1] > now and lease[0] >= cost:
+            lease[0] -= cost
+            _set_headers(capacity, lease[2] + lease[0])
+            return None
+        # Lease exhausted or expired: hand it back and take a fresh one
+        returned = _leases.pop(key)[0] if lease else 0
+
+    chunk = capacity * LEASE_FRACTION
+    granted, shared_remaining = _take_shared(request.env.uid, cost, chunk, capacity, refill, returned)
+
+    if not granted:
+        retry_after = max(1, math.ceil((cost - shared_remaining) / refill)) if refill else 60
+        _set_headers(capacity, shared_remaining, retry_after)
+        _logger.warning(f"User {request.env.uid} rate limited on {route} (cost {cost})")
+        return {
+            'error': {
+                'code': 'RATE_LIMITED',
+                'message': f'Rate limit exceeded, retry in {retry_after}s',
+                'details': {'retry_after': retry_after, 'cost': cost},
+            }
+        }
+
+    with _leases_lock:
+        if len(_leases) > MAX_LEASES:
+            for stale in [k for k, v in _leases.items() if v[1] <= now]:
+                del _leases[stale]
+        _leases[key] = [granted - cost, now + LEASE_TTL, shared_remaining]
+    _set_headers(capacity, shared_remaining + granted - cost)
+    return None
+
+
+def _set_headers(capacity, remaining, retry_after=None):
+    headers = request.future_response.headers
+    headers['X-RateLimit-Limit'] = str(int(capacity))
+    headers['X-RateLimit-Remaining'] = str(max(0, int(remaining)))
+    if retry_after is not None:
+        headers['Retry-After'] = str(retry_after)
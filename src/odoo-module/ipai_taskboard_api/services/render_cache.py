@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Render Cache — Reuse Card DTOs of cards that did not change
+
+List endpoints re-map every card on every request although most cards are
+unchanged since the previous poll. This in-process LRU keeps the rendered
+Card DTO (and its pre-serialized JSON, see fastjson.PreEncoded) per card.
+
+An entry is valid while its stamp matches:
+    (write_date, xmin, follower stamp, subtask stamp, CONTRACT_VERSION)
+
+* write_date covers the card's own fields, tags and owner changes; the row
+  xmin tells apart two writes within the same second (write_date has
+  second precision)
+* the follower stamp covers watchers (follow/unfollow, partner edits);
+  owners follow their cards, so owner name/email edits are covered too
+* the subtask stamp covers subtasks added to / moved away from the card
+
+Stamps for a whole page come from one SQL query; only cards whose stamp
+changed are re-mapped (with a prefetch set limited to those cards).
+
+Entries are per (database, user): subtask_ids depend on record rules, so
+a DTO rendered for one user is never served to another.
+
+SECURITY: Callers pass recordsets that were already access-filtered
+(search/_search); stamps are read only for those ids.
+"""
+
+from odoo.http import request
+from odoo.tools import SQL
+from collections import OrderedDict
+from .fastjson import PreEncoded, encode_fragment
+import threading
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Cards kept per worker (a 1,000-card board for 20 users fits)
+MAX_ENTRIES = 20000
+
+# {(dbname, uid, task_id): (stamp, PreEncoded card)}
+_entries = OrderedDict()
+_lock = threading.Lock()
+
+
+def card_stamps(task_ids):
+    """
+    Compute the render stamp of many cards in one query
+
+    Args:
+        task_ids (list[int]): project.task ids
+
+    Returns:
+        dict[int, tuple]: {task_id: (write_date, xmin, follower stamp, subtask stamp)}
+    """
+    if not task_ids:
+        return {}
+    # Pending ORM writes of this transaction must be visible to the stamp
+    request.env['project.task'].flush_model()
+    request.env['mail.followers'].flush_model()
+    request.env.cr.execute(SQL(
+        """
+        SELECT t.id, t.write_date, t.xmin::text,
+               (SELECT md5(string_agg(f.partner_id || ':' || p.xmin, ',' ORDER BY f.partner_id))
+                FROM mail_followers f
+                JOIN res_partner p ON p.id = f.partner_id
+                WHERE f.res_model = 'project.task' AND f.res_id = t.id),
+               (SELECT md5(string_agg(c.id || ':' || c.xmin, ',' ORDER BY c.id))
+                FROM project_task c
+                WHERE c.parent_id = t.id)
+        FROM project_task t
+        WHERE t.id = ANY(%s)
+        """,
+        list(task_ids),
+    ))
+    return {row[0]: row[1:] for row in request.env.cr.fetchall()}
+
+
+def map_cards_cached(tasks, map_card, contract_version):
+    """
+    Map project.task records → Card DTOs, re-rendering only changed cards
+
+    Args:
+        tasks: project.task records (display order)
+        map_card (callable): Renderer for one task (mapping.map_card)
+        contract_version (str): Part of the stamp, so a contract bump
+            invalidates every entry
+
+    Returns:
+        list[PreEncoded]: Card DTOs in the order of tasks. They are shared
+        between requests: treat them as read-only.
+    """
+    if not tasks:
+        return []
+
+    stamps = card_stamps(tasks.ids)
+    scope = (request.env.cr.dbname, request.env.uid)
+    cards = {}
+    stale_ids = []
+
+    with _lock:
+        for task_id in tasks.ids:
+            stamp = (*stamps.get(task_id, ()), contract_version)
+            entry = _entries.get((*scope, task_id))
+            if entry is not None and entry[0] == stamp:
+                _entries.move_to_end((*scope, task_id))
+                cards[task_id] = entry[1]
+            else:
+                stale_ids.append(task_id)
+
+    if stale_ids:
+        # Fresh prefetch set: reading a stale card must not load the cached ones
+        rendered = {}
+        for task in tasks.browse(stale_ids):
+            dto = map_card(task)
+            rendered[task.id] = PreEncoded(dto, encode_fragment(dto))
+        cards.update(rendered)
+
+        with _lock:
+            for task_id, card in rendered.items():
+                stamp = (*stamps.get(task_id, ()), contract_version)
+                _entries[(*scope, task_id)] = (stamp, card)
+                _entries.move_to_end((*scope, task_id))
+            while len(_entries) > MAX_ENTRIES:
+                _entries.popitem(last=False)
+
+    return [cards[task_id] for task_id in tasks.ids]
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+Sanitizer — Single-pass cleanup of comment and description markdown
+
+One precompiled tokenizer walks the text once and, in the same pass:
+
+1. Removes <script>...</script> blocks, the javascript: protocol and
+   inline event handlers (onclick=, onerror=, ...)
+2. Collects @email mentions (order of appearance, deduplicated)
+3. Optionally HTML-escapes & < > " ' (replaces a separate html.escape pass)
+
+Every pattern is linear: there are no nested or overlapping quantifiers,
+event handlers must start at a word boundary, and the closing tag / '>'
+lookups for script blocks are cached so an unclosed "<script" repeated a
+million times is still scanned once (see benchmarks/bench_sanitizer.py).
+
+Removing a token joins the text on both sides of it, which can form a new
+token ("on<script></script>error=", "javas<script>a</script>cript:").
+Text that had anything removed is therefore scanned again until a pass
+removes nothing. Input nested deeper than MAX_PASSES gets a final pass
+that replaces tokens with U+FFFD instead, which cannot join with anything.
+
+This module has no Odoo imports so it can be benchmarked standalone.
+"""
+
+import re
+
+# The leading lookahead lets the engine skip positions that cannot start a
+# token with a single character-class test instead of trying every branch.
+_TOKENS = r"""
+      (?P<script><script)
+    | (?P<proto>javascript:)
+    | (?P<handler>\bon\w+\s*=)
+    | @(?P<mention>[a-zA-Z0-9._-]+@[a-zA-Z0-9._-]+\.[a-zA-Z0-9_-]+)
+"""
+
+TOKEN_RE = re.compile(r'(?=[<jo@])(?:' + _TOKENS + ')', re.IGNORECASE | re.VERBOSE)
+TOKEN_ESCAPE_RE = re.compile(
+    r'(?=[<jo@&>"\'])(?:' + _TOKENS + r"""| (?P<escape>[&<>"'])""" + ')',
+    re.IGNORECASE | re.VERBOSE,
+)
+SCRIPT_CLOSE_RE = re.compile(r'</script>', re.IGNORECASE)
+
+# Removal passes before falling back to replacing tokens (ordinary text
+# needs one pass, text with removed tokens two)
+MAX_PASSES = 8
+REPLACEMENT = '\ufffd'
+
+HTML_ESCAPES = {
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#x27;',
+}
+
+
+def sanitize_text(text, escape_html=False):
+    """
+    Sanitize markdown and extract @email mentions
+
+    One pass for text without anything to remove, a second one to confirm
+    that removals did not join into new tokens.
+
+    Args:
+        text (str): User-provided markdown
+        escape_html (bool): Also HTML-escape the remaining text
+
+    Returns:
+        tuple: (sanitized text, list[str] of mentioned emails)
+    """
+    if not text:
+        return text, []
+
+    for _pass in range(MAX_PASSES):
+        cleaned, mentions, removed = _scan(text, TOKEN_RE)
+        if not removed:
+            break
+        text = cleaned
+    else:
+        text, mentions, _removed = _scan(text, TOKEN_RE, replacement=REPLACEMENT)
+
+    if escape_html:
+        # Nothing is left to remove: this pass only escapes
+        text, mentions, _removed = _scan(text, TOKEN_ESCAPE_RE, escape_html=True)
+    return text, mentions
+
+
+def _scan(text, token_re, escape_html=False, replacement=''):
+    """
+    One tokenizer pass
+
+    Returns:
+        tuple: (text, list[str] of mentioned emails, whether anything was removed)
+    """
+    out = []
+    removed = False
+    mentions = {}
+    pos = 0
+    # Cached lookahead for script blocks: (searched from, found at); -1 = none left
+    tag_end = (0, 0)
+    script_close = (0, 0)
+
+    while True:
+        match = token_re.search(text, pos)
+        if match is None:
+            break
+        start, end = match.span()
+        kind = match.lastgroup
+        out.append(text[pos:start])
+        pos = end
+
+        if kind == 'mention':
+            mentions.setdefault(match.group('mention'), None)
+            out.append(match.group(0))
+        elif kind == 'escape':
+            out.append(HTML_ESCAPES[match.group(0)])
+        elif kind == 'script':
+            # <script ...> ... </script>: first '>' then first closing tag
+            if tag_end[1] != -1 and tag_end[1] < end:
+                tag_end = (end, text.find('>', end))
+            gt = tag_end[1]
+            if gt != -1 and script_close[1] != -1 and script_close[1] <= gt:
+                found = SCRIPT_CLOSE_RE.search(text, gt + 1)
+                script_close = (gt + 1, found.end() if found else -1)
+            if gt == -1 or script_close[1] == -1:
+                # Unclosed tag: keep it (escaped if requested), rescan after '<'
+                out.append(HTML_ESCAPES['<'] if escape_html else '<')
+                pos = start + 1
+            else:
+                pos = script_close[1]
+                out.append(replacement)
+                removed = True
+        else:
+            # proto / handler: dropped
+            out.append(replacement)
+            removed = True
+
+    out.append(text[pos:])
+    return ''.join(out), list(mentions), removed
@@ -0,0 +1,349 @@
+# -*- coding: utf-8 -*-
+"""
+Schema Validation Service — JSON Schemas compiled once at import
+
+The contract schemas (schemas/*.schema.json, kept identical to the
+repository's /schemas by ci/validate-contract.sh) are compiled into plain
+Python closures when this module is imported. Validating a payload is then
+a single walk over the data: no schema interpretation, no re-parsing.
+
+Inputs:
+    Request validators are built from the DTO property schemas, so request
+    and response rules cannot drift apart. Properties marked 'x-parse-id'
+    ("task:123", "stage:20", ...) are converted to int during validation;
+    controllers use the returned values instead of splitting strings again.
+
+Outputs:
+    sample_validate_output() validates a fraction of responses (config
+    parameter ipai_taskboard_api.output_validation_rate, 0.0–1.0, default
+    0) and logs contract drift without failing the request.
+
+Supported keywords (the subset used by the contract): type, required,
+properties, items, enum, pattern, minLength, maxLength, format (date,
+date-time, email, uri), $ref to local definitions, allOf.
+"""
+
+from odoo.http import request
+import datetime
+import json
+import os
+import random
+import re
+import logging
+
+_logger = logging.getLogger(__name__)
+
+SCHEMA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'schemas')
+OUTPUT_VALIDATION_RATE_PARAM = 'ipai_taskboard_api.output_validation_rate'
+
+_TYPE_CHECKS = {
+    'object': lambda v: isinstance(v, dict),
+    'array': lambda v: isinstance(v, list),
+    'string': lambda v: isinstance(v, str),
+    'integer': lambda v: isinstance(v, int) and not isinstance(v, bool),
+    'number': lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    'boolean': lambda v: isinstance(v, bool),
+    'null': lambda v: v is None,
+}
+
+_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+_EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+_URI_RE = re.compile(r'^[a-zA-Z][a-zA-Z0-9+.-]*:')
+
+
+def _is_datetime(value):
+    try:
+        datetime.datetime.fromisoformat(value)
+        return True
+    except ValueError:
+        return False
+
+
+_FORMAT_CHECKS = {
+    'date': lambda v: bool(_DATE_RE.match(v)),
+    'date-time': _is_datetime,
+    'email': lambda v: bool(_EMAIL_RE.match(v)),
+    'uri': lambda v: bool(_URI_RE.match(v)),
+}
+
+
+def compile_schema(schema, root=None):
+    """
+    Compile a JSON Schema into a validator closure
+
+    Args:
+        schema (dict): Schema (or sub-schema)
+        root (dict): Document holding 'definitions' for $ref resolution
+
+    Returns:
+        callable: fn(value, path, errors) -> value, appending error strings
+        to errors; 'x-parse-id' strings come back as int
+    """
+    root = root if root is not None else schema
+    
+    if '$ref' in schema:
+        name = schema['$ref'].rsplit('/', 1)[-1]
+        return compile_schema(root['definitions'][name], root)
+    
+    checks = []
+    
+    if 'allOf' in schema:
+        parts = [compile_schema(part, root) for part in schema['allOf']]
+        
+        def check_all_of(value, path, errors):
+            for part in parts:
+                part(value, path, errors)
+            return value
+        checks.append(check_all_of)
+    
+    if 'type' in schema:
+        types = schema['type'] if isinstance(schema['type'], list) else [schema['type']]
+        type_checks = [_TYPE_CHECKS[t] for t in types]
+        expected = '|'.join(types)
+        
+        def check_type(value, path, errors):
+            if not any(check(value) for check in type_checks):
+                errors.append(f'{path}: expected {expected}')
+            return value
+        checks.append(check_type)
+    
+    if 'enum' in schema:
+        allowed = frozenset(schema['enum'])
+        
+        def check_enum(value, path, errors):
+            if value not in allowed:
+                errors.append(f'{path}: must be one of {sorted(allowed)}')
+            return value
+        checks.append(check_enum)
+    
+    if 'pattern' in schema or 'minLength' in schema or 'maxLength' in schema or 'format' in schema:
+        pattern = re.compile(schema['pattern']) if 'pattern' in schema else None
+        min_length = schema.get('minLength')
+        max_length = schema.get('maxLength')
+        format_check = _FORMAT_CHECKS.get(schema.get('format'))
+        fmt = schema.get('format')
+        
+        def check_string(value, path, errors):
+            if not isinstance(value, str):
+                return value
+            if pattern is not None and not pattern.search(value):
+                errors.append(f'{path}: does not match {pattern.pattern}')
+            if min_length is not None and len(value) < min_length:
+                errors.append(f'{path}: shorter than {min_length}')
+            if max_length is not None and len(value) > max_length:
+                errors.append(f'{path}: longer than {max_length}')
+            if format_check is not None and not format_check(value):
+                errors.append(f'{path}: not a valid {fmt}')
+            return value
+        checks.append(check_string)
+    
+    if 'properties' in schema or 'required' in schema:
+        properties = {
+            name: compile_schema(sub, root)
+            for name, sub in schema.get('properties', {}).items()
+        }
+        required = tuple(schema.get('required', ()))
+        
+        def check_object(value, path, errors):
+            if not isinstance(value, dict):
+                return value
+            for name in required:
+                if name not in value:
+                    errors.append(f'{path}.{name}: is required')
+            result = dict(value)
+            for name, check in properties.items():
+                if name in value:
+                    result[name] = check(value[name], f'{path}.{name}', errors)
+            return result
+        checks.append(check_object)
+    
+    if 'items' in schema:
+        item_check = compile_schema(schema['items'], root)
+        
+        def check_items(value, path, errors):
+            if not isinstance(value, list):
+                return value
+            return [item_check(item, f'{path}[{i}]', errors) for i, item in enumerate(value)]
+        checks.append(check_items)
+    
+    if schema.get('x-parse-id'):
+        def parse_id(value, path, errors):
+            if isinstance(value, str) and ':' in value:
+                try:
+                    return int(value.partition(':')[2])
+                except ValueError:
+                    pass  # pattern check already reported it
+            return value
+        checks.append(parse_id)
+    
+    def validate(value, path, errors):
+        for check in checks:
+            value = check(value, path, errors)
+        return value
+    
+    return validate
+
+
+def make_validator(schema):
+    """
+    Compile a schema into fn(payload) -> (value, errors)
+
+    value has 'x-parse-id' fields converted to int; errors is a list of
+    'path: message' strings (empty when valid).
+    """
+    compiled = compile_schema(schema)
+    
+    def validator(payload):
+        errors = []
+        value = compiled(payload, '$', errors)
+        return value, errors
+    
+    return validator
+
+
+def _load_schema(filename):
+    with open(os.path.join(SCHEMA_DIR, filename), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _nullable(schema):
+    """Allow null in addition to the schema's declared type(s)"""
+    types = schema['type'] if isinstance(schema['type'], list) else [schema['type']]
+    return {**schema, 'type': sorted(set(types) | {'null'})}
+
+
+def _ref(schema):
+    """Mark a "prefix:123" property to be parsed into its integer id"""
+    return {**schema, 'x-parse-id': True}
+
+
+# ============================================================================
+# Contract schemas (compiled once)
+# ============================================================================
+
+BOARD_SCHEMA = _load_schema('board.schema.json')
+CARD_SCHEMA = _load_schema('card.schema.json')
+ACTIVITY_SCHEMA = _load_schema('activity.schema.json')
+
+_board_props = BOARD_SCHEMA['properties']
+_card_props = CARD_SCHEMA['properties']
+
+OUTPUT_VALIDATORS = {
+    'board': make_validator(BOARD_SCHEMA),
+    'card': make_validator(CARD_SCHEMA),
+    'activity': make_validator(ACTIVITY_SCHEMA),
+}
+
+# ============================================================================
+# Request schemas (derived from the DTO properties)
+# ============================================================================
+
+_card_input_props = {
+    'description_md': _nullable(_card_props['description_md']),
+    'priority': _card_props['priority'],
+    'owners': _nullable({'type': 'array', 'items': {'type': 'integer'}}),
+    'tags': _nullable({**_card_props['tags'], 'items': _ref(_card_props['tags']['items'])}),
+}
+
+validate_create_card_input = make_validator({
+    'type': 'object',
+    'required': ['board_id', 'stage_id', 'title'],
+    'properties': {
+        **_card_input_props,
+        'board_id': _ref(_card_props['board_id']),
+        'stage_id': _ref(_card_props['stage_id']),
+        'title': _card_props['title'],
+        'due_date': _nullable({'type': 'string', 'format': 'date'}),
+        'parent_id': _ref(_card_props['parent_id']),
+    },
+    'definitions': CARD_SCHEMA['definitions'],
+})
+
+validate_update_card_input = make_validator({
+    'type': 'object',
+    'properties': {
+        **_card_input_props,
+        'title': _nullable(_card_props['title']),
+        'stage_id': _nullable(_ref(_card_props['stage_id'])),
+        'priority': _nullable({**_card_props['priority'], 'enum': _card_props['priority']['enum'] + [None]}),
+        # '' clears the due date
+        'due_date': _nullable({'type': 'string', 'pattern': r'^(\d{4}-\d{2}-\d{2})?$'}),
+        'checklist': _nullable(_card_props['checklist']),
+    },
+    'definitions': CARD_SCHEMA['definitions'],
+})
+
+# One row of POST /boards/{id}/cards:import (references are resolved separately)
+validate_import_row = make_validator({
+    'type': 'object',
+    'required': ['title'],
+    'properties': {
+        'title': _card_props['title'],
+        'description_md': _card_props['description_md'],
+        'priority': _card_props['priority'],
+        'due_date': {'type': 'string', 'format': 'date'},
+    },
+})
+
+validate_create_comment_input = make_validator({
+    'type': 'object',
+    'required': ['body_md'],
+    'properties': {
+        'body_md': {'type': 'string', 'minLength': 1},
+        'mentions': _nullable({'type': 'array', 'items': {'type': 'string', 'format': 'email'}}),
+    },
+})
+
+validate_create_board_input = make_validator({
+    'type': 'object',
+    'required': ['name'],
+    'properties': {
+        'name': _board_props['name'],
+        'description': _nullable(_board_props['description']),
+        'visibility': _board_props['visibility'],
+    },
+})
+
+validate_clone_board_input = make_validator({
+    'type': 'object',
+    'required': ['name'],
+    'properties': {
+        'name': _board_props['name'],
+        'period_start': _nullable({'type': 'string', 'format': 'date'}),
+        'source_period_start': _nullable({'type': 'string', 'format': 'date'}),
+        'with_chatter': {'type': 'boolean'},
+    },
+})
+
+
+def validation_error(errors):
+    """Build the standard VALIDATION_ERROR payload from validator errors"""
+    return {
+        'error': {
+            'code': 'VALIDATION_ERROR',
+            'message': errors[0],
+            'details': {'errors': errors},
+        }
+    }
+
+
+def sample_validate_output(kind, dtos):
+    """
+    Validate a sample of responses against the contract schema
+    
+    Args:
+        kind (str): 'board' | 'card' | 'activity'
+        dtos (list[dict]): DTOs about to be returned
+    
+    Never fails the request: drift is logged as a warning.
+    """
+    rate = float(request.env['ir.config_parameter'].sudo().get_param(OUTPUT_VALIDATION_RATE_PARAM) or 0)
+    if not rate or random.random() >= rate:
+        return
+    
+    validator = OUTPUT_VALIDATORS[kind]
+    for dto in dtos:
+        _value, errors = validator(dto)
+        if errors:
+            _logger.warning(f"Contract drift in {kind} response: {errors[:5]}")
+            return
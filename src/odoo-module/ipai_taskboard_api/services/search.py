@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+"""
+Search Service — Cross-board full-text search of cards, comments and boards
+
+GET /api/v1/search runs one SQL statement: a UNION ALL of one ranked,
+keyset-paged branch per result type, each answered by a GIN index on the
+same tsvector expression the branch matches against:
+
+    card     project_task_search_idx      name (weight A) + description (B)
+    comment  mail_message_search_idx      body of task comments/emails (partial)
+    board    project_project_search_idx   name, every translation
+
+Documents use the 'simple' text search configuration (lowercasing, no
+stemming or stop words), so codes like "BIR 2550M" match as typed; every
+query term is a prefix. Headline snippets (ts_headline) are computed only
+for the rows of the returned page.
+
+SECURITY: like services/queries.py, candidate rows are restricted with
+Model._search() subselects (ACL + record rules) inside the statement.
+Comments additionally follow mail.message visibility for users outside
+base.group_user (public messages only).
+"""
+
+from odoo.http import request
+from odoo.tools import SQL
+from .queries import encode_cursor, decode_cursor, PUBLIC_MESSAGE_CONDITION
+from .replica import replica_fetchall
+import re
+import logging
+
+_logger = logging.getLogger(__name__)
+
+SEARCH_TYPES = ('card', 'comment', 'board')
+
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 50
+
+MAX_QUERY_LENGTH = 200
+MAX_QUERY_TERMS = 8
+# Shorter prefixes match too much of the index to stay fast
+MIN_TERM_LENGTH = 2
+
+# Highlight markers, turned into <mark> by mapping.map_search_results()
+HIGHLIGHT_START = '\x02'
+HIGHLIGHT_STOP = '\x03'
+HEADLINE_OPTIONS = (
+    f'StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, '
+    'MaxWords=24, MinWords=8, MaxFragments=2, FragmentDelimiter=" … "'
+)
+
+# Messages searched as comments (notifications are tracking noise); also
+# the predicate of the partial mail_message_search_idx
+COMMENT_MESSAGE_WHERE = "model = 'project.task' AND message_type IN ('comment', 'email')"
+
+_TERM_RE = re.compile(r'[^\W_]+')
+
+
+def _column(alias, name):
+    return SQL.identifier(alias, name) if alias else SQL.identifier(name)
+
+
+# Indexed document expressions. Index and query must use the same
+# expression for the planner to pick the GIN index; alias=None renders the
+# index form (see models/*.py init()).
+
+def task_document(alias=None):
+    return SQL(
+        # Parenthesized: CREATE INDEX takes operator expressions only in parentheses
+        "(setweight(to_tsvector('simple'::regconfig, COALESCE(%s, '')), 'A')"
+        " || setweight(to_tsvector('simple'::regconfig, COALESCE(%s, '')), 'B'))",
+        _column(alias, 'name'),
+        _column(alias, 'description'),
+    )
+
+
+def message_document(alias=None):
+    return SQL("to_tsvector('simple'::regconfig, COALESCE(%s, ''))", _column(alias, 'body'))
+
+
+def board_document(alias=None):
+    return SQL(
+        "jsonb_to_tsvector('simple'::regconfig, COALESCE(%s, '{}'::jsonb), '[\"string\"]'::jsonb)",
+        _column(alias, 'name'),
+    )
+
+
+def parse_search_query(q):
+    """
+    Turn user input into a prefix tsquery string
+
+    "BIR 2550M" → "'bir':* & '2550m':*"
+
+    Terms are runs of letters and digits (what the text search parser
+    splits documents into), so operators and quotes in the input are
+    ignored rather than interpreted.
+
+    Raises:
+        ValueError when no usable term is left
+    """
+    if not isinstance(q, str) or not q.strip():
+        raise ValueError('q: must be a non-empty string')
+    if len(q) > MAX_QUERY_LENGTH:
+        raise ValueError(f'q: at most {MAX_QUERY_LENGTH} characters')
+    terms = []
+    for term in _TERM_RE.findall(q.lower()):
+        if len(term) >= MIN_TERM_LENGTH and term not in terms:
+            terms.append(term)
+    if not terms:
+        raise ValueError(f'q: needs a word of at least {MIN_TERM_LENGTH} characters')
+    return ' & '.join(f"'{term}':*" for term in terms[:MAX_QUERY_TERMS])
+
+
+def _strip_html(expression):
+    return SQL("regexp_replace(COALESCE(%s, ''), '<[^>]*>', ' ', 'g')", expression)
+
+
+def _page_condition(score, id_column, cursor):
+    if not cursor:
+        return SQL("TRUE")
+    last_score, last_id = decode_cursor(cursor)
+    return SQL("(%s, %s) < (%s::float8, %s)", score, id_column, float(last_score), int(last_id))
+
+
+def _card_branch(tsquery, limit, cursor):
+    tasks = request.env['project.task']._search([('project_id', '!=', False)])
+    score = SQL("ts_rank_cd(%s, %s, 1)::float8", task_document('t'), tsquery)
+    return SQL(
+        """
+        SELECT 'card' AS kind, t.id, t.project_id AS board_id, %(score)s AS score
+        FROM project_task t
+        WHERE %(document)s @@ %(tsquery)s
+          AND t.id IN (%(tasks)s)
+          AND %(page)s
+        ORDER BY score DESC, t.id DESC
+        LIMIT %(limit)s
+        """,
+        score=score,
+        document=task_document('t'),
+        tsquery=tsquery,
+        tasks=tasks.subselect(),
+        page=_page_condition(score, SQL("t.id"), cursor),
+        limit=limit + 1,
+    )
+
+
+def _comment_branch(tsquery, limit, cursor):
+    tasks = request.env['project.task']._search([('project_id', '!=', False)])
+    score = SQL("ts_rank_cd(%s, %s, 1)::float8", message_document('m'), tsquery)
+    conditions = [
+        SQL("m.model = 'project.task' AND m.message_type IN ('comment', 'email')"),
+        SQL("%s @@ %s", message_document('m'), tsquery),
+        SQL("m.res_id IN (%s)", tasks.subselect()),
+        _page_condition(score, SQL("m.id"), cursor),
+    ]
+    if not request.env.user._is_internal():
+        conditions.append(PUBLIC_MESSAGE_CONDITION)
+    return SQL(
+        """
+        SELECT 'comment' AS kind, m.id, t.project_id AS board_id, %(score)s AS score
+        FROM mail_message m
+        JOIN project_task t ON t.id = m.res_id
+        WHERE %(conditions)s
+        ORDER BY score DESC, m.id DESC
+        LIMIT %(limit)s
+        """,
+        score=score,
+        conditions=SQL(" AND ").join(conditions),
+        limit=limit + 1,
+    )
+
+
+def _board_branch(tsquery, limit, cursor):
+    boards = request.env['project.project']._search([])
+    score = SQL("ts_rank_cd(%s, %s, 1)::float8", board_document('p'), tsquery)
+    return SQL(
+        """
+        SELECT 'board' AS kind, p.id, p.id AS board_id, %(score)s AS score
+        FROM project_project p
+        WHERE %(document)s @@ %(tsquery)s
+          AND p.id IN (%(boards)s)
+          AND %(page)s
+        ORDER BY score DESC, p.id DESC
+        LIMIT %(limit)s
+        """,
+        score=score,
+        document=board_document('p'),
+        tsquery=tsquery,
+        boards=boards.subselect(),
+        page=_page_condition(score, SQL("p.id"), cursor),
+        limit=limit + 1,
+    )
+
+
+_BRANCHES = {
+    'card': _card_branch,
+    'comment': _comment_branch,
+    'board': _board_branch,
+}
+
+
+def search_page(q, types=SEARCH_TYPES, limit=DEFAULT_SEARCH_LIMIT, cursors=None):
+    """
+    Fetch one ranked page of each requested result type in one statement
+
+    Each type is keyset-paged on (score DESC, id DESC) with its own cursor,
+    so "more comments" never re-reads cards.
+
+    Args:
+        q (str): User query (see parse_search_query)
+        types (iterable[str]): Subset of SEARCH_TYPES
+        limit (int): Hits per type
+        cursors (dict[str, str]): {type: next_cursor} from the previous page
+
+    Returns:
+        dict[str, tuple]: {type: (list of hit dicts, next cursor or None)}
+        in SEARCH_TYPES order. Hit dicts carry kind, id, board_id,
+        board_name, score, title, card_id, card_title, author, date and
+        highlight (with HIGHLIGHT_START/STOP markers).
+
+    Raises:
+        ValueError on an empty query, unknown type or malformed cursor
+    """
+    # A constant tsquery, folded at plan time: each branch is a plain
+    # bitmap scan of its GIN index
+    tsquery = SQL("to_tsquery('simple'::regconfig, %s)", parse_search_query(q))
+    unknown = set(types) - set(SEARCH_TYPES)
+    if unknown:
+        raise ValueError(f'Invalid search type: {sorted(unknown)[0]}')
+    types = [kind for kind in SEARCH_TYPES if kind in types]
+    if not types:
+        raise ValueError('types: at least one of ' + ', '.join(SEARCH_TYPES))
+    cursors = cursors or {}
+
+    env = request.env
+    env['project.task'].flush_model(['name', 'description', 'project_id'])
+    env['mail.message'].flush_model(['body', 'model', 'res_id', 'message_type'])
+    env['project.project'].flush_model(['name'])
+
+    branches = SQL(" UNION ALL ").join(
+        SQL("(%s)", _BRANCHES[kind](tsquery, limit, cursors.get(kind))) for kind in types
+    )
+    lang = env.lang or 'en_US'
+    board_name = SQL("COALESCE(b.name->>%s, b.name->>'en_US')", lang)
+    result = replica_fetchall(SQL(
+        """
+        WITH hits AS (%(branches)s)
+        SELECT h.kind, h.id, h.board_id, %(board_name)s, h.score,
+               COALESCE(t.name, ct.name, %(board_name)s),
+               ct.id, ct.name, a.name, COALESCE(m.date, t.create_date, b.create_date),
+               CASE h.kind
+                   WHEN 'card' THEN ts_headline('simple'::regconfig,
+                       t.name || ' ' || %(task_text)s, %(tsquery)s, %(options)s)
+                   WHEN 'comment' THEN ts_headline('simple'::regconfig,
+                       %(message_text)s, %(tsquery)s, %(options)s)
+                   ELSE ts_headline('simple'::regconfig, %(board_name)s, %(tsquery)s, %(options)s)
+               END
+        FROM hits h
+        JOIN project_project b ON b.id = h.board_id
+        LEFT JOIN project_task t ON h.kind = 'card' AND t.id = h.id
+        LEFT JOIN mail_message m ON h.kind = 'comment' AND m.id = h.id
+        LEFT JOIN project_task ct ON ct.id = m.res_id
+        LEFT JOIN res_partner a ON a.id = m.author_id
+        ORDER BY h.kind, h.score DESC, h.id DESC
+        """,
+        tsquery=tsquery,
+        branches=branches,
+        board_name=board_name,
+        task_text=_strip_html(SQL("t.description")),
+        message_text=_strip_html(SQL("m.body")),
+        options=HEADLINE_OPTIONS,
+    ))
+
+    rows = {kind: [] for kind in types}
+    for (kind, record_id, board_id, board_name, score, title,
+         card_id, card_title, author, date, highlight) in result:
+        rows[kind].append({
+            'kind': kind,
+            'id': record_id,
+            'board_id': board_id,
+            'board_name': board_name or '',
+            'score': score,
+            'title': title or '',
+            'card_id': card_id,
+            'card_title': card_title,
+            'author': author,
+            'date': date,
+            'highlight': highlight or '',
+        })
+
+    pages = {}
+    for kind in types:
+        hits = rows[kind]
+        if len(hits) <= limit:
+            pages[kind] = (hits, None)
+            continue
+        hits = hits[:limit]
+        pages[kind] = (hits, encode_cursor(hits[-1]['score'], hits[-1]['id']))
+    return pages
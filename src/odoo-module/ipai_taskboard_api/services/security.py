@@ -7,8 +7,9 @@ Request validation, sanitization, and security headers.
 
 from odoo.http import request
 from odoo.exceptions import ValidationError
+from .sanitizer import sanitize_text
+from .batch import in_batch
 import html
-import re
 import logging
 
 _logger = logging.getLogger(__name__)
@@ -16,7 +17,7 @@ _logger = logging.getLogger(__name__)
 # Security constants
 MAX_BODY_SIZE = 1024 * 1024  # 1MB
 ALLOWED_CONTENT_TYPES = ['application/json']
-RATE_LIMIT_WARNING_THRESHOLD = 100  # requests per minute (nginx enforces actual limit)
+RATE_LIMIT_WARNING_THRESHOLD = 100  # fallback X-RateLimit-Limit; enforcement: services/rate_limit.py
 
 
 def validate_request_method(allowed_methods):
@@ -29,15 +30,18 @@ def validate_request_method(allowed_methods):
     Raises:
         ValidationError if method not allowed
     """
+    if in_batch():
+        return  # Operations of POST /api/v1/batch keep their own semantics
     method = request.httprequest.method
     if method not in allowed_methods:
         _logger.warning(f"Method not allowed: {method}")
         raise ValidationError(f"Method {method} not allowed for this endpoint")
 
 
-def validate_content_type_on_writes():
+def validate_content_type_on_writes(content_types=ALLOWED_CONTENT_TYPES):
     """
-    Validate Content-Type is application/json for write operations.
+    Validate Content-Type is application/json (or one of content_types)
+    for write operations.
     
     Raises:
         ValidationError if Content-Type is invalid
@@ -48,14 +52,14 @@ def validate_content_type_on_writes():
         # Handle charset suffix (e.g., "application/json; charset=utf-8")
         content_type_base = content_type.split(';')[0].strip()
         
-        if content_type_base not in ALLOWED_CONTENT_TYPES:
+        if content_type_base not in content_types:
             _logger.warning(f"Invalid Content-Type: {content_type}")
             raise ValidationError(
-                f"Content-Type must be 'application/json', got '{content_type}'"
+                f"Content-Type must be {' or '.join(repr(t) for t in content_types)}, got '{content_type}'"
             )
 
 
-def validate_body_size():
+def validate_body_size(max_size=MAX_BODY_SIZE):
     """
     Validate request body size is within limits.
     
@@ -70,10 +74,10 @@ def validate_body_size():
         except (ValueError, TypeError):
             content_length = 0
         
-        if content_length > MAX_BODY_SIZE:
+        if content_length > max_size:
             _logger.warning(f"Request body too large: {content_length} bytes")
             raise ValidationError(
-                f"Request body too large. Maximum: {MAX_BODY_SIZE} bytes"
+                f"Request body too large. Maximum: {max_size} bytes"
             )
 
 
@@ -106,23 +110,12 @@ def sanitize_markdown(text):
     Note:
         Odoo's mail.message has built-in sanitization for body_html.
         This is an additional layer for markdown input.
+        Use sanitizer.sanitize_text() directly to also collect @mentions
+        (or HTML-escape) in the same pass.
     """
-    if not text:
-        return text
-    
-    # Remove potentially dangerous patterns
+    # Removes script blocks, javascript: and on*= handlers in one linear pass
     # (Odoo will do final sanitization when converting to HTML)
-    dangerous_patterns = [
-        r'<script[^>]*>.*?</script>',  # Script tags
-        r'javascript:',                 # JavaScript protocol
-        r'on\w+\s*=',                  # Event handlers
-    ]
-    
-    sanitized = text
-    for pattern in dangerous_patterns:
-        sanitized = re.sub(pattern, '', sanitized, flags=re.IGNORECASE | re.DOTALL)
-    
-    return sanitized
+    return sanitize_text(text)[0]
 
 
 def add_security_headers(response):
@@ -143,20 +136,25 @@ def add_security_headers(response):
     # CORS (if needed, configure based on deployment)
     # response.headers['Access-Control-Allow-Origin'] = 'https://your-frontend.com'
     
-    # Rate limit info (actual enforcement is in nginx)
-    response.headers['X-RateLimit-Limit'] = str(RATE_LIMIT_WARNING_THRESHOLD)
+    # Rate limit info (set per request by services/rate_limit.py when enforced)
+    response.headers.setdefault('X-RateLimit-Limit', str(RATE_LIMIT_WARNING_THRESHOLD))
     
     return response
 
 
-def validate_request_security():
+def validate_request_security(content_types=ALLOWED_CONTENT_TYPES, max_body_size=MAX_BODY_SIZE):
     """
     Run all security validations on incoming request.
     
     Call this at the start of every API endpoint.
     
+    Args:
+        content_types: Accepted write Content-Types (endpoints taking raw
+            uploads, e.g. card import, add theirs)
+        max_body_size (int): Body size limit in bytes
+    
     Raises:
         ValidationError if any validation fails
     """
-    validate_content_type_on_writes()
-    validate_body_size()
+    validate_content_type_on_writes(content_types)
+    validate_body_size(max_body_size)
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+REST Transport — type='http' responses without the JSON-RPC envelope
+
+The /api/v1/rest/* routes reuse the JSON-RPC controllers' handlers but:
+* Parse GET parameters from the query string (no request body)
+* Serialize DTOs with services.fastjson (orjson when available)
+* Write bytes straight into the response with real HTTP status codes
+"""
+
+from odoo.http import request
+from . import fastjson
+from .mapping import CONTRACT_VERSION
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Error code → HTTP status (see docs/api-endpoints.md, "Error Codes")
+ERROR_STATUS = {
+    'INVALID_BOARD_ID': 400,
+    'INVALID_CARD_ID': 400,
+    'VALIDATION_ERROR': 400,
+    'UNAUTHORIZED': 401,
+    'PERMISSION_DENIED': 403,
+    'BOARD_NOT_FOUND': 404,
+    'CARD_NOT_FOUND': 404,
+    'AVATAR_NOT_FOUND': 404,
+    'UPLOAD_NOT_FOUND': 404,
+    'ATTACHMENT_NOT_FOUND': 404,
+    'WIP_LIMIT_REACHED': 409,
+    'UPLOAD_OFFSET_MISMATCH': 409,
+    'UPLOAD_BUSY': 409,
+    'UNSUPPORTED_MEDIA_TYPE': 415,
+    'IDEMPOTENCY_KEY_REUSED': 422,
+    'CHECKSUM_MISMATCH': 422,
+    'RATE_LIMITED': 429,
+    'INTERNAL_ERROR': 500,
+}
+
+
+# Write bodies must carry a type a cross-site HTML form cannot send (forms
+# post urlencoded, multipart or text/plain without a CORS preflight): the
+# REST routes are csrf=False and authenticate with the session cookie
+JSON_CONTENT_TYPES = ('application/json',)
+
+
+# Raw text bodies (card import): still types a form cannot send
+TEXT_BODY_CONTENT_TYPES = ('text/csv', 'application/x-ndjson', 'application/json')
+
+
+class UnsupportedMediaType(ValueError):
+    """Write request with a Content-Type the route does not accept"""
+
+
+def require_content_type(allowed):
+    """
+    Check the request's Content-Type (parameters like charset ignored)
+    
+    Raises:
+        UnsupportedMediaType if it is not one of allowed
+    """
+    content_type = request.httprequest.mimetype
+    if content_type not in allowed:
+        raise UnsupportedMediaType(
+            f"Content-Type must be {' or '.join(allowed)}, got '{content_type or 'none'}'"
+        )
+
+
+def rest_response(payload, status=200):
+    """
+    Build an HTTP response from a DTO payload (or an error payload)
+    
+    Args:
+        payload (dict): Handler result
+        status (int): Status for successful payloads
+    
+    Returns:
+        odoo.http.Response
+    """
+    if isinstance(payload, dict) and 'error' in payload:
+        status = ERROR_STATUS.get(payload['error'].get('code'), 400)
+    
+    return request.make_response(
+        fastjson.dumps(payload),
+        headers=[
+            ('Content-Type', 'application/json; charset=utf-8'),
+            ('X-Contract-Version', CONTRACT_VERSION),
+        ],
+        status=status,
+    )
+
+
+def rest_error(code, message, details=None):
+    """Build an error response in the standard error envelope"""
+    error = {'code': code, 'message': message}
+    if details:
+        error['details'] = details
+    return rest_response({'error': error})
+
+
+def read_json_body():
+    """
+    Parse the request body as a JSON object
+    
+    Returns:
+        dict: Parsed body ({} when empty)
+    
+    Raises:
+        UnsupportedMediaType if the body is not sent as application/json
+        ValueError if the body is not a JSON object
+    """
+    require_content_type(JSON_CONTENT_TYPES)
+    data = request.httprequest.get_data(cache=False)
+    if not data:
+        return {}
+    body = fastjson.loads(data)
+    if not isinstance(body, dict):
+        raise ValueError('Request body must be a JSON object')
+    return body
+
+
+def read_text_body(content_types=TEXT_BODY_CONTENT_TYPES):
+    """
+    Read the request body as UTF-8 text (CSV/NDJSON uploads)
+    
+    Raises:
+        UnsupportedMediaType if the body is not sent as one of content_types
+        ValueError if the body is not valid UTF-8
+    """
+    require_content_type(content_types)
+    data = request.httprequest.get_data(cache=False)
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError:
+        raise ValueError('Request body must be UTF-8 text')
+
+
+def query_args(int_args=(), list_args=(), json_args=()):
+    """
+    Read query-string parameters as handler keyword arguments
+    
+    Args:
+        int_args: Names parsed as int
+        list_args: Names parsed as lists (repeated or comma-separated)
+        json_args: Names parsed as JSON values
+    
+    Returns:
+        dict: {name: value} for every parameter present
+    
+    Raises:
+        ValueError on malformed values
+    """
+    args = request.httprequest.args
+    kwargs = {}
+    for name in args:
+        if name in list_args:
+            kwargs[name] = [
+                item
+                for value in args.getlist(name)
+                for item in value.split(',')
+                if item
+            ]
+        elif name in int_args:
+            kwargs[name] = int(args[name])
+        elif name in json_args:
+            kwargs[name] = fastjson.loads(args[name])
+        else:
+            kwargs[name] = args[name]
+    return kwargs
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+Upload Service — Chunked, resumable card attachments
+
+Protocol (see controllers/attachments.py):
+1. POST /api/v1/cards/{id}/uploads {"filename", "size", "mimetype"?, "checksum"?}
+   → upload session (models/upload_session.py) with "offset": 0
+2. PUT /api/v1/uploads/{upload_id} with the next bytes as the raw body and
+   headers Upload-Offset (must equal the current offset) and optionally
+   Upload-Checksum: "sha256 <hex>" for the chunk. Repeat until offset == size.
+3. After an interruption, GET /api/v1/uploads/{upload_id} returns the
+   offset to resume from.
+
+Memory stays flat in the file size:
+* chunk bodies are copied from the request stream to the spool file in
+  COPY_BLOCK_BYTES blocks, hashing each block as it passes (the chunk's
+  Upload-Checksum is verified before the offset moves; a bad chunk is cut
+  off again)
+* the last chunk triggers finalization: one streamed pass over the spool
+  file computes the SHA-1 (filestore key) and the SHA-256 (declared
+  checksum), then the file is linked into the filestore and an
+  ir.attachment row is created around it — the content never goes
+  through ir.attachment.raw
+"""
+
+from odoo.tools import config
+import base64
+import hashlib
+import os
+import shutil
+import uuid
+import logging
+
+_logger = logging.getLogger(__name__)
+
+MAX_CHUNK_BYTES = 8 * 1024 * 1024
+COPY_BLOCK_BYTES = 64 * 1024
+
+MAX_UPLOAD_PARAM = 'ipai_taskboard_api.max_upload_mb'
+DEFAULT_MAX_UPLOAD_MB = 200
+# Sizes and offsets are int4 columns (upload session, ir.attachment.file_size)
+MAX_UPLOAD_BYTES = 2 ** 31 - 1
+
+
+class UploadError(Exception):
+    """Rejected chunk or upload; code is the API error code"""
+
+    def __init__(self, code, message, details=None):
+        super().__init__(message)
+        self.code = code
+        self.details = details
+
+    def payload(self):
+        error = {'code': self.code, 'message': str(self)}
+        if self.details:
+            error['details'] = self.details
+        return {'error': error}
+
+
+def max_upload_bytes(env):
+    """max_upload_mb in bytes, capped at MAX_UPLOAD_BYTES"""
+    value = env['ir.config_parameter'].sudo().get_param(MAX_UPLOAD_PARAM)
+    return min((int(value) if value else DEFAULT_MAX_UPLOAD_MB) * 1024 * 1024, MAX_UPLOAD_BYTES)
+
+
+def new_upload_token():
+    return uuid.uuid4().hex
+
+
+def spool_path(dbname, token):
+    directory = os.path.join(config['data_dir'], 'taskboard_uploads', dbname)
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f'{token}.part')
+
+
+def remove_spool_file(dbname, token):
+    try:
+        os.unlink(spool_path(dbname, token))
+    except FileNotFoundError:
+        pass
+
+
+def parse_chunk_checksum(header):
+    """Upload-Checksum: "sha256 <hex or base64>" → digest bytes (None without header)"""
+    if not header:
+        return None
+    algorithm, _sep, value = header.strip().partition(' ')
+    if algorithm.lower() != 'sha256' or not value:
+        raise UploadError('VALIDATION_ERROR', 'Upload-Checksum must be "sha256 <digest>"',
+                          {'field': 'Upload-Checksum'})
+    value = value.strip()
+    try:
+        digest = bytes.fromhex(value) if len(value) == 64 else base64.b64decode(value, validate=True)
+    except ValueError:
+        digest = b''
+    if len(digest) != 32:
+        raise UploadError('VALIDATION_ERROR', 'Upload-Checksum digest is not a SHA-256',
+                          {'field': 'Upload-Checksum'})
+    return digest
+
+
+def write_chunk(dbname, upload, offset, stream, length, expected_digest=None):
+    """
+    Append one chunk to the spool file
+
+    Args:
+        dbname (str): Database (spool directory)
+        upload: ipai.taskboard.upload record (row-locked by the caller)
+        offset (int): Upload-Offset header
+        stream: Request body stream
+        length (int): Content-Length of the chunk
+        expected_digest (bytes): SHA-256 of the chunk, if the client sent one
+
+    Returns:
+        int: New offset
+
+    Raises:
+        UploadError on an offset mismatch, oversized or corrupted chunk
+    """
+    if offset != upload.received:
+        raise UploadError('UPLOAD_OFFSET_MISMATCH', f'Upload-Offset must be {upload.received}',
+                          {'offset': upload.received})
+    if length > MAX_CHUNK_BYTES:
+        raise UploadError('VALIDATION_ERROR', f'Chunks are limited to {MAX_CHUNK_BYTES} bytes',
+                          {'field': 'Content-Length', 'max_chunk_bytes': MAX_CHUNK_BYTES})
+    if offset + length > upload.size:
+        raise UploadError('VALIDATION_ERROR', f'Chunk ends past the declared size ({upload.size} bytes)',
+                          {'field': 'Content-Length'})
+
+    path = spool_path(dbname, upload.token)
+    digest = hashlib.sha256()
+    written = 0
+    with open(path, 'r+b' if os.path.exists(path) else 'w+b') as spool:
+        # A retried chunk overwrites whatever a failed attempt left behind
+        spool.seek(offset)
+        spool.truncate()
+        while written < length:
+            block = stream.read(min(COPY_BLOCK_BYTES, length - written))
+            if not block:
+                break
+            spool.write(block)
+            digest.update(block)
+            written += len(block)
+
+        if written != length or (expected_digest is not None and digest.digest() != expected_digest):
+            spool.truncate(offset)
+            if written != length:
+                raise UploadError('VALIDATION_ERROR', f'Chunk body ended after {written} of {length} bytes',
+                                  {'offset': offset})
+            raise UploadError('CHECKSUM_MISMATCH', 'Chunk does not match its Upload-Checksum',
+                              {'offset': offset})
+    return offset + written
+
+
+def finalize_upload(dbname, upload):
+    """
+    Turn a complete spool file into an ir.attachment of the card
+
+    Returns:
+        ir.attachment record
+
+    Raises:
+        UploadError when the file does not match the declared SHA-256
+    """
+    path = spool_path(dbname, upload.token)
+    sha1, sha256 = hashlib.sha1(), hashlib.sha256()
+    with open(path, 'rb') as spool:
+        for block in iter(lambda: spool.read(COPY_BLOCK_BYTES), b''):
+            sha1.update(block)
+            sha256.update(block)
+
+    if upload.checksum and sha256.hexdigest() != upload.checksum.lower():
+        # No way to tell which chunk is wrong: the upload starts over
+        os.truncate(path, 0)
+        upload.received = 0
+        raise UploadError('CHECKSUM_MISMATCH', 'File does not match the declared checksum',
+                          {'checksum': sha256.hexdigest(), 'offset': 0})
+
+    Attachment = upload.env['ir.attachment'].sudo()
+    vals = {
+        'name': upload.filename,
+        'res_model': 'project.task',
+        'res_id': upload.task_id.id,
+        'type': 'binary',
+        'mimetype': upload.mimetype or None,
+    }
+    if Attachment._storage() == 'file':
+        # Move the spool file into the filestore under its SHA-1, as
+        # ir.attachment._file_write() would, without reading it into memory
+        checksum = sha1.hexdigest()
+        fname = f'{checksum[:2]}/{checksum}'
+        full_path = Attachment._full_path(fname)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        if not os.path.exists(full_path):  # else: same content already stored
+            try:
+                os.link(path, full_path)
+            except OSError:
+                shutil.copyfile(path, full_path)  # filestore on another filesystem
+        Attachment._mark_for_gc(fname)
+        vals.update(store_fname=fname, checksum=checksum, file_size=upload.size)
+    else:
+        # Database storage has to go through raw
+        with open(path, 'rb') as spool:
+            vals['raw'] = spool.read()
+
+    attachment = Attachment.create(vals)
+    # The spool file stays until commit, so a rolled-back finalization can be retried
+    token = upload.token
+    upload.env.cr.postcommit.add(lambda: remove_spool_file(dbname, token))
+    _logger.info(f"Upload {upload.token} stored as attachment {attachment.id} of task {upload.task_id.id}")
+    return attachment
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+WIP Limit Service — Enforce per-stage card limits on create and move
+
+A stage's wip_limit (project.task.type, 0 = no limit) caps the active cards
+of each board in that column. The current count is the board column's
+occupancy counter (models/stage_occupancy.py): one indexed row, locked
+FOR UPDATE so concurrent moves into the same column serialize and cannot
+both take the last free slot.
+
+Only the API enforces the limit; moves made in the Odoo UI are counted
+but not blocked.
+"""
+
+from odoo.http import request
+
+
+def check_wip_limit(project_id, stage_id):
+    """
+    Check that one more card fits into a board column
+
+    Args:
+        project_id (int): project.project id
+        stage_id (int): project.task.type id
+
+    Returns:
+        dict: Error payload (WIP_LIMIT_REACHED) if the column is full, None otherwise
+    """
+    if not project_id or not stage_id:
+        return None
+    stage = request.env['project.task.type'].sudo().browse(stage_id)
+    limit = stage.wip_limit if stage.exists() else 0
+    if not limit:
+        return None
+
+    cards = request.env['ipai.taskboard.stage.occupancy'].sudo()._lock_count(project_id, stage_id)
+    if cards < limit:
+        return None
+    return {
+        'error': {
+            'code': 'WIP_LIMIT_REACHED',
+            'message': f'Stage "{stage.name}" is at its WIP limit ({cards}/{limit})',
+            'details': {
+                'stage_id': f'stage:{stage_id}',
+                'wip_limit': limit,
+                'cards': cards,
+            },
+        }
+    }